@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 
     'django.contrib.gis',
+    'django.contrib.postgres',
     'django_filters',
 
     # Third-party apps
@@ -72,7 +73,7 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.SelectablePagination",
     "PAGE_SIZE": 10,
 
     "DEFAULT_FILTER_BACKENDS": [
@@ -124,6 +125,27 @@ if os.name == 'nt':
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Cache
+# В Docker/проде — Redis (REDIS_CACHE_URL), локально и в тестах — память процесса
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL")
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+# Кэш ответов и карты сбрасывается поколением в общем кэше. На памяти процесса
+# сброс не дошёл бы до других воркеров, поэтому без Redis этот кэш выключен;
+# для одного процесса (runserver) его можно разрешить явно.
+RESPONSE_CACHE_ALLOW_LOCAL = os.getenv("RESPONSE_CACHE_ALLOW_LOCAL", "0") in ["1", "True", "true", "on"]
+
 # Celery
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
@@ -138,6 +160,18 @@ CELERY_BEAT_SCHEDULE = {
         "task": "events.tasks.publish_scheduled_events_task",
         "schedule": crontab(minute="*/1"), # Каждую минуту
     },
+    "rollup-weather-daily": {
+        "task": "weather.tasks.rollup_weather_daily",
+        "schedule": crontab(hour=2, minute=30), # Каждую ночь
+    },
+    "maintain-weather-partitions-daily": {
+        "task": "weather.tasks.maintain_weather_partitions",
+        "schedule": crontab(hour=3, minute=0), # Каждую ночь
+    },
+    "archive-events-nightly": {
+        "task": "events.tasks.archive_events_task",
+        "schedule": crontab(hour=3, minute=30), # Каждую ночь
+    },
 }
 
 # Password validation
@@ -203,3 +237,69 @@ LOGOUT_REDIRECT_URL = '/'
 
 # PERMISSIONS
 VENUES_PUBLIC_READ_ACCESS = True 
+
+# EVENTS
+# Подсказки строки поиска (/api/events/suggest/)
+EVENTS_SUGGEST_MIN_LENGTH = 3  # trigram-индекс помогает начиная с 3 символов
+EVENTS_SUGGEST_MAX_RESULTS = 10
+EVENTS_SUGGEST_CACHE_SECONDS = 30
+# Кэш ответов list/retrieve, сбрасывается сигналами при изменении Event/Venue/EventImage
+EVENTS_RESPONSE_CACHE_SECONDS = 300
+# Длина description_excerpt (?fields=...,description_excerpt)
+EVENTS_DESCRIPTION_EXCERPT_LENGTH = 160
+# Максимум id в одном запросе /api/events/batch/
+EVENTS_BATCH_MAX_IDS = 200
+
+# Снимки погоды: на сколько месяцев вперёд держать готовые секции и сколько месяцев хранить
+# (None — хранить всё). Снимки, привязанные к мероприятиям, не удаляются.
+WEATHER_PARTITIONS_AHEAD_MONTHS = 3
+WEATHER_RETENTION_MONTHS = 12
+# Снимки старше стольких дней сворачиваются в суточные сводки (WeatherDailyAggregate)
+WEATHER_ROLLUP_AFTER_DAYS = 7
+# Удалять почасовые снимки после сворачивания
+WEATHER_PRUNE_RAW_AFTER_ROLLUP = True
+WEATHER_PRUNE_BATCH_SIZE = 5000
+
+# Open-Meteo. URL переопределяется, например, на локальный stub (weather/stub_server.py)
+OPEN_METEO_URL = os.getenv("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+# Сколько площадок запрашивать одним запросом (latitude/longitude списками через запятую)
+WEATHER_FETCH_BATCH_SIZE = int(os.getenv("WEATHER_FETCH_BATCH_SIZE", "100"))
+WEATHER_FETCH_TIMEOUT = 20
+WEATHER_CONNECT_TIMEOUT = 3
+# Circuit breaker: после стольких ошибок подряд запросы к Open-Meteo сразу отклоняются,
+# через WEATHER_CIRCUIT_RESET_SECONDS пропускается пробный запрос
+WEATHER_CIRCUIT_FAILURE_THRESHOLD = 5
+WEATHER_CIRCUIT_RESET_SECONDS = 30
+# Token bucket на процесс: запросов в секунду, запас и сколько ждать токен (None — без лимита)
+WEATHER_RATE_LIMIT_PER_SECOND = 10
+WEATHER_RATE_LIMIT_BURST = 20
+WEATHER_RATE_LIMIT_MAX_WAIT = 2
+# Кэш почасовых прогнозов: ключ — ячейка сетки (градусы) и дата; живёт до следующего
+# выпуска прогноза (выпуски каждые N часов от 00 UTC), но не меньше MIN_TTL
+WEATHER_FORECAST_CELL_DEGREES = 0.1
+WEATHER_FORECAST_ISSUE_INTERVAL_HOURS = 1
+WEATHER_FORECAST_MIN_TTL_SECONDS = 60
+# Сколько запросов к Open-Meteo выполнять параллельно (asyncio + httpx, общий пул соединений)
+WEATHER_FETCH_CONCURRENCY = int(os.getenv("WEATHER_FETCH_CONCURRENCY", "10"))
+
+# Архив: ENDED/DELETED мероприятия старше стольких дней переносятся в ArchivedEvent
+EVENTS_ARCHIVE_AFTER_DAYS = 90
+EVENTS_ARCHIVE_BATCH_SIZE = 1000
+
+# Запрещать пересекающиеся по времени мероприятия на одной площадке (проверка в EventWriteSerializer)
+EVENTS_PREVENT_VENUE_DOUBLE_BOOKING = False
+
+# Поиск мероприятий рядом (?near=lat,lon&radius_km=)
+EVENTS_NEAR_DEFAULT_RADIUS_KM = 10
+EVENTS_NEAR_MAX_RADIUS_KM = 500
+
+# Карта площадок: на сколько ячеек по каждой оси делится тайл при кластеризации
+VENUES_CLUSTER_CELLS_PER_TILE = 8
+# Сколько живут кластеры и тайлы в кэше (сбрасываются и раньше — при изменении площадок и мероприятий)
+VENUES_MAP_CACHE_SECONDS = 300
+# Параметры ST_AsMVT: размер сетки тайла и запас по краям (в единицах тайла)
+VENUES_TILE_EXTENT = 4096
+VENUES_TILE_BUFFER = 64
+
+# Пагинация ?pagination=estimate: если оценка планировщика меньше порога — считаем COUNT(*) честно
+PAGINATION_EXACT_COUNT_THRESHOLD = 1000
@@ -0,0 +1,169 @@
+# core/cache.py
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from rest_framework.response import Response
+
+# Сколько держится блокировка пересчёта одного ключа (защита от stampede)
+LOCK_TIMEOUT = 10
+# Сколько ждать чужого пересчёта, если устаревшей копии нет
+LOCK_WAIT = 2
+LOCK_POLL_INTERVAL = 0.05
+
+HIT = "HIT"
+MISS = "MISS"
+STALE = "STALE"
+# Кэш выключен: бэкенд не общий для процессов (см. shared_cache_enabled)
+BYPASS = "BYPASS"
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def _generation_key(namespace):
+    return f"{namespace}:generation"
+
+
+def get_generation(namespace):
+    """
+    Текущее поколение кэша пространства имён. Записи хранят поколение,
+    в котором посчитаны; запись другого поколения считается устаревшей.
+    """
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Начинаем со времени в мс: после вытеснения ключа счётчик не откатится назад
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace):
+    try:
+        return cache.incr(_generation_key(namespace))
+    except ValueError:
+        get_generation(namespace)
+        return cache.incr(_generation_key(namespace))
+
+
+def invalidate(namespace):
+    """
+    Сбрасывает кэш пространства имён. Поколение повышается сразу и ещё раз после
+    коммита: иначе конкурентный запрос между сбросом и коммитом успел бы
+    закэшировать старые данные под новым поколением.
+    """
+    bump_generation(namespace)
+    transaction.on_commit(lambda: bump_generation(namespace))
+
+
+def normalized_query(request, exclude=()):
+    """
+    Query string в каноническом виде: ключи и значения отсортированы, пустые отброшены.
+    ?venue=2&venue=1&search= и ?venue=1&venue=2 дают одну и ту же строку.
+    """
+    items = []
+    for key in sorted(request.query_params.keys()):
+        if key in exclude:
+            continue
+        values = sorted(v for v in request.query_params.getlist(key) if v != "")
+        if values:
+            items.append((key, values))
+    return urlencode(items, doseq=True)
+
+
+def request_audience(request):
+    user = request.user
+    return "superuser" if user.is_authenticated and user.is_superuser else "public"
+
+
+def build_key(namespace, *parts):
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f"{namespace}:entry:{digest}"
+
+
+def get_or_compute(namespace, key_parts, compute, timeout):
+    """
+    Возвращает (значение, состояние) — HIT, MISS или STALE.
+
+    Пересчитывает значение только один воркер (блокировка через cache.add).
+    Остальные в это время получают прошлую копию (STALE), а если её нет —
+    недолго ждут результата и лишь потом считают сами.
+    compute() может вернуть None — такое значение не кэшируется.
+    """
+    generation = get_generation(namespace)
+    key = build_key(namespace, *key_parts)
+
+    entry = cache.get(key)
+    if entry is not None and entry[0] == generation:
+        return entry[1], HIT
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = compute()
+            if value is not None:
+                cache.set(key, (generation, value), timeout)
+        finally:
+            cache.delete(lock_key)
+        return value, MISS
+
+    if entry is not None:
+        return entry[1], STALE
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry[0] == generation:
+            return entry[1], HIT
+
+    return compute(), MISS
+
+
+def shared_cache_enabled():
+    """
+    Кэш, который сбрасывается через invalidate(), годится только на общем для всех
+    процессов бэкенде (Redis): в памяти процесса новое поколение увидел бы лишь
+    процесс, изменивший данные, а остальные воркеры gunicorn/celery отдавали бы
+    устаревшие ответы до истечения timeout. RESPONSE_CACHE_ALLOW_LOCAL разрешает
+    локальный бэкенд там, где процесс один (runserver, тесты).
+    """
+    return settings.RESPONSE_CACHE_ALLOW_LOCAL or not isinstance(caches["default"], PROCESS_LOCAL_BACKENDS)
+
+
+def get_or_compute_shared(namespace, key_parts, compute, timeout):
+    """
+    get_or_compute для данных, сбрасываемых invalidate(). Без общего бэкенда
+    значение каждый раз считается заново — состояние BYPASS.
+    """
+    if not shared_cache_enabled():
+        return compute(), BYPASS
+    return get_or_compute(namespace, key_parts, compute, timeout)
+
+
+def cached_response(request, namespace, key_parts, build_response, timeout):
+    """
+    Кэширует данные успешного (200) DRF-ответа. Ключ дополняется аудиторией
+    (суперпользователь/публика) и нормализованной query string.
+    В заголовке X-Cache возвращается состояние кэша.
+    """
+    built = {}
+
+    def compute():
+        response = build_response()
+        built["response"] = response
+        if response.status_code != 200:
+            return None
+        return response.data
+
+    parts = [*key_parts, request_audience(request), normalized_query(request)]
+    data, state = get_or_compute_shared(namespace, parts, compute, timeout)
+
+    response = built.get("response") or Response(data)
+    response["X-Cache"] = state
+    return response
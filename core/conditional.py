@@ -0,0 +1,125 @@
+# core/conditional.py
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from rest_framework.response import Response
+
+from core.cache import get_or_compute_shared, normalized_query, request_audience
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return quote_etag(digest)
+
+
+def latest(*values):
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+def queryset_validators(request, queryset, fields=("updated_at",)):
+    """
+    Валидаторы для списка: один агрегат COUNT + MAX(поле) по отфильтрованному queryset.
+    ETag учитывает аудиторию и параметры запроса (страница, сортировка, фильтры).
+    Возвращает (etag, last_modified).
+    """
+    aggregates = {f"last_{i}": Max(field) for i, field in enumerate(fields)}
+    result = queryset.order_by().aggregate(total=Count("pk"), **aggregates)
+    last_modified = latest(*(result[f"last_{i}"] for i in range(len(fields))))
+
+    etag = make_etag(
+        request_audience(request),
+        normalized_query(request),
+        result["total"],
+        last_modified.isoformat() if last_modified else "",
+    )
+    return etag, last_modified
+
+
+def _row_value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def page_validators(request, rows, fields=("updated_at",), extra=()):
+    """
+    Валидаторы по уже выбранной странице: ETag из pk и полей fields её строк
+    (экземпляры моделей или словари из .values()). extra — навигация страницы
+    (next, has_next, count…), которая может меняться без изменения самих строк.
+    Не требует агрегата по всему queryset, поэтому подходит для keyset- и
+    nocount-пагинации длинных списков — проверка стоит столько же, сколько сама страница.
+    """
+    values = []
+    for row in rows:
+        pk = row["id"] if isinstance(row, dict) else row.pk
+        values.append((pk, [_row_value(row, name) for name in fields]))
+    last_modified = latest(*(value for _, row_values in values for value in row_values))
+    etag = make_etag(
+        request_audience(request),
+        normalized_query(request),
+        *(f"{pk}:" + ",".join(v.isoformat() if v else "" for v in row_values) for pk, row_values in values),
+        *extra,
+    )
+    return etag, last_modified
+
+
+def object_validators(request, pk, last_modified, *extra):
+    """
+    Валидаторы для одного объекта. extra — то, что меняется без обновления
+    last_modified (например, число вложенных объектов).
+    """
+    etag = make_etag(
+        request_audience(request),
+        normalized_query(request),
+        pk,
+        last_modified.isoformat() if last_modified else "",
+        *extra,
+    )
+    return etag, last_modified
+
+
+def conditional_response(request, etag, last_modified, build_response):
+    """
+    Отвечает 304 Not Modified, если клиент прислал совпадающий If-None-Match /
+    If-Modified-Since, иначе строит ответ и проставляет ETag и Last-Modified.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    response = not_modified if not_modified is not None else build_response()
+
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+    return response
+
+
+def cached_conditional_response(request, namespace, key_parts, compute_validators, build_response, timeout):
+    """
+    Условный GET поверх кэша ответов: валидаторы хранятся в той же записи, что и
+    данные (того же поколения), и compute_validators() вызывается только при промахе.
+    На попадании ни 304, ни 200 не обращаются к БД. Ключ дополняется аудиторией
+    и нормализованной query string, в X-Cache — состояние кэша.
+    """
+    built = {}
+
+    def compute():
+        etag, last_modified = compute_validators()
+        response = build_response()
+        built["response"] = response
+        if response.status_code != 200:
+            return None
+        return etag, last_modified, response.data
+
+    parts = [*key_parts, request_audience(request), normalized_query(request)]
+    entry, state = get_or_compute_shared(namespace, parts, compute, timeout)
+    if entry is None:
+        return built["response"]
+
+    etag, last_modified, data = entry
+    response = conditional_response(request, etag, last_modified, lambda: built.get("response") or Response(data))
+    response["X-Cache"] = state
+    return response
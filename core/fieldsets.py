@@ -0,0 +1,52 @@
+# core/fieldsets.py
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def _split(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def parse_fieldset(request, available, optional=()):
+    """
+    Разбирает ?fields=a,b и ?omit=c.
+
+    available — все поля ответа в каноническом порядке; optional — поля, которые
+    отдаются только по явному запросу в ?fields= (например, description_excerpt).
+    Возвращает список полей в каноническом порядке или None, если клиент ничего не ограничивал.
+    """
+    fields = _split(request.query_params.get(FIELDS_PARAM, ""))
+    omit = _split(request.query_params.get(OMIT_PARAM, ""))
+    if not fields and not omit:
+        return None
+
+    unknown = [name for name in fields + omit if name not in available]
+    if unknown:
+        raise ValidationError({FIELDS_PARAM: f"Неизвестные поля: {', '.join(unknown)}"})
+
+    selected = set(fields) if fields else {name for name in available if name not in optional}
+    selected -= set(omit)
+    return [name for name in available if name in selected]
+
+
+class SparseFieldsetMixin:
+    """
+    Оставляет в сериализаторе только поля из context["fields"].
+    Поля из Meta.optional_fields выводятся только если запрошены явно.
+    context["fields"] передаётся только для чтения (GET), поэтому на запись не влияет.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get("fields")
+        optional = getattr(self.Meta, "optional_fields", ())
+
+        if fields is None:
+            keep = [name for name in self.fields if name not in optional]
+        else:
+            keep = fields
+
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
@@ -0,0 +1,449 @@
+# core/pagination.py
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _positive_int(value, default, maximum=None):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    if value <= 0:
+        return default
+    if maximum is not None:
+        return min(value, maximum)
+    return value
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _get_row_value(row, field):
+    """
+    Достаёт значение ключа сортировки из строки страницы.
+    Строка может быть моделью или словарём из .values().
+    """
+    if isinstance(row, dict):
+        return row[field]
+    value = row
+    for part in field.split("__"):
+        value = getattr(value, part)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) пагинация.
+
+    Следующая страница выбирается условием WHERE по значениям ключа сортировки
+    последней строки, а не через OFFSET, поэтому страница 5000 стоит столько же,
+    сколько первая, и COUNT(*) не выполняется вовсе.
+
+    Ключ — активная сортировка queryset (после OrderingFilter) плюс `id`
+    как tie-breaker. Поля сортировки должны быть NOT NULL.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    tiebreak_field = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset, view)
+
+        cursor = self.decode_cursor(request)
+        if cursor is None:
+            self.reverse = False
+        else:
+            values, self.reverse = cursor
+            if len(values) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(self.build_position_filter(values, self.reverse))
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self._invert(field) for field in ordering]
+
+        rows = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        return _positive_int(
+            request.query_params.get(self.page_size_query_param),
+            self.page_size,
+            self.max_page_size,
+        )
+
+    def get_ordering(self, queryset, view):
+        """
+        Ключ сортировки: то, что уже выставили OrderingFilter/view.ordering,
+        с обязательным tie-breaker по id в направлении первого поля.
+        """
+        ordering = [f for f in queryset.query.order_by if isinstance(f, str)]
+        if not ordering:
+            ordering = list(getattr(view, "ordering", None) or queryset.model._meta.ordering or [])
+        ordering = [f for f in ordering if f != "?"]
+
+        names = {f.lstrip("-") for f in ordering}
+        if not names & {self.tiebreak_field, "pk"}:
+            prefix = "-" if ordering and ordering[0].startswith("-") else ""
+            ordering.append(f"{prefix}{self.tiebreak_field}")
+        return ordering
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def build_position_filter(self, values, reverse):
+        """
+        Лексикографическое условие "строка после курсора":
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+        Для убывающих полей и для движения назад знак сравнения меняется.
+        """
+        condition = Q()
+        equal_prefix = Q()
+        for field, value in zip(self.ordering, values):
+            descending = field.startswith("-")
+            name = field.lstrip("-")
+            lookup = "lt" if descending != reverse else "gt"
+            condition |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            values = payload["v"]
+            reverse = bool(payload.get("r", 0))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, row, reverse):
+        values = [_encode_value(_get_row_value(row, f.lstrip("-"))) for f in self.ordering]
+        payload = json.dumps({"v": values, "r": int(reverse)}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Курсор страницы (из ссылок next/previous).",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Размер страницы (максимум {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+def _table_estimate(queryset):
+    """Оценка числа строк всей таблицы из статистики планировщика (pg_class.reltuples)."""
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    # -1 — таблица ещё ни разу не анализировалась
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def _plan_estimate(queryset):
+    """Оценка числа строк отфильтрованного запроса из EXPLAIN (без выполнения)."""
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(queryset):
+    """
+    Количество строк без полного COUNT(*). Возвращает (count, is_estimate).
+
+    Для нефильтрованного queryset берётся pg_class.reltuples, для отфильтрованного —
+    оценка планировщика из EXPLAIN. Если оценка меньше PAGINATION_EXACT_COUNT_THRESHOLD,
+    честный COUNT дешёвый — тогда считаем точно.
+    """
+    threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD
+    if connections[queryset.db].vendor == "postgresql":
+        estimate = _plan_estimate(queryset) if queryset.query.where else _table_estimate(queryset)
+        if estimate is not None and estimate >= threshold:
+            return estimate, True
+    return queryset.count(), False
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Django Paginator с приблизительным count — для админки на больших таблицах
+    (вместе с ModelAdmin.show_full_result_count = False).
+    """
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, "query"):
+            return estimate_count(self.object_list)[0]
+        return super().count
+
+
+class NoCountPagination(BasePagination):
+    """
+    Постраничная пагинация без COUNT(*).
+
+    Выбирается page_size + 1 строк: лишняя строка только показывает, есть ли
+    следующая страница (has_next). Номера страниц те же, что у PageNumberPagination.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_query_param = "page"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_page_message = "Invalid page."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = _positive_int(
+            request.query_params.get(self.page_size_query_param),
+            self.page_size,
+            self.max_page_size,
+        )
+        self.page_number = self.get_page_number(request)
+
+        offset = (self.page_number - 1) * self.page_size
+        rows = list(queryset[offset: offset + self.page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message)
+
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_page_number(self, request):
+        value = request.query_params.get(self.page_query_param, 1)
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message)
+        if number < 1:
+            raise NotFound(self.invalid_page_message)
+        return number
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number <= 1:
+            return None
+        if self.page_number == 2:
+            return remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(self.base_url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "has_next": self.has_next,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["has_next", "results"],
+            "properties": {
+                "has_next": {"type": "boolean"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.page_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Номер страницы.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Размер страницы (максимум {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class EstimatedCountPagination(NoCountPagination):
+    """
+    Как NoCountPagination, но дополнительно отдаёт count — оценку планировщика
+    (см. estimate_count). count_is_estimate=false, если посчитано точно.
+    Навигация (has_next/next) всегда точная и от оценки не зависит.
+    """
+    def paginate_queryset(self, queryset, request, view=None):
+        page = super().paginate_queryset(queryset, request, view=view)
+        self.count, self.count_is_estimate = estimate_count(queryset)
+        return page
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data = {
+            "count": self.count,
+            "count_is_estimate": self.count_is_estimate,
+            **response.data,
+        }
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"] = {
+            "count": {"type": "integer"},
+            "count_is_estimate": {"type": "boolean"},
+            **response_schema["properties"],
+        }
+        return response_schema
+
+
+class SelectablePagination(BasePagination):
+    """
+    Пагинация с выбором режима на уровне запроса:
+    ?pagination=page|cursor|nocount|estimate.
+
+    Без параметра используется режим view.default_pagination_mode (если задан),
+    иначе обычная PageNumberPagination — существующие клиенты ничего не замечают.
+    Наличие ?cursor= само по себе включает режим cursor.
+    """
+    mode_query_param = "pagination"
+    modes = {
+        "page": PageNumberPagination,
+        "cursor": KeysetPagination,
+        "nocount": NoCountPagination,
+        "estimate": EstimatedCountPagination,
+    }
+    default_mode = "page"
+
+    def get_mode(self, request, view=None):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode in self.modes:
+            return mode
+        if request.query_params.get(KeysetPagination.cursor_query_param):
+            return "cursor"
+        return getattr(view, "default_pagination_mode", None) or self.default_mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.mode = self.get_mode(request, view)
+        self.active = self.modes[self.mode]()
+        return self.active.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    @property
+    def display_page_controls(self):
+        active = self.__dict__.get("active")
+        return bool(active and getattr(active, "display_page_controls", False))
+
+    def to_html(self):
+        return self.active.to_html()
+
+    def get_paginated_response_schema(self, schema):
+        return self.modes[self.default_mode]().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Режим пагинации: " + ", ".join(self.modes) + f" (по умолчанию {self.default_mode}).",
+                "schema": {"type": "string", "enum": list(self.modes)},
+            },
+        ]
+        seen = {self.mode_query_param}
+        for paginator_class in self.modes.values():
+            for parameter in paginator_class().get_schema_operation_parameters(view):
+                if parameter["name"] not in seen:
+                    seen.add(parameter["name"])
+                    parameters.append(parameter)
+        return parameters
@@ -1,7 +1,9 @@
 # events/admin.py
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Event, EventImage, EmailNotificationConfig
+
+from core.pagination import EstimatedCountPaginator
+from .models import ArchivedEvent, Event, EventImage, EmailNotificationConfig
 
 # Inline позволяет добавлять картинки прямо на странице редактирования События
 class EventImageInline(admin.TabularInline):
@@ -20,6 +22,9 @@ class EventAdmin(admin.ModelAdmin):
     list_display = ('title', 'status', 'start_at', 'venue', 'author', 'preview_thumb')
     list_filter = ('status', 'start_at', 'venue')
     search_fields = ('title', 'description')
+    # Без второго COUNT(*) по всей таблице и с оценкой количества вместо точного
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     
     fieldsets = (
         ("Основное", {
@@ -47,6 +52,21 @@ class EventAdmin(admin.ModelAdmin):
         return "Нет фото"
     preview_thumb.short_description = "Обложка"
 
+@admin.register(ArchivedEvent)
+class ArchivedEventAdmin(admin.ModelAdmin):
+    list_display = ('title', 'status', 'start_at', 'venue', 'archived_at')
+    list_filter = ('status', 'venue')
+    search_fields = ('title',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def has_add_permission(self, request):
+        """Архив пополняется только задачей archive_events_task."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 @admin.register(EmailNotificationConfig)
 class EmailNotificationConfigAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
@@ -0,0 +1,72 @@
+# events/archive_services.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import ArchivedEvent, Event, EventImage, EventStatus
+
+
+def archivable_events(now=None):
+    """
+    Кандидаты в архив: завершённые (по end_at) и удалённые (по updated_at)
+    мероприятия старше EVENTS_ARCHIVE_AFTER_DAYS.
+    """
+    cutoff = (now or timezone.now()) - timedelta(days=settings.EVENTS_ARCHIVE_AFTER_DAYS)
+    return Event.objects.filter(
+        Q(status=EventStatus.ENDED, end_at__lt=cutoff)
+        | Q(status=EventStatus.DELETED, updated_at__lt=cutoff)
+    )
+
+
+def _copied_columns():
+    # Все колонки архива, кроме вычисляемой active_range и собственной archived_at
+    return [
+        field.column
+        for field in ArchivedEvent._meta.concrete_fields
+        if not field.generated and field.name != "archived_at"
+    ]
+
+
+def _copy_to_archive(ids):
+    """
+    INSERT ... SELECT прямо в БД: строки не проходят через Python,
+    а created_at/updated_at сохраняются как есть (bulk_create перезаписал бы их auto_now).
+    """
+    columns = ", ".join(connection.ops.quote_name(column) for column in _copied_columns())
+    archive = connection.ops.quote_name(ArchivedEvent._meta.db_table)
+    hot = connection.ops.quote_name(Event._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {archive} ({columns}, archived_at) "
+            f"SELECT {columns}, %s FROM {hot} WHERE id = ANY(%s)",
+            [timezone.now(), ids],
+        )
+
+
+def archive_events(batch_size=None, now=None):
+    """
+    Переносит кандидатов из Event в ArchivedEvent пачками, каждая пачка — в своей транзакции.
+    Изображения перевешиваются на архивную запись, ссылка на снимок погоды копируется.
+    Возвращает количество перенесённых мероприятий.
+    """
+    batch_size = batch_size or settings.EVENTS_ARCHIVE_BATCH_SIZE
+    moved = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                archivable_events(now)
+                .order_by("id")
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            _copy_to_archive(ids)
+            EventImage.objects.filter(event_id__in=ids).update(archived_event_id=F("event_id"), event=None)
+            Event.objects.filter(pk__in=ids).delete()
+        moved += len(ids)
+    return moved
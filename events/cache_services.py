@@ -0,0 +1,9 @@
+# events/cache_services.py
+from core.cache import invalidate
+
+# Пространство имён кэша ответов API мероприятий (список, детали и производные)
+EVENTS_CACHE_NAMESPACE = "events"
+
+
+def invalidate_events_cache():
+    invalidate(EVENTS_CACHE_NAMESPACE)
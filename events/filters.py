@@ -1,6 +1,16 @@
 # events/filters.py
 import django_filters
-from .models import Event
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter, SearchFilter
+from rest_framework.settings import api_settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .geo_services import filter_near
+from .models import ArchivedEvent, Event
+from .schedule_services import active_during
+from .search_services import search_events
 
 from venues.models import Venue
 
@@ -20,6 +30,96 @@ class EventFilter(django_filters.FilterSet):
         queryset=Venue.objects.all(),
     )
 
+    # ?active_during=2026-10-01T18:00,2026-10-01T22:00 — идёт хотя бы частично в этом интервале
+    active_during = django_filters.CharFilter(method="filter_active_during")
+
     class Meta:
         model = Event
         fields = ['venue', 'status']
+
+    def filter_active_during(self, queryset, name, value):
+        parts = [parse_datetime(part.strip()) if part.strip() else None for part in value.split(",")]
+        if len(parts) != 2 or None in parts:
+            raise ValidationError({name: "Ожидается два момента ISO 8601 через запятую: начало,конец."})
+
+        start, end = (
+            timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+            for moment in parts
+        )
+        if end <= start:
+            raise ValidationError({name: "Конец интервала должен быть позже начала."})
+        return active_during(queryset, start, end)
+
+
+class ArchivedEventFilter(EventFilter):
+    """Те же фильтры для архива (?archived=true у суперпользователя)."""
+    class Meta(EventFilter.Meta):
+        model = ArchivedEvent
+
+
+class EventSearchFilter(SearchFilter):
+    """
+    Полнотекстовый поиск (?search=) по Event.search_vector вместо icontains.
+    Запрос идёт через GIN-индекс; без явного ?ordering= результаты сортируются по релевантности.
+    """
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+
+        keep_ordering = bool(request.query_params.get(api_settings.ORDERING_PARAM))
+        return search_events(queryset, text, keep_ordering=keep_ordering)
+
+
+class EventNearFilter(BaseFilterBackend):
+    """
+    ?near=lat,lon&radius_km=N — мероприятия на площадках в радиусе N км (ST_DWithin по geography).
+    Добавляет аннотацию distance (метры), по ней работает ?ordering=distance.
+    Должен стоять до OrderingFilter.
+    """
+    near_param = "near"
+    radius_param = "radius_km"
+
+    def filter_queryset(self, request, queryset, view):
+        near = request.query_params.get(self.near_param, "").strip()
+        if not near:
+            return queryset
+
+        latitude, longitude = self.parse_point(near)
+        radius_km = self.parse_radius(request.query_params.get(self.radius_param))
+        return filter_near(queryset, latitude, longitude, radius_km)
+
+    def parse_point(self, value):
+        try:
+            latitude, longitude = (float(part) for part in value.split(","))
+        except ValueError:
+            raise ValidationError({self.near_param: "Ожидается формат lat,lon, например 56.01,92.85."})
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({self.near_param: "Координаты вне допустимого диапазона."})
+        return latitude, longitude
+
+    def parse_radius(self, value):
+        if not value:
+            return settings.EVENTS_NEAR_DEFAULT_RADIUS_KM
+        try:
+            radius_km = float(value)
+        except ValueError:
+            raise ValidationError({self.radius_param: "Ожидается число километров."})
+        if not 0 < radius_km <= settings.EVENTS_NEAR_MAX_RADIUS_KM:
+            raise ValidationError(
+                {self.radius_param: f"Радиус должен быть от 0 до {settings.EVENTS_NEAR_MAX_RADIUS_KM} км."}
+            )
+        return radius_km
+
+
+class EventOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter, который пропускает ordering=distance только вместе с ?near=
+    (иначе аннотации distance просто нет).
+    """
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        return [
+            term for term in valid
+            if term.lstrip("-") != "distance" or "distance" in queryset.query.annotations
+        ]
@@ -0,0 +1,63 @@
+# events/geo_services.py
+from django.db.models import BooleanField, F, FloatField, Func
+
+# SRID координат Venue.location (WGS 84)
+SRID = 4326
+
+
+class _GeographyPointFunc(Func):
+    """
+    База для выражений "колонка-точка против заданной точки" в геодезических метрах.
+
+    Колонка приводится к geography как есть — (location)::geography: именно по этому
+    выражению построен GiST-индекс venue_location_geog_gist (см. миграцию venues 0006).
+    """
+    sql_template = None
+
+    def __init__(self, expression, latitude, longitude, **extra):
+        super().__init__(expression, **extra)
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def point_sql(self):
+        return f"ST_SetSRID(ST_MakePoint(%s, %s), {SRID})::geography"
+
+    def as_sql(self, compiler, connection, **extra_context):
+        column_sql, column_params = compiler.compile(self.source_expressions[0])
+        sql = self.sql_template.format(column=column_sql, point=self.point_sql())
+        return sql, (*column_params, *self.extra_params())
+
+    def extra_params(self):
+        return (self.longitude, self.latitude)
+
+
+class GeographyDWithin(_GeographyPointFunc):
+    """ST_DWithin(location::geography, point, meters) — использует GiST-индекс."""
+    output_field = BooleanField()
+    sql_template = "ST_DWithin(({column})::geography, {point}, %s)"
+
+    def __init__(self, expression, latitude, longitude, meters, **extra):
+        super().__init__(expression, latitude, longitude, **extra)
+        self.meters = meters
+
+    def extra_params(self):
+        return (*super().extra_params(), self.meters)
+
+
+class GeographyKNNDistance(_GeographyPointFunc):
+    """
+    Оператор KNN <-> для geography: расстояние в метрах, по индексу отдаёт
+    ближайшие строки первыми (ORDER BY ... <-> point).
+    """
+    output_field = FloatField()
+    sql_template = "(({column})::geography <-> {point})"
+
+
+def filter_near(queryset, latitude, longitude, radius_km, field="venue__location"):
+    """
+    Мероприятия в радиусе radius_km от точки с расстоянием до площадки в аннотации distance (метры).
+    radius_km=None — без ограничения радиуса, только расстояние для сортировки.
+    """
+    if radius_km is not None:
+        queryset = queryset.filter(GeographyDWithin(F(field), latitude, longitude, radius_km * 1000))
+    return queryset.annotate(distance=GeographyKNNDistance(F(field), latitude, longitude))
@@ -0,0 +1,64 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from events.models import Event, EventStatus
+from events.read_services import event_list_values, represent_event_rows
+from events.serializers import EventListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Микробенчмарк списка мероприятий: EventListSerializer против проекции через values()'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100,
+            help='Сколько строк в одной "странице"'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Сколько раз повторять замер'
+        )
+
+    def handle(self, *args, **options):
+        size = options['rows']
+        repeat = options['repeat']
+        request = Request(APIRequestFactory().get('/api/events/'))
+
+        queryset = (
+            Event.objects.filter(status=EventStatus.PUBLISHED)
+            .select_related('venue', 'author')
+            .defer('search_vector')
+            .order_by('start_at', 'id')
+        )
+        if not queryset.exists():
+            raise CommandError('Нет опубликованных мероприятий. Сначала запусти seed_data.')
+
+        def serializer_path():
+            return EventListSerializer(list(queryset[:size]), many=True, context={'request': request}).data
+
+        def values_path():
+            return represent_event_rows(list(event_list_values(queryset)[:size]), request)
+
+        if [dict(row) for row in serializer_path()] != values_path():
+            self.stdout.write(self.style.WARNING('Внимание: форматы ответов различаются!'))
+
+        for label, func in (('EventListSerializer', serializer_path), ('values() + ST_X/ST_Y', values_path)):
+            func()  # прогрев
+            timings = []
+            rows = 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                rows = len(func())
+                timings.append(time.perf_counter() - started)
+            median = statistics.median(timings)
+            self.stdout.write(
+                f'{label:<22} {rows} строк: медиана {median * 1000:8.2f} мс, {rows / median:10.0f} строк/с'
+            )
@@ -0,0 +1,153 @@
+import math
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F, FloatField, Func
+from django.utils import timezone
+
+from venues.models import Venue
+from events.geo_services import filter_near
+from events.models import Event, EventStatus
+
+User = get_user_model()
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает "события рядом": фильтрация на клиенте против ST_DWithin + KNN по GiST-индексу'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed-venues',
+            type=int,
+            default=0,
+            help='Сколько синтетических площадок досоздать (случайные точки вокруг --lat/--lon, данные остаются в БД)'
+        )
+        parser.add_argument(
+            '--events-per-venue',
+            type=int,
+            default=5,
+            help='Сколько опубликованных событий создать на каждую новую площадку'
+        )
+        parser.add_argument('--lat', type=float, default=56.0106, help='Широта точки поиска')
+        parser.add_argument('--lon', type=float, default=92.8526, help='Долгота точки поиска')
+        parser.add_argument('--radius-km', type=float, default=10, help='Радиус поиска в км')
+        parser.add_argument('--spread-deg', type=float, default=5, help='Разброс синтетических площадок в градусах')
+        parser.add_argument('--page-size', type=int, default=20, help='Сколько ближайших событий брать')
+        parser.add_argument('--repeat', type=int, default=20, help='Сколько раз выполнять каждый вариант')
+
+    def handle(self, *args, **options):
+        if options['seed_venues']:
+            self.seed(options)
+
+        lat, lon, radius_km = options['lat'], options['lon'], options['radius_km']
+        page_size = options['page_size']
+        base = Event.objects.filter(status=EventStatus.PUBLISHED).select_related('venue').defer('search_vector')
+
+        self.stdout.write(
+            f'Площадок: {Venue.objects.count()}, опубликованных событий: {base.count()}, '
+            f'точка ({lat}, {lon}), радиус {radius_km} км'
+        )
+
+        def client_side():
+            # Как сейчас делают клиенты: выгрузить всё и отфильтровать по расстоянию у себя
+            rows = base.values(
+                'id',
+                lat=Func(F('venue__location'), function='ST_Y', output_field=FloatField()),
+                lon=Func(F('venue__location'), function='ST_X', output_field=FloatField()),
+            )
+            found = []
+            for row in rows:
+                distance = haversine_km(lat, lon, row['lat'], row['lon'])
+                if distance <= radius_km:
+                    found.append((distance, row['id']))
+            found.sort()
+            return len(found), [pk for _d, pk in found[:page_size]]
+
+        def database():
+            qs = filter_near(base, lat, lon, radius_km).order_by('distance', 'id')
+            return qs.count(), list(qs.values_list('id', flat=True)[:page_size])
+
+        client_count, client_ms = self.measure(client_side, options['repeat'])
+        db_count, db_ms = self.measure(database, options['repeat'])
+
+        self.report('на клиенте          ', client_count, client_ms)
+        self.report('ST_DWithin + KNN <->', db_count, db_ms)
+        if client_count != db_count:
+            self.stdout.write(self.style.WARNING(
+                'Внимание: количество различается (сфера vs сфероид на границе радиуса — это ожидаемо в пределах долей процента)'
+            ))
+
+        plan = filter_near(base, lat, lon, radius_km).order_by('distance', 'id')[:page_size].explain()
+        if 'venue_location_geog_gist' in plan:
+            self.stdout.write(self.style.SUCCESS('✓ План использует venue_location_geog_gist'))
+        else:
+            self.stdout.write(self.style.WARNING('Индекс venue_location_geog_gist в плане не найден:'))
+            self.stdout.write(plan)
+
+    def measure(self, func, repeat):
+        func()  # прогрев
+        timings = []
+        count = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count, _rows = func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return count, timings
+
+    def report(self, label, count, timings):
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        self.stdout.write(
+            f'  {label}: найдено {count:>7}, медиана {statistics.median(timings):8.2f} мс, p95 {p95:8.2f} мс'
+        )
+
+    def seed(self, options):
+        author = User.objects.filter(is_superuser=True).first()
+        if not author:
+            raise CommandError('Суперпользователь не найден! Создай через createsuperuser')
+
+        count = options['seed_venues']
+        spread = options['spread_deg']
+        prefix = uuid.uuid4().hex[:8]
+        venues = Venue.objects.bulk_create([
+            Venue(
+                name=f'Bench {prefix} #{i}',
+                location=Point(
+                    options['lon'] + random.uniform(-spread, spread),
+                    options['lat'] + random.uniform(-spread, spread),
+                    srid=4326,
+                ),
+            )
+            for i in range(count)
+        ], batch_size=5000)
+
+        now = timezone.now()
+        events = []
+        for venue in venues:
+            for _ in range(options['events_per_venue']):
+                start = now + timedelta(days=random.randint(1, 365), hours=random.randint(0, 23))
+                events.append(Event(
+                    title=f'Событие {venue.name}',
+                    description='',
+                    start_at=start,
+                    end_at=start + timedelta(hours=2),
+                    author=author,
+                    venue=venue,
+                    rating=random.randint(0, 25),
+                    status=EventStatus.PUBLISHED,
+                ))
+        Event.objects.bulk_create(events, batch_size=5000)
+        self.stdout.write(self.style.SUCCESS(f'✓ Создано {len(venues)} площадок и {len(events)} событий'))
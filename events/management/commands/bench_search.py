@@ -0,0 +1,120 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+from faker import Faker
+
+from venues.models import Venue
+from events.models import Event, EventStatus
+from events.search_services import rebuild_search_vectors, search_events
+
+User = get_user_model()
+fake = Faker('ru_RU')
+
+DEFAULT_QUERIES = ['концерт', 'выставка', 'фестиваль', 'мастер-класс', 'конференция']
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает задержку поиска: icontains (SearchFilter) против полнотекстового search_vector'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Сколько синтетических событий досоздать перед замером (bulk_create, данные остаются в БД)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Сколько раз выполнять каждый запрос'
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            help='Поисковая строка (можно несколько раз)'
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options['seed'])
+
+        queries = options['queries'] or DEFAULT_QUERIES
+        repeat = options['repeat']
+        total = Event.objects.count()
+        self.stdout.write(f'Событий в БД: {total}, повторов на запрос: {repeat}')
+
+        base = Event.objects.filter(status=EventStatus.PUBLISHED).select_related('venue')
+
+        for text in queries:
+            def legacy():
+                qs = base.filter(Q(title__icontains=text) | Q(venue__name__icontains=text)).order_by('start_at')
+                return qs.count(), list(qs[:10])
+
+            def fulltext():
+                qs = search_events(base, text)
+                return qs.count(), list(qs[:10])
+
+            legacy_count, legacy_ms = self.measure(legacy, repeat)
+            fts_count, fts_ms = self.measure(fulltext, repeat)
+
+            self.stdout.write(f'\n«{text}»')
+            self.report('icontains', legacy_count, legacy_ms)
+            self.report('fulltext ', fts_count, fts_ms)
+
+    def measure(self, func, repeat):
+        func()  # прогрев
+        timings = []
+        count = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count, _rows = func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return count, timings
+
+    def report(self, label, count, timings):
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        self.stdout.write(
+            f'  {label}: найдено {count:>7}, медиана {statistics.median(timings):8.2f} мс, p95 {p95:8.2f} мс'
+        )
+
+    def seed(self, count):
+        author = User.objects.filter(is_superuser=True).first()
+        if not author:
+            raise CommandError('Суперпользователь не найден! Создай через createsuperuser')
+
+        venues = list(Venue.objects.all()[:200])
+        if not venues:
+            raise CommandError('Нет площадок. Сначала запусти seed_data.')
+
+        event_types = ['Концерт', 'Выставка', 'Конференция', 'Фестиваль', 'Мастер-класс', 'Спектакль']
+        now = timezone.now()
+        batch_size = 5000
+        last_id = Event.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        self.stdout.write(f'Создаём {count} событий...')
+        for offset in range(0, count, batch_size):
+            batch = []
+            for _ in range(min(batch_size, count - offset)):
+                start = now + timedelta(days=random.randint(-365, 365), hours=random.randint(0, 23))
+                batch.append(Event(
+                    title=f'{random.choice(event_types)}: {fake.catch_phrase()}',
+                    description=fake.text(max_nb_chars=300),
+                    start_at=start,
+                    end_at=start + timedelta(hours=random.randint(1, 6)),
+                    author=author,
+                    venue=random.choice(venues),
+                    rating=random.randint(0, 25),
+                    status=EventStatus.PUBLISHED,
+                ))
+            Event.objects.bulk_create(batch)
+
+        updated = rebuild_search_vectors(Event.objects.filter(id__gt=last_id))
+        self.stdout.write(self.style.SUCCESS(f'✓ Создано {count} событий, search_vector заполнен у {updated}'))
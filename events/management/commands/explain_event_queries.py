@@ -0,0 +1,100 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+from django.utils import timezone
+
+from venues.models import Venue
+from events.filters import EventFilter
+from events.models import Event, EventStatus
+
+INDEX_SCAN_RE = re.compile(r"(Index Only Scan|Index Scan|Bitmap Index Scan)(?: Backward)? (?:using|on) (\w+)")
+SEQ_SCAN_RE = re.compile(r"Seq Scan on events_event")
+EXECUTION_TIME_RE = re.compile(r"Execution Time: ([\d.]+) ms")
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет EXPLAIN (ANALYZE, BUFFERS) для канонических запросов публичного списка мероприятий '
+        'и показывает, какие индексы используются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Печатать планы целиком, а не только сводку'
+        )
+        parser.add_argument(
+            '--fail-on-seqscan',
+            action='store_true',
+            help='Завершиться с ошибкой, если какой-то запрос читает events_event через Seq Scan (для CI после деплоя)'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=10,
+            help='LIMIT, как у страницы списка'
+        )
+
+    def canonical_queries(self):
+        """
+        Те же формы запросов, что строит EventViewSet.list для анонимного пользователя:
+        PUBLISHED + фильтры EventFilter + сортировка.
+        """
+        now = timezone.now()
+        venue_ids = list(Venue.objects.order_by('id').values_list('id', flat=True)[:3])
+
+        def params(**kwargs):
+            data = QueryDict(mutable=True)
+            for key, value in kwargs.items():
+                if isinstance(value, list):
+                    data.setlist(key, [str(v) for v in value])
+                else:
+                    data[key] = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+            return data
+
+        queries = [
+            ('Список по умолчанию (ordering=start_at)', params(), ['start_at', 'id']),
+            ('Ближайшие 30 дней', params(start_from=now, start_to=now + timedelta(days=30)), ['start_at', 'id']),
+            ('Завершаются в ближайшую неделю', params(end_from=now, end_to=now + timedelta(days=7)), ['end_at', 'id']),
+            ('Рейтинг 15..25', params(rating_min=15, rating_max=25), ['start_at', 'id']),
+            ('Сортировка по названию', params(), ['title', 'id']),
+            ('Сначала поздние', params(), ['-start_at', '-id']),
+        ]
+        if venue_ids:
+            queries.append(('Список площадок', params(venue=venue_ids), ['start_at', 'id']))
+        return queries
+
+    def handle(self, *args, **options):
+        base = Event.objects.filter(status=EventStatus.PUBLISHED).select_related('venue', 'author')
+        seq_scans = []
+
+        for title, data, ordering in self.canonical_queries():
+            filterset = EventFilter(data=data, queryset=base)
+            if not filterset.is_valid():
+                raise CommandError(f'{title}: некорректные параметры фильтра {filterset.errors}')
+
+            queryset = filterset.qs.order_by(*ordering)[: options['page_size']]
+            plan = queryset.explain(analyze=True, buffers=True)
+
+            indexes = sorted({name for _kind, name in INDEX_SCAN_RE.findall(plan)})
+            execution = EXECUTION_TIME_RE.search(plan)
+            has_seq_scan = bool(SEQ_SCAN_RE.search(plan))
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{title}'))
+            self.stdout.write(f'  Индексы: {", ".join(indexes) if indexes else "—"}')
+            if execution:
+                self.stdout.write(f'  Время выполнения: {execution.group(1)} мс')
+            if has_seq_scan:
+                seq_scans.append(title)
+                self.stdout.write(self.style.WARNING('  ✗ Seq Scan по events_event'))
+            else:
+                self.stdout.write(self.style.SUCCESS('  ✓ Без полного сканирования events_event'))
+
+            if options['verbose_plans']:
+                self.stdout.write(plan)
+
+        if seq_scans and options['fail_on_seqscan']:
+            raise CommandError('Seq Scan в запросах: ' + '; '.join(seq_scans))
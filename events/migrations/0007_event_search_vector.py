@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:03
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+BACKFILL_SEARCH_VECTOR = """
+UPDATE events_event AS e
+SET search_vector =
+    setweight(to_tsvector('russian', coalesce(e.title, '')), 'A') ||
+    setweight(to_tsvector('russian', coalesce(v.name, '')), 'A') ||
+    setweight(to_tsvector('russian', coalesce(e.description, '')), 'B')
+FROM venues_venue AS v
+WHERE v.id = e.venue_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_keyset_indexes'),
+        ('venues', '0003_alter_venue_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_vector_gin'),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_VECTOR, reverse_sql=migrations.RunSQL.noop),
+    ]
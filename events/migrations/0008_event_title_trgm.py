@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:20
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_search_vector'),
+        ('venues', '0004_venue_name_trgm'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # Индекс по UPPER(title): именно так Django строит title__icontains на PostgreSQL
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS event_title_upper_trgm ON events_event USING gin (UPPER(title) gin_trgm_ops);",
+            reverse_sql="DROP INDEX IF EXISTS event_title_upper_trgm;",
+        ),
+    ]
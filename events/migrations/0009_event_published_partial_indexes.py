@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_event_title_trgm'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 'PUBLISHED')), fields=['start_at', 'id'], name='event_pub_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 'PUBLISHED')), fields=['end_at', 'id'], name='event_pub_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 'PUBLISHED')), fields=['title', 'id'], name='event_pub_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 'PUBLISHED')), fields=['venue', 'start_at'], name='event_pub_venue_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 'PUBLISHED')), fields=['rating', 'start_at'], name='event_pub_rating_start_idx'),
+        ),
+    ]
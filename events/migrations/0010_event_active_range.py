@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:10
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import events.models
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_published_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='active_range',
+            field=models.GeneratedField(db_persist=True, expression=events.models.TsTzRange(models.F('start_at'), models.F('end_at')), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['active_range'], name='event_active_range_gist'),
+        ),
+        BtreeGistExtension(),
+        # Пересечения на одной площадке: WHERE venue_id = ? AND active_range && ?
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS event_venue_active_range_gist ON events_event USING gist (venue_id, active_range) WHERE status <> 'DELETED';",
+            reverse_sql="DROP INDEX IF EXISTS event_venue_active_range_gist;",
+        ),
+    ]
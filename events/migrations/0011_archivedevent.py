@@ -0,0 +1,62 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:20
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.search
+import django.core.validators
+import django.db.models.deletion
+import events.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_active_range'),
+        ('venues', '0006_venue_location_geography_gist'),
+        ('weather', '0004_alter_weathersnapshot_wind_direction'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('title', models.CharField(max_length=255, verbose_name='Название')),
+                ('description', models.TextField(blank=True, verbose_name='Описание')),
+                ('start_at', models.DateTimeField(verbose_name='Начало')),
+                ('end_at', models.DateTimeField(verbose_name='Окончание')),
+                ('publish_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата публикации')),
+                ('rating', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(25)], verbose_name='Рейтинг')),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('SCHEDULED', 'Scheduled'), ('PUBLISHED', 'Published'), ('ENDED', 'Ended'), ('DELETED', 'Deleted')], db_index=True, default='DRAFT', max_length=16, verbose_name='Статус')),
+                ('preview_image', models.ImageField(blank=True, editable=False, null=True, upload_to='events/previews/', verbose_name='Обложка')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('active_range', models.GeneratedField(db_persist=True, expression=events.models.TsTzRange(models.F('start_at'), models.F('end_at')), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField())),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Перенесено в архив')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_events', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_events', to='venues.venue', verbose_name='Место проведения')),
+                ('weather', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_event', to='weather.weathersnapshot', verbose_name='Погода')),
+            ],
+            options={
+                'verbose_name': 'Архивное мероприятие',
+                'verbose_name_plural': 'Архив мероприятий',
+            },
+        ),
+        migrations.AlterField(
+            model_name='eventimage',
+            name='event',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='images', to='events.event'),
+        ),
+        migrations.AddField(
+            model_name='eventimage',
+            name='archived_event',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='images', to='events.archivedevent'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventimage',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('archived_event__isnull', True), ('event__isnull', False)), models.Q(('archived_event__isnull', False), ('event__isnull', True)), _connector='OR'), name='eventimage_single_owner'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_archivedevent'),
+        ('weather', '0004_alter_weathersnapshot_wind_direction'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='weather',
+            field=models.OneToOneField(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='event', to='weather.weathersnapshot', verbose_name='Погода'),
+        ),
+        migrations.AlterField(
+            model_name='archivedevent',
+            name='weather',
+            field=models.OneToOneField(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_event', to='weather.weathersnapshot', verbose_name='Погода'),
+        ),
+    ]
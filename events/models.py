@@ -1,8 +1,11 @@
 # events/models.py
 from django.conf import settings
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models import Q, F
+from django.db.models import Q, F, Func
 
 from venues.models import Venue
 from weather.models import WeatherSnapshot
@@ -15,26 +18,23 @@ class EventStatus(models.TextChoices):
     DELETED = "DELETED", "Deleted"
 
 
-class Event(models.Model):
+class TsTzRange(Func):
+    """tstzrange(start, end) — полуоткрытый интервал [start, end)."""
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+class EventFields(models.Model):
+    """
+    Общие поля мероприятия: горячая таблица Event и архив ArchivedEvent.
+    Связи (автор, площадка, погода) объявлены в наследниках — у них разные related_name.
+    """
     title = models.CharField(max_length=255, verbose_name="Название")
     description = models.TextField(blank=True, verbose_name="Описание")
     start_at = models.DateTimeField(verbose_name="Начало")
     end_at = models.DateTimeField(verbose_name="Окончание")
     publish_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата публикации")
 
-    author = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.PROTECT,
-        related_name="events",
-        verbose_name="Автор",
-    )
-    venue = models.ForeignKey(
-        Venue,
-        on_delete=models.PROTECT,
-        related_name="events",
-        verbose_name="Место проведения",
-    )
-
     rating = models.PositiveSmallIntegerField(
         validators=[MinValueValidator(0), MaxValueValidator(25)],
         default=0,
@@ -58,18 +58,53 @@ class Event(models.Model):
         verbose_name="Обложка",
     )
 
+    # Полнотекстовый индекс (title + venue.name + description, конфигурация russian).
+    # Заполняется сигналами, см. events/search_services.py
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Интервал проведения [start_at, end_at) — для запросов на пересечение (GiST-индекс)
+    active_range = models.GeneratedField(
+        expression=TsTzRange(F("start_at"), F("end_at")),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.title
+
+
+class Event(EventFields):
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="events",
+        verbose_name="Автор",
+    )
+    venue = models.ForeignKey(
+        Venue,
+        on_delete=models.PROTECT,
+        related_name="events",
+        verbose_name="Место проведения",
+    )
+
+    # Без FK-ограничения в БД: weather_weathersnapshot секционирована по created_at,
+    # и уникального ключа только по id у неё нет. SET_NULL при удалении снимка выполняет Django.
     weather = models.OneToOneField(
         WeatherSnapshot, 
         on_delete=models.SET_NULL, 
         null=True, 
         blank=True,
+        db_constraint=False,
         related_name='event',
         verbose_name="Погода",
     )
 
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
     class Meta:
         verbose_name = "Мероприятие"
         verbose_name_plural = "Мероприятия"
@@ -85,14 +120,97 @@ class Event(models.Model):
             ),
         ]
 
-    def __str__(self):
-        return self.title
+        # Композитные индексы под keyset-пагинацию: (ключ сортировки, id).
+        # Обратный порядок (-start_at, -id) обслуживается тем же индексом.
+        indexes = [
+            models.Index(fields=["start_at", "id"], name="event_start_at_id_idx"),
+            models.Index(fields=["end_at", "id"], name="event_end_at_id_idx"),
+            models.Index(fields=["title", "id"], name="event_title_id_idx"),
+            GinIndex(fields=["search_vector"], name="event_search_vector_gin"),
+            # Частичные индексы только по PUBLISHED: публичный трафик всегда фильтрует по статусу,
+            # а опубликованные события — малая часть таблицы.
+            models.Index(
+                fields=["start_at", "id"],
+                name="event_pub_start_idx",
+                condition=Q(status=EventStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=["end_at", "id"],
+                name="event_pub_end_idx",
+                condition=Q(status=EventStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=["title", "id"],
+                name="event_pub_title_idx",
+                condition=Q(status=EventStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=["venue", "start_at"],
+                name="event_pub_venue_start_idx",
+                condition=Q(status=EventStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=["rating", "start_at"],
+                name="event_pub_rating_start_idx",
+                condition=Q(status=EventStatus.PUBLISHED),
+            ),
+            GistIndex(fields=["active_range"], name="event_active_range_gist"),
+            # Составной GiST (venue_id, active_range) для проверки двойного бронирования
+            # создаётся миграцией через RunSQL: ему нужно расширение btree_gist.
+        ]
+
+
+class ArchivedEvent(EventFields):
+    """
+    Холодный архив: ENDED/DELETED мероприятия старше EVENTS_ARCHIVE_AFTER_DAYS,
+    перенесённые задачей archive_events_task. id сохраняется прежним.
+    Публичные запросы сюда не обращаются, суперпользователь — по ?archived=true.
+    """
+    id = models.BigIntegerField(primary_key=True)
+
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="archived_events",
+        verbose_name="Автор",
+    )
+    venue = models.ForeignKey(
+        Venue,
+        on_delete=models.PROTECT,
+        related_name="archived_events",
+        verbose_name="Место проведения",
+    )
+    weather = models.OneToOneField(
+        WeatherSnapshot,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_constraint=False,
+        related_name='archived_event',
+        verbose_name="Погода",
+    )
+
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Перенесено в архив")
+
+    class Meta:
+        verbose_name = "Архивное мероприятие"
+        verbose_name_plural = "Архив мероприятий"
 
 
 class EventImage(models.Model):
+    # Ровно одна из двух ссылок: на живое мероприятие или на архивное
     event = models.ForeignKey(
         Event,
         on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="images",
+    )
+    archived_event = models.ForeignKey(
+        ArchivedEvent,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
         related_name="images",
     )
     image = models.ImageField(upload_to='events/images/', verbose_name="Файл")
@@ -101,9 +219,18 @@ class EventImage(models.Model):
     class Meta:
         verbose_name = "Фотография"
         verbose_name_plural = "Галерея"
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    Q(event__isnull=False, archived_event__isnull=True)
+                    | Q(event__isnull=True, archived_event__isnull=False)
+                ),
+                name="eventimage_single_owner",
+            ),
+        ]
 
     def __str__(self):
-        return f"Image for event_id={self.event_id}"
+        return f"Image for event_id={self.event_id or self.archived_event_id}"
 
 class EmailNotificationConfig(models.Model):
     """
@@ -0,0 +1,120 @@
+# events/read_services.py
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Func, TextField, Value, When
+from django.db.models.functions import Concat, Left, Length, RTrim
+from django.db.models.lookups import GreaterThan
+from rest_framework import serializers
+
+from .models import Event
+
+# Поля и порядок ключей — как у EventListSerializer
+EVENT_LIST_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "publish_at",
+    "start_at",
+    "end_at",
+    "venue",
+    "rating",
+    "preview_image",
+    "description_excerpt",
+)
+# Отдаются только по явному ?fields=
+EVENT_LIST_OPTIONAL_FIELDS = ("description_excerpt",)
+# Связанные данные деталей, доступные через ?include=
+EVENT_DETAIL_INCLUDES = ("weather", "images")
+
+_datetime_field = serializers.DateTimeField()
+_preview_storage = Event._meta.get_field("preview_image").storage
+
+
+def _datetime(value):
+    return _datetime_field.to_representation(value) if value is not None else None
+
+
+def _file_url(name, request):
+    if not name:
+        return None
+    url = _preview_storage.url(name)
+    return request.build_absolute_uri(url) if request else url
+
+
+def default_list_fields():
+    return [name for name in EVENT_LIST_FIELDS if name not in EVENT_LIST_OPTIONAL_FIELDS]
+
+
+def description_excerpt(length=None):
+    """
+    Начало описания длиной не больше length символов (с многоточием, если обрезано).
+    Считается в БД, поэтому полный description не передаётся по сети.
+    """
+    length = length or settings.EVENTS_DESCRIPTION_EXCERPT_LENGTH
+    return Case(
+        When(
+            GreaterThan(Length("description"), length),
+            then=Concat(RTrim(Left("description", length)), Value("…"), output_field=TextField()),
+        ),
+        default=F("description"),
+        output_field=TextField(),
+    )
+
+
+def event_list_values(queryset, fields=None):
+    """
+    Проекция списка мероприятий через .values(): без экземпляров моделей и GEOS.
+    Координаты площадки достаются в SQL через ST_Y/ST_X, JOIN с площадкой делается
+    только если поле venue запрошено. Аннотации и поля сортировки queryset
+    всегда выбираются — по ним работает keyset-пагинация; updated_at (и venue__updated_at) —
+    для валидаторов страницы (ETag/Last-Modified).
+    """
+    if fields is None:
+        fields = default_list_fields()
+
+    columns = ["id", "updated_at"]
+    columns += [name for name in fields if name not in ("id", "updated_at", "venue", "description_excerpt")]
+    for key in queryset.query.order_by:
+        if isinstance(key, str) and key.lstrip("-") not in columns and "__" not in key:
+            columns.append(key.lstrip("-"))
+    columns += [name for name in queryset.query.annotations if name not in columns]
+
+    expressions = {}
+    if "venue" in fields:
+        columns += ["venue_id", "venue__name", "venue__updated_at"]
+        expressions["venue_latitude"] = Func("venue__location", function="ST_Y", output_field=FloatField())
+        expressions["venue_longitude"] = Func("venue__location", function="ST_X", output_field=FloatField())
+    if "description_excerpt" in fields:
+        expressions["description_excerpt"] = description_excerpt()
+
+    return queryset.values(*columns, **expressions)
+
+
+def represent_event_row(row, request=None, fields=None):
+    """
+    Превращает строку из event_list_values в тот же JSON, что отдаёт EventListSerializer
+    (или в его подмножество, если задан fields).
+    """
+    if fields is None:
+        fields = default_list_fields()
+    data = {}
+    for name in fields:
+        if name == "venue":
+            data["venue"] = {
+                "id": row["venue_id"],
+                "name": row["venue__name"],
+                "location": {
+                    "latitude": row["venue_latitude"],
+                    "longitude": row["venue_longitude"],
+                },
+            }
+        elif name in ("publish_at", "start_at", "end_at"):
+            data[name] = _datetime(row[name])
+        elif name == "preview_image":
+            data[name] = _file_url(row[name], request)
+        else:
+            data[name] = row[name]
+    return data
+
+
+def represent_event_rows(rows, request=None, fields=None):
+    return [represent_event_row(row, request, fields) for row in rows]
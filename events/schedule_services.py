@@ -0,0 +1,27 @@
+# events/schedule_services.py
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+
+from .models import Event, EventStatus
+
+
+def active_during(queryset, start, end):
+    """
+    Мероприятия, идущие хотя бы частично в интервале [start, end):
+    active_range && tstzrange(start, end) по GiST-индексу event_active_range_gist.
+    """
+    return queryset.filter(active_range__overlap=DateTimeTZRange(start, end))
+
+
+def venue_overlaps(venue_id, start_at, end_at, exclude_pk=None):
+    """
+    Неудалённые мероприятия площадки, пересекающиеся с [start_at, end_at).
+    Проверка идёт в БД по индексу event_venue_active_range_gist — события площадки в Python не грузятся.
+    """
+    queryset = active_during(
+        Event.objects.filter(venue_id=venue_id).exclude(status=EventStatus.DELETED),
+        start_at,
+        end_at,
+    )
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset
@@ -0,0 +1,107 @@
+# events/search_services.py
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Subquery, Value, When
+
+from venues.models import Venue
+from .models import Event
+
+SEARCH_CONFIG = "russian"
+
+
+def event_search_vector():
+    """
+    Выражение tsvector для события: название и площадка с весом A, описание с весом B.
+    Название площадки берётся подзапросом, чтобы выражение работало в UPDATE без JOIN.
+    """
+    venue_name = Subquery(Venue.objects.filter(pk=OuterRef("venue_id")).values("name")[:1])
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(venue_name, weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+    )
+
+
+def update_event_search_vector(event_id):
+    Event.objects.filter(pk=event_id).update(search_vector=event_search_vector())
+
+
+def update_venue_events_search_vector(venue_id):
+    """
+    Пересчитывает вектор у всех событий площадки одним UPDATE (после переименования).
+    """
+    Event.objects.filter(venue_id=venue_id).update(search_vector=event_search_vector())
+
+
+def rebuild_search_vectors(queryset=None):
+    """
+    Массовый пересчёт (например, после bulk_create, который не вызывает сигналы).
+    Возвращает количество обновлённых строк.
+    """
+    if queryset is None:
+        queryset = Event.objects.all()
+    return queryset.update(search_vector=event_search_vector())
+
+
+def search_events(queryset, text, keep_ordering=False):
+    """
+    Фильтрует queryset по поисковой строке (синтаксис websearch: "фраза", -исключение, or)
+    и добавляет аннотацию search_rank. Если явная сортировка не задана,
+    результаты упорядочиваются по релевантности.
+    """
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    queryset = queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F("search_vector"), query)
+    )
+    if keep_ordering:
+        return queryset
+    return queryset.order_by("-search_rank", "id")
+
+
+# Сколько кандидатов забирать из trigram-индекса до сортировки.
+# Ограничивает сортировку для коротких частых подстрок на больших таблицах.
+SUGGEST_CANDIDATES_FACTOR = 20
+
+
+def _rank_suggestions(queryset, field, text, limit):
+    """
+    Берёт ограниченный набор кандидатов по `field ILIKE %text%` (GIN pg_trgm индекс
+    по UPPER(field)), затем ставит совпадения с начала строки выше остальных.
+    """
+    candidates = (
+        queryset.order_by()
+        .filter(**{f"{field}__icontains": text})
+        .values("pk")[: limit * SUGGEST_CANDIDATES_FACTOR]
+    )
+    return list(
+        queryset.model.objects.filter(pk__in=candidates)
+        .annotate(
+            prefix_rank=Case(
+                When(**{f"{field}__istartswith": text}, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("prefix_rank", field, "pk")
+        .values_list("pk", field)[:limit]
+    )
+
+
+def suggest_events_and_venues(events_queryset, text, limit):
+    """
+    Подсказки для строки поиска: только id и подпись.
+    events_queryset уже ограничен правилом видимости (PUBLISHED для обычных пользователей),
+    площадки предлагаются только те, у которых есть видимые события.
+    """
+    venues = Venue.objects.filter(
+        Exists(events_queryset.filter(venue=OuterRef("pk")))
+    )
+    return {
+        "events": [
+            {"id": pk, "label": label}
+            for pk, label in _rank_suggestions(events_queryset, "title", text, limit)
+        ],
+        "venues": [
+            {"id": pk, "label": label}
+            for pk, label in _rank_suggestions(venues, "name", text, limit)
+        ],
+    }
@@ -1,8 +1,11 @@
 # events/serializers.py
+from django.conf import settings
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_field
 
-from .models import Event, EventImage
+from core.fieldsets import SparseFieldsetMixin
+from .models import Event, EventImage, EventStatus
+from .schedule_services import venue_overlaps
 from venues.serializers import VenueSerializer
 from weather.serializers import WeatherSnapshotSerializer
 
@@ -29,10 +32,13 @@ class EventListSerializer(serializers.ModelSerializer):
             "preview_image"
         ]
 
-class EventDetailSerializer(serializers.ModelSerializer):
+class EventDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     venue = VenueSerializer(read_only=True)
-    # weather = WeatherSnapshotSerializer(read_only=True)
-    # images = EventImageSerializer(many=True, read_only=True)
+    # Аннотируется в EventViewSet.get_queryset только по запросу ?fields=...,description_excerpt
+    description_excerpt = serializers.CharField(read_only=True)
+    # Отдаются только по ?include=weather,images (сохранённый снимок, без запроса к Open-Meteo)
+    weather = WeatherSnapshotSerializer(read_only=True)
+    images = EventImageSerializer(many=True, read_only=True)
 
     class Meta:
         model = Event
@@ -48,9 +54,11 @@ class EventDetailSerializer(serializers.ModelSerializer):
             "preview_image",
             "status",
             "author",
-            # "weather",
-            # "images",
+            "description_excerpt",
+            "weather",
+            "images",
         ]
+        optional_fields = ["description_excerpt", "weather", "images"]
 
     def to_representation(self, instance):
         """
@@ -70,7 +78,7 @@ class EventDetailSerializer(serializers.ModelSerializer):
 class EventWriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
-        fields = "__all__"
+        exclude = ["search_vector", "active_range"]
         read_only_fields = ["author", "weather", "preview_image", "rating"] 
         
     def validate(self, data):
@@ -78,8 +86,35 @@ class EventWriteSerializer(serializers.ModelSerializer):
         end = data.get('end_at')
         if start and end and end <= start:
             raise serializers.ValidationError({"end_at": "Дата окончания должна быть позже начала."})
+
+        if settings.EVENTS_PREVENT_VENUE_DOUBLE_BOOKING:
+            self.validate_venue_is_free(data)
         return data
 
+    def validate_venue_is_free(self, data):
+        """
+        Площадка не должна быть занята другим мероприятием в это же время.
+        При частичном обновлении недостающие значения берутся из текущего объекта.
+        """
+        instance = self.instance
+        venue = data.get('venue', getattr(instance, 'venue', None))
+        start = data.get('start_at', getattr(instance, 'start_at', None))
+        end = data.get('end_at', getattr(instance, 'end_at', None))
+        if data.get('status', getattr(instance, 'status', None)) == EventStatus.DELETED:
+            return
+        if not (venue and start and end) or end <= start:
+            return
+
+        conflict = (
+            venue_overlaps(venue.pk, start, end, exclude_pk=getattr(instance, 'pk', None))
+            .values_list('id', flat=True)
+            .first()
+        )
+        if conflict:
+            raise serializers.ValidationError(
+                {"start_at": f"Площадка в это время занята мероприятием #{conflict}."}
+            )
+
 class EventImagesUploadSerializer(serializers.Serializer):
     images = serializers.ImageField(required=False)
 
@@ -107,4 +142,20 @@ class EventImagesResponseSerializer(serializers.Serializer):
         return request.build_absolute_uri(url) if request else url
     
 class FileUploadSerializer(serializers.Serializer):
-    file = serializers.FileField()
\ No newline at end of file
+    file = serializers.FileField()
+
+
+class EventBatchRequestSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.EVENTS_BATCH_MAX_IDS,
+    )
+
+    def validate_ids(self, value):
+        # Убираем повторы, сохраняя порядок запроса
+        return list(dict.fromkeys(value))
+
+class EventBatchResponseSerializer(serializers.Serializer):
+    results = EventDetailSerializer(many=True)
+    missing = serializers.ListField(child=serializers.IntegerField())
@@ -5,10 +5,45 @@ from .models import EventImage, Event, EventStatus, EmailNotificationConfig
 from django.contrib.auth.models import User
 
 from events.services import make_preview 
+from events.search_services import update_event_search_vector, update_venue_events_search_vector
+from events.cache_services import invalidate_events_cache
+from venues.map_services import invalidate_map_cache
+from venues.models import Venue
 
 from events.tasks import send_event_notification_task
 from weather.tasks import set_event_weather_forecast_task
 
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Venue)
+@receiver(post_save, sender=EventImage)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Venue)
+@receiver(post_delete, sender=EventImage)
+def invalidate_events_response_cache(sender, instance, **kwargs):
+    """
+    Любое изменение мероприятия, площадки или галереи сбрасывает кэш ответов API мероприятий.
+    """
+    invalidate_events_cache()
+
+# Поля, от которых зависят кластеры и тайлы карты
+MAP_EVENT_FIELDS = {"status", "start_at", "venue"}
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_map_on_event_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Карта показывает число предстоящих опубликованных мероприятий: сбрасываем её кэш,
+    если могли измениться статус, дата или площадка.
+    """
+    if not update_fields or MAP_EVENT_FIELDS & set(update_fields):
+        invalidate_map_cache()
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+def invalidate_map_on_venue_change(sender, instance, update_fields=None, **kwargs):
+    if not update_fields or "location" in update_fields:
+        invalidate_map_cache()
+
 @receiver(post_save, sender=EventImage)
 def generate_preview_on_save(sender, instance, created, **kwargs):
     """
@@ -66,6 +101,24 @@ def trigger_weather_update(sender, instance, created, **kwargs):
     if getattr(instance, '_need_weather_update', False):
         set_event_weather_forecast_task.delay(instance.id)
 
+SEARCH_SOURCE_FIELDS = {"title", "description", "venue"}
+
+@receiver(post_save, sender=Event)
+def refresh_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Пересчитывает search_vector, если изменились поля, из которых он строится.
+    """
+    if created or not update_fields or SEARCH_SOURCE_FIELDS & set(update_fields):
+        update_event_search_vector(instance.pk)
+
+@receiver(post_save, sender=Venue)
+def refresh_venue_events_search_vector(sender, instance, created, **kwargs):
+    """
+    Название площадки входит в search_vector событий — обновляем их одним UPDATE.
+    """
+    if not created:
+        update_venue_events_search_vector(instance.pk)
+
 @receiver(post_save, sender=Event)
 def event_published_notification(sender, instance, created, update_fields=None, **kwargs):
     # Если статус не PUBLISHED, нам тут делать нечего
@@ -5,6 +5,7 @@ from django.core.mail import send_mail
 from django.utils import timezone
 from django.conf import settings
 from .models import Event, EventStatus
+from .archive_services import archive_events
 
 @shared_task
 def send_event_notification_task(event_id, subject, message, recipient_list):
@@ -42,7 +43,16 @@ def publish_scheduled_events_task():
     if count > 0:
         for event in events_to_publish:
             event.status = EventStatus.PUBLISHED
-            event.save(update_fields=['status']) # Это вызовет сигнал post_save
+            event.save(update_fields=['status', 'updated_at']) # Это вызовет сигнал post_save
             
         return f"Published {count} events."
     return "No events to publish."
+
+@shared_task
+def archive_events_task():
+    """
+    Периодическая задача: переносит старые ENDED/DELETED мероприятия в архив,
+    чтобы публичные запросы работали только с небольшой горячей таблицей.
+    """
+    moved = archive_events()
+    return f"Archived {moved} events."
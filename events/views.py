@@ -4,13 +4,35 @@ from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import ValidationError
+from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.db.models import Count, DateField, Prefetch
+from django.db.models.functions import Trunc
+from django.utils.cache import patch_cache_control
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from core.permissions import IsSuperUserOrReadOnly
-from .models import Event, EventImage, EventStatus
-from .serializers import EventImageSerializer, EventImagesUploadSerializer, EventImagesResponseSerializer, FileUploadSerializer, EventListSerializer, EventDetailSerializer, EventWriteSerializer
+from core.pagination import SelectablePagination
+from core.cache import cached_response
+from core.conditional import cached_conditional_response, conditional_response, latest, object_validators, page_validators, queryset_validators
+from core.fieldsets import parse_fieldset
+from .models import ArchivedEvent, Event, EventImage, EventStatus
+from .serializers import EventImageSerializer, EventImagesUploadSerializer, EventImagesResponseSerializer, FileUploadSerializer, EventListSerializer, EventDetailSerializer, EventWriteSerializer, EventBatchRequestSerializer, EventBatchResponseSerializer
 from .services import make_preview
 from .xlsx_services import export_events_to_xlsx, import_events_from_xlsx
-from .filters import EventFilter
+from .filters import ArchivedEventFilter, EventFilter, EventNearFilter, EventOrderingFilter, EventSearchFilter
+from .search_services import suggest_events_and_venues
+from .cache_services import EVENTS_CACHE_NAMESPACE
+from .read_services import (
+    EVENT_DETAIL_INCLUDES,
+    EVENT_LIST_FIELDS,
+    EVENT_LIST_OPTIONAL_FIELDS,
+    description_excerpt,
+    event_list_values,
+    represent_event_rows,
+)
 
 from venues.services import get_venue_coordinates
 
@@ -27,6 +49,9 @@ from drf_spectacular.utils import (
 )
 from drf_spectacular.types import OpenApiTypes
 
+# Интервалы календаря (?period=) — значения kind для date_trunc
+CALENDAR_PERIODS = ("day", "week", "month")
+
 @extend_schema_view(
     list=extend_schema(
         tags=["Мероприятия"],
@@ -34,7 +59,10 @@ from drf_spectacular.types import OpenApiTypes
         description=(
             "Обычный пользователь видит только мероприятия со статусом PUBLISHED. "
             "Суперпользователь видит все статусы.\n\n"
-            "Поддерживаются пагинация, поиск, сортировка и фильтрация."
+            "Поддерживаются пагинация, поиск, сортировка и фильтрация.\n\n"
+            "Пагинация: по умолчанию постраничная (?page=). Для глубокого листания "
+            "используйте ?pagination=cursor и переходите по ссылкам next/previous — "
+            "курсор строится по активной сортировке (ordering) и id, без OFFSET и COUNT(*)."
         ),
         parameters=[
             OpenApiParameter(
@@ -49,14 +77,18 @@ from drf_spectacular.types import OpenApiTypes
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
                 required=False,
-                description="Поиск по названию мероприятия (title) и названию места (venue__name).",
+                description=(
+                    "Полнотекстовый поиск (русская морфология) по названию, месту проведения и описанию. "
+                    "Поддерживает синтаксис websearch: \"точная фраза\", -исключение, or. "
+                    "Без ordering результаты отсортированы по релевантности."
+                ),
             ),
             OpenApiParameter(
                 name="ordering",
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
                 required=False,
-                description="Сортировка: title, start_at, end_at. Пример: ordering=-start_at",
+                description="Сортировка: title, start_at, end_at, distance (только с near). Пример: ordering=-start_at",
             ),
             OpenApiParameter(
                 name="rating_min",
@@ -108,6 +140,57 @@ from drf_spectacular.types import OpenApiTypes
                 many=True,
                 description="Фильтр по месту проведения (можно несколько): ?venue=1&venue=2",
             ),
+            OpenApiParameter(
+                name="archived",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Только для суперпользователя: читать из архива (ENDED/DELETED старше EVENTS_ARCHIVE_AFTER_DAYS).",
+            ),
+            OpenApiParameter(
+                name="active_during",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Мероприятия, идущие хотя бы частично в интервале: начало,конец (ISO 8601). "
+                    "Пример: active_during=2026-10-01T18:00:00Z,2026-10-01T22:00:00Z"
+                ),
+            ),
+            OpenApiParameter(
+                name="near",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Мероприятия рядом с точкой: near=lat,lon (например, 56.01,92.85). "
+                    "Включает сортировку ordering=distance (сначала ближайшие)."
+                ),
+            ),
+            OpenApiParameter(
+                name="radius_km",
+                type=OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Радиус для near в километрах (по умолчанию EVENTS_NEAR_DEFAULT_RADIUS_KM).",
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Какие поля вернуть, через запятую. Пример: fields=id,title,start_at,venue,preview_image. "
+                    "description_excerpt (начало описания, считается в БД) отдаётся только по явному запросу."
+                ),
+            ),
+            OpenApiParameter(
+                name="omit",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Какие поля исключить, через запятую. Пример: omit=description",
+            ),
         ],
         responses={
             200: OpenApiResponse(response=EventListSerializer(many=True), description="Список мероприятий."),
@@ -117,7 +200,43 @@ from drf_spectacular.types import OpenApiTypes
     retrieve=extend_schema(
         tags=["Мероприятия"],
         summary="Детали мероприятия",
-        description="Обычный пользователь может получить только PUBLISHED. Суперпользователь — любые статусы.",
+        description=(
+            "Обычный пользователь может получить только PUBLISHED. Суперпользователь — любые статусы.\n\n"
+            "Поддерживаются ?fields= и ?omit= (как в списке).\n\n"
+            "?include=weather,images добавляет сохранённый прогноз погоды (weather, null если его ещё нет) "
+            "и список изображений (images) — страница мероприятия получает всё одним запросом. "
+            "Внешний погодный API при этом не вызывается."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="archived",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Только для суперпользователя: читать из архива (ENDED/DELETED старше EVENTS_ARCHIVE_AFTER_DAYS).",
+            ),
+            OpenApiParameter(
+                name="include",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Связанные данные через запятую: weather, images.",
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Какие поля вернуть, через запятую.",
+            ),
+            OpenApiParameter(
+                name="omit",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Какие поля исключить, через запятую.",
+            ),
+        ],
         responses={
             200: OpenApiResponse(response=EventDetailSerializer, description="Детали мероприятия."),
             404: OpenApiResponse(description="Мероприятие не найдено или скрыто (не PUBLISHED для обычного пользователя)."),
@@ -189,31 +308,130 @@ from drf_spectacular.types import OpenApiTypes
 )
 class EventViewSet(ModelViewSet):
     permission_classes = [IsSuperUserOrReadOnly]
-    filterset_class = EventFilter
-
-    search_fields = [
-        "title",
-        "venue__name",
-    ]
+    pagination_class = SelectablePagination
+    filter_backends = [DjangoFilterBackend, EventNearFilter, EventOrderingFilter, EventSearchFilter]
 
     ordering_fields = [
         "title",
         "start_at",
         "end_at",
+        # Только вместе с ?near= (см. EventOrderingFilter)
+        "distance",
     ]
     ordering = ["start_at"] 
 
+    @property
+    def filterset_class(self):
+        return ArchivedEventFilter if self.is_archived_request() else EventFilter
+
+    def is_archived_request(self):
+        """
+        ?archived=true у суперпользователя: список и детали читаются из архива (ArchivedEvent).
+        Остальным параметр ничего не даёт — публичные запросы идут только в горячую таблицу.
+        """
+        request = getattr(self, "request", None)
+        if request is None or getattr(self, "action", None) not in ("list", "retrieve"):
+            return False
+        user = request.user
+        return (
+            user.is_authenticated
+            and user.is_superuser
+            and request.query_params.get("archived", "").lower() in ("1", "true", "yes")
+        )
+
     def get_queryset(self):
-        qs = Event.objects.select_related("venue", "author")
+        model = ArchivedEvent if self.is_archived_request() else Event
+        qs = model.objects.select_related("venue", "author").defer("search_vector")
         
         # if self.action == 'retrieve':
         #    qs = qs.prefetch_related("images", "weather")
 
+        if self.action == "retrieve":
+            qs = self.restrict_to_fieldset(qs, self.get_fieldset())
+            qs = self.with_includes(qs, self.get_fieldset())
+
         user = self.request.user
         if user.is_authenticated and user.is_superuser:
             return qs
         return qs.filter(status=EventStatus.PUBLISHED)
 
+    def get_fieldset(self):
+        """
+        Поля ответа из ?fields= / ?omit= (только list и retrieve), None — без ограничений.
+        """
+        if not hasattr(self, "_fieldset"):
+            if self.action == "list":
+                self._fieldset = parse_fieldset(self.request, EVENT_LIST_FIELDS, EVENT_LIST_OPTIONAL_FIELDS)
+            elif self.action == "retrieve":
+                self._fieldset = parse_fieldset(
+                    self.request,
+                    EventDetailSerializer.Meta.fields,
+                    EventDetailSerializer.Meta.optional_fields,
+                )
+                includes = self.get_includes()
+                if includes:
+                    if self._fieldset is None:
+                        self._fieldset = [
+                            name for name in EventDetailSerializer.Meta.fields
+                            if name not in EventDetailSerializer.Meta.optional_fields
+                        ]
+                    self._fieldset = [
+                        name for name in EventDetailSerializer.Meta.fields
+                        if name in self._fieldset or name in includes
+                    ]
+            else:
+                self._fieldset = None
+        return self._fieldset
+
+    def get_includes(self):
+        """
+        Связанные данные для страницы мероприятия из ?include=weather,images.
+        """
+        includes = [name.strip() for name in self.request.query_params.get("include", "").split(",") if name.strip()]
+        unknown = [name for name in includes if name not in EVENT_DETAIL_INCLUDES]
+        if unknown:
+            raise ValidationError({"include": f"Неизвестные значения: {', '.join(unknown)}"})
+        return includes
+
+    @staticmethod
+    def with_includes(qs, fields):
+        """
+        Погода — JOIN в том же запросе, изображения — один дополнительный запрос.
+        """
+        if fields and "weather" in fields:
+            qs = qs.select_related("weather__venue")
+        if fields and "images" in fields:
+            qs = qs.prefetch_related(Prefetch("images", queryset=EventImage.objects.order_by("-created_at")))
+        return qs
+
+    @staticmethod
+    def restrict_to_fieldset(qs, fields):
+        """
+        Сужает SELECT деталей до запрошенных полей: .only() и JOIN с площадкой только при необходимости.
+        """
+        if fields is not None:
+            columns = ["id", "updated_at"]
+            for name in fields:
+                if name == "venue":
+                    columns += ["venue__id", "venue__name", "venue__location", "venue__updated_at"]
+                elif name not in ("description_excerpt", "images"):
+                    columns.append(name)
+
+            qs = qs.select_related(None)
+            if "venue" in fields:
+                qs = qs.select_related("venue")
+            qs = qs.only(*columns)
+
+        if fields and "description_excerpt" in fields:
+            qs = qs.annotate(description_excerpt=description_excerpt())
+        return qs
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "retrieve":
+            context["fields"] = self.get_fieldset()
+        return context
+
     def get_serializer_class(self):
         """
         Выбор сериализатора в зависимости от действия.
@@ -232,12 +450,87 @@ class EventViewSet(ModelViewSet):
             
         return EventDetailSerializer
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = self.get_fieldset()
+        # Площадка входит в ответ, поэтому её updated_at тоже влияет на Last-Modified
+        validator_fields = ("updated_at", "venue__updated_at") if fields is None or "venue" in fields else ("updated_at",)
+
+        if self.paginator is not None and self.paginator.get_mode(request, self) != "page":
+            return self.list_page_first(request, queryset, fields, validator_fields)
+
+        # Режим page: агрегат COUNT + MAX по отфильтрованному набору считается только
+        # при промахе и хранится вместе с ответом — попадание в кэш обходится без БД
+        return cached_conditional_response(
+            request,
+            EVENTS_CACHE_NAMESPACE,
+            ["list"],
+            lambda: queryset_validators(request, queryset, validator_fields),
+            lambda: self.build_list_response(request, queryset),
+            timeout=settings.EVENTS_RESPONSE_CACHE_SECONDS,
+        )
+
+    def list_page_first(self, request, queryset, fields, validator_fields):
+        """
+        cursor / nocount / estimate: сначала выбирается страница (LIMIT или keyset),
+        валидаторы считаются по её строкам и навигации — без COUNT/MAX по всему набору.
+        """
+        page = self.paginate_queryset(event_list_values(queryset, fields))
+        response = self.get_paginated_response(represent_event_rows(page, request, fields))
+        navigation = [f"{key}={value}" for key, value in response.data.items() if key != "results"]
+        etag, last_modified = page_validators(request, page, validator_fields, navigation)
+        return conditional_response(request, etag, last_modified, lambda: response)
+
+    def build_list_response(self, request, queryset):
+        """
+        Быстрый путь списка: строки через .values() вместо EventListSerializer.
+        Формат JSON совпадает с EventListSerializer; ?fields= / ?omit= сужают и SELECT, и ответ.
+        """
+        fields = self.get_fieldset()
+        rows = event_list_values(queryset, fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(represent_event_rows(page, request, fields))
+        return Response(represent_event_rows(rows, request, fields))
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        fields = self.get_fieldset()
+        venue_updated_at = instance.venue.updated_at if fields is None or "venue" in fields else None
+        weather_created_at = instance.weather.created_at if fields and "weather" in fields and instance.weather else None
+        # Изображения уже подгружены prefetch_related — берём их без запросов
+        images = list(instance.images.all()) if fields and "images" in fields else []
+        etag, last_modified = object_validators(
+            request,
+            instance.pk,
+            latest(
+                instance.updated_at,
+                venue_updated_at,
+                weather_created_at,
+                *(image.created_at for image in images),
+            ),
+            len(images),
+        )
+
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: cached_response(
+                request,
+                EVENTS_CACHE_NAMESPACE,
+                ["retrieve", instance.pk],
+                lambda: Response(self.get_serializer(instance).data),
+                timeout=settings.EVENTS_RESPONSE_CACHE_SECONDS,
+            ),
+        )
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
     def perform_destroy(self, instance):
         instance.status = EventStatus.DELETED
-        instance.save(update_fields=["status"])
+        instance.save(update_fields=["status", "updated_at"])
 
     @action(detail=True, methods=[], url_path="images", parser_classes=[MultiPartParser, FormParser])
     def images(self, request, pk=None):
@@ -337,6 +630,184 @@ class EventViewSet(ModelViewSet):
             
         return Response({"message": f"Successfully imported {result['created']} events."}, status=status.HTTP_201_CREATED)
     
+    @extend_schema(
+        tags=["Мероприятия"],
+        summary="Подсказки для строки поиска",
+        description=(
+            "Лёгкий typeahead по названиям мероприятий и площадок (подстрока, без учёта регистра). "
+            "Возвращает только id и подпись, не более limit записей в каждой группе. "
+            "Учитывает правило видимости: обычный пользователь получает подсказки только по PUBLISHED. "
+            "Ответ можно кэшировать на короткое время (Cache-Control: max-age)."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description="Введённый текст (минимум EVENTS_SUGGEST_MIN_LENGTH символов).",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Сколько подсказок вернуть в каждой группе (максимум EVENTS_SUGGEST_MAX_RESULTS).",
+            ),
+        ],
+        responses={200: OpenApiResponse(description='{"events": [{"id", "label"}], "venues": [{"id", "label"}]}')},
+    )
+    @action(detail=False, methods=["get"], url_path="suggest", filter_backends=[], pagination_class=None)
+    def suggest(self, request):
+        text = request.query_params.get("q", "").strip()
+        max_results = settings.EVENTS_SUGGEST_MAX_RESULTS
+        try:
+            limit = min(max(int(request.query_params.get("limit", max_results)), 1), max_results)
+        except ValueError:
+            limit = max_results
+
+        if len(text) < settings.EVENTS_SUGGEST_MIN_LENGTH:
+            data = {"events": [], "venues": []}
+        else:
+            data = suggest_events_and_venues(self.get_queryset(), text, limit)
+
+        response = Response(data)
+        # Суперпользователь видит и черновики — его ответы не должны попадать в общие кэши
+        is_public = not (request.user.is_authenticated and request.user.is_superuser)
+        patch_cache_control(
+            response,
+            public=is_public,
+            private=not is_public,
+            max_age=settings.EVENTS_SUGGEST_CACHE_SECONDS,
+        )
+        return response
+
+    @extend_schema(
+        tags=["Мероприятия"],
+        summary="Календарь: количество мероприятий по дням/неделям/месяцам",
+        description=(
+            "Группирует мероприятия по началу (date_trunc по start_at в указанном часовом поясе) "
+            "и возвращает количество в каждом интервале — одним запросом.\n\n"
+            "Поддерживаются те же фильтры, что и у списка (start_from/start_to, rating_min, venue, search, near...). "
+            "Ответ кэшируется и сбрасывается при изменении мероприятий."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="period",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                enum=list(CALENDAR_PERIODS),
+                description="Размер интервала: day (по умолчанию), week или month.",
+            ),
+            OpenApiParameter(
+                name="tz",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Часовой пояс IANA, например Asia/Krasnoyarsk (по умолчанию TIME_ZONE).",
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description='{"period", "tz", "buckets": [{"date": "2026-10-01", "count": 3}]}'),
+            400: OpenApiResponse(description="Неизвестный period или часовой пояс."),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="calendar", pagination_class=None)
+    def calendar(self, request):
+        period = request.query_params.get("period", "day")
+        if period not in CALENDAR_PERIODS:
+            raise ValidationError({"period": f"Допустимые значения: {', '.join(CALENDAR_PERIODS)}."})
+        tz_name = request.query_params.get("tz") or settings.TIME_ZONE
+        try:
+            tz = ZoneInfo(tz_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValidationError({"tz": "Неизвестный часовой пояс."})
+
+        def build_response():
+            buckets = (
+                self.filter_queryset(self.get_queryset())
+                .order_by()
+                .annotate(bucket=Trunc("start_at", period, output_field=DateField(), tzinfo=tz))
+                .values("bucket")
+                .annotate(count=Count("id"))
+                .order_by("bucket")
+            )
+            return Response({
+                "period": period,
+                "tz": tz_name,
+                "buckets": [{"date": row["bucket"].isoformat(), "count": row["count"]} for row in buckets],
+            })
+
+        return cached_response(
+            request,
+            EVENTS_CACHE_NAMESPACE,
+            ["calendar"],
+            build_response,
+            timeout=settings.EVENTS_RESPONSE_CACHE_SECONDS,
+        )
+
+    @extend_schema(
+        tags=["Мероприятия"],
+        summary="Несколько мероприятий по списку id",
+        description=(
+            "Возвращает мероприятия в том порядке, в котором перечислены id, одним запросом к БД.\n\n"
+            "GET: ?ids=1,2,3 (или ?ids=1&ids=2). POST: {\"ids\": [1, 2, 3]} — для длинных списков.\n"
+            "Действует то же правило видимости, что и для деталей: обычный пользователь получает только PUBLISHED. "
+            "Ненайденные и недоступные id перечисляются в missing, остальные возвращаются как обычно."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="id через запятую (только для GET).",
+            ),
+        ],
+        request=EventBatchRequestSerializer,
+        responses={
+            200: EventBatchResponseSerializer,
+            400: OpenApiResponse(description="Пустой или слишком длинный список id."),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get", "post"],
+        url_path="batch",
+        filter_backends=[],
+        pagination_class=None,
+        permission_classes=[AllowAny],
+    )
+    def batch(self, request):
+        """
+        POST здесь только способ передать длинный список id — данные не меняются,
+        поэтому доступен всем так же, как GET.
+        """
+        if request.method == "POST":
+            payload = request.data
+        else:
+            payload = {
+                "ids": [
+                    part.strip()
+                    for value in request.query_params.getlist("ids")
+                    for part in value.split(",")
+                    if part.strip()
+                ]
+            }
+        serializer = EventBatchRequestSerializer(data=payload)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        found = self.get_queryset().in_bulk(ids)
+        events = [found[pk] for pk in ids if pk in found]
+        missing = [pk for pk in ids if pk not in found]
+
+        return Response({
+            "results": EventDetailSerializer(events, many=True, context=self.get_serializer_context()).data,
+            "missing": missing,
+        })
+
     @extend_schema(
         tags=["Мероприятия / Погода"],
         summary="Получить погоду для события",
@@ -348,8 +819,14 @@ class EventViewSet(ModelViewSet):
         event = self.get_object()
 
         if event.weather:
-            serializer = WeatherSnapshotSerializer(event.weather)
-            return Response(serializer.data)
+            snapshot = event.weather
+            etag, last_modified = object_validators(request, snapshot.pk, snapshot.created_at)
+            return conditional_response(
+                request,
+                etag,
+                last_modified,
+                lambda: Response(WeatherSnapshotSerializer(snapshot).data),
+            )
 
         if not event.venue or not event.venue.location:
             return Response(
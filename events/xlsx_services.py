@@ -66,13 +66,15 @@ def export_events_to_xlsx(queryset):
     ]
     ws.append(headers)
 
-    for event in queryset:
+    # Только нужные колонки, без экземпляров моделей; iterator() не держит всю выборку в памяти
+    rows = queryset.values_list("publish_at", "start_at", "end_at", "venue__name", "rating")
+    for publish_at, start_at, end_at, venue_name, rating in rows.iterator(chunk_size=2000):
         ws.append([
-            event.publish_at.strftime("%Y-%m-%d %H:%M") if event.publish_at else "",
-            event.start_at.strftime("%Y-%m-%d %H:%M"),
-            event.end_at.strftime("%Y-%m-%d %H:%M"),
-            event.venue.name,
-            event.rating
+            publish_at.strftime("%Y-%m-%d %H:%M") if publish_at else "",
+            start_at.strftime("%Y-%m-%d %H:%M"),
+            end_at.strftime("%Y-%m-%d %H:%M"),
+            venue_name,
+            rating
         ])
 
     buffer = BytesIO()
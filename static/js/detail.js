@@ -14,9 +14,9 @@ let allSlides = [];
 async function initEventPage(id) {
     const container = document.getElementById('event-detail-content');
     
-    // 1. Сначала грузим основную инфу (критично для отображения)
+    // Один запрос: детали + сохранённая погода + галерея
     try {
-        const response = await fetch(`/api/events/${id}/`);
+        const response = await fetch(`/api/events/${id}/?include=weather,images`);
         if (response.status === 404) {
             container.innerHTML = '<div class="alert alert-warning text-center mt-5">Событие не найдено или скрыто.</div>';
             return;
@@ -27,10 +27,15 @@ async function initEventPage(id) {
         
         // Рендерим скелет и основную инфу
         renderMainInfo(event);
+        renderImages(event.images || []);
         showContent(); // Показываем верстку пользователю
 
-        // 2. Параллельно догружаем "тяжелые" данные (не блокируя интерфейс)
-        loadAdditionalData(id);
+        if (event.weather) {
+            renderWeather(event.weather);
+        } else {
+            // Снимка погоды ещё нет — запрашиваем его отдельно, не блокируя интерфейс
+            loadWeather(id);
+        }
 
     } catch (error) {
         console.error(error);
@@ -84,41 +89,32 @@ function renderMainInfo(event) {
 }
 
 /**
- * Асинхронная дозагрузка Погоды и Картинкок
+ * Дозагрузка погоды, если в ответе деталей её не было
  */
-async function loadAdditionalData(id) {
-    // Используем allSettled, чтобы ошибка в одном запросе не ломала другой
-    const [weatherResult, imagesResult] = await Promise.allSettled([
-        fetch(`/api/events/${id}/weather/`),
-        fetch(`/api/events/${id}/images/`)
-    ]);
-
-    // Обработка Погоды
-    if (weatherResult.status === 'fulfilled' && weatherResult.value.ok) {
-        const weatherData = await weatherResult.value.json();
-        renderWeather(weatherData);
+async function loadWeather(id) {
+    try {
+        const response = await fetch(`/api/events/${id}/weather/`);
+        if (response.ok) {
+            renderWeather(await response.json());
+        }
+    } catch (error) {
+        console.error(error);
     }
+}
 
-    // Обработка Дополнительных Изображений
-    if (imagesResult.status === 'fulfilled' && imagesResult.value.ok) {
-    const imagesData = await imagesResult.value.json();
-
-    // - пагинация: {count, next, previous, results:[...]}
-    // - либо EventImagesResponse: {preview_image_url, images:[...]} [file:1]
-    const imagesList = imagesData.results || imagesData.images || [];
+/**
+ * Галерея: если есть реальные фото — убираем превью и пересобираем карусель
+ */
+function renderImages(imagesList) {
+    if (imagesList.length === 0) return;
 
-    if (imagesList.length > 0) {
-        // КЛЮЧЕВОЕ: если есть реальные фото — убираем превью и пересобираем карусель
-        resetCarousel();
+    resetCarousel();
 
-        imagesList.forEach((imgObj, idx) => {
-        const url = imgObj.image || imgObj;
-        addSlide(url, idx === 0); // первый слайд активный
-        });
+    imagesList.forEach((imgObj, idx) => {
+        addSlide(imgObj.image, idx === 0); // первый слайд активный
+    });
 
-        updateCarouselControls();
-        }
-    }
+    updateCarouselControls();
 }
 
 /**
@@ -6,8 +6,58 @@ document.addEventListener('DOMContentLoaded', () => {
         e.preventDefault();
         loadEvents(1); 
     });
+
+    initSearchSuggestions();
 });
 
+const SUGGEST_MIN_LENGTH = 3;
+const SUGGEST_DEBOUNCE_MS = 250;
+
+/**
+ * Подсказки при вводе в строку поиска (лёгкий эндпоинт /api/events/suggest/)
+ */
+function initSearchSuggestions() {
+    const input = document.getElementById('search');
+    const datalist = document.getElementById('search-suggestions');
+    if (!input || !datalist) return;
+
+    let timer = null;
+    let controller = null;
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const query = input.value.trim();
+        if (query.length < SUGGEST_MIN_LENGTH) {
+            datalist.innerHTML = '';
+            return;
+        }
+
+        timer = setTimeout(async () => {
+            // Отменяем предыдущий запрос, если пользователь продолжил печатать
+            if (controller) controller.abort();
+            controller = new AbortController();
+
+            try {
+                const params = new URLSearchParams({ q: query });
+                const response = await fetch(`/api/events/suggest/?${params.toString()}`, { signal: controller.signal });
+                if (!response.ok) return;
+
+                const data = await response.json();
+                const labels = new Set([...data.events, ...data.venues].map(item => item.label));
+
+                datalist.innerHTML = '';
+                labels.forEach(label => {
+                    const option = document.createElement('option');
+                    option.value = label;
+                    datalist.appendChild(option);
+                });
+            } catch (error) {
+                if (error.name !== 'AbortError') console.warn('Не удалось загрузить подсказки:', error);
+            }
+        }, SUGGEST_DEBOUNCE_MS);
+    });
+}
+
 
 async function loadVenues() {
     const select = document.getElementById('venueFilter');
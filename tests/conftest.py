@@ -1,8 +1,11 @@
 # tests/conftest.py
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from pytest_factoryboy import register
 from tests.factories import UserFactory, VenueFactory, EventFactory
+from weather.provider_services import breaker, rate_limiter
+from weather.stub_server import OpenMeteoStub
 
 register(UserFactory)
 register(VenueFactory)
@@ -11,3 +14,25 @@ register(EventFactory)
 @pytest.fixture
 def api_client():
     return APIClient()
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш (LocMem) живёт весь процесс — изолируем тесты друг от друга."""
+    cache.clear()
+    yield
+    cache.clear()
+
+@pytest.fixture(autouse=True)
+def local_response_cache(settings):
+    """Тесты идут в одном процессе — кэш ответов на LocMem здесь корректен."""
+    settings.RESPONSE_CACHE_ALLOW_LOCAL = True
+
+@pytest.fixture
+def open_meteo_stub(settings):
+    """Локальный stub Open-Meteo (weather/stub_server.py); OPEN_METEO_URL указывает на него."""
+    breaker.reset()
+    rate_limiter.reset()
+    with OpenMeteoStub() as stub:
+        settings.OPEN_METEO_URL = stub.url
+        yield stub
+    breaker.reset()
@@ -0,0 +1,59 @@
+# tests/test_archive.py
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+
+from events.archive_services import archive_events
+from events.models import ArchivedEvent, Event, EventImage, EventStatus
+from weather.models import WeatherSnapshot
+from tests.test_images import generate_image_file
+
+@pytest.mark.django_db
+def test_archive_moves_old_ended_events_with_images_and_weather(event_factory):
+    old_start = timezone.now() - timedelta(days=400)
+    old = event_factory(status=EventStatus.ENDED, start_at=old_start, end_at=old_start + timedelta(hours=2))
+    old.weather = WeatherSnapshot.objects.create(
+        venue=old.venue, temperature_celsius=1.0, humidity_percent=80,
+        pressure_mmhg=740, wind_direction="N", wind_speed_ms=2.0,
+    )
+    old.save(update_fields=['weather'])
+    # Первая картинка через сигнал становится превью мероприятия
+    image = EventImage.objects.create(event=old, image=generate_image_file("old.jpg"))
+    stored = Event.objects.get(pk=old.pk)
+    assert stored.preview_image
+
+    recent = event_factory(status=EventStatus.ENDED)
+    published = event_factory(status=EventStatus.PUBLISHED, start_at=old_start, end_at=old_start + timedelta(hours=2))
+
+    assert archive_events() == 1
+
+    assert not Event.objects.filter(pk=old.pk).exists()
+    assert Event.objects.filter(pk__in=[recent.pk, published.pk]).count() == 2
+
+    archived = ArchivedEvent.objects.get(pk=old.pk)
+    assert archived.title == old.title
+    assert archived.created_at == stored.created_at
+    assert archived.preview_image.name == stored.preview_image.name
+    assert archived.weather_id == old.weather_id
+    assert list(archived.images.values_list('image', flat=True)) == [image.image.name]
+    assert not EventImage.objects.filter(event_id=old.pk).exists()
+
+@pytest.mark.django_db
+def test_archived_events_visible_only_to_superuser_on_request(api_client, event_factory, user_factory):
+    old_start = timezone.now() - timedelta(days=400)
+    old = event_factory(status=EventStatus.DELETED, start_at=old_start, end_at=old_start + timedelta(hours=2))
+    Event.objects.filter(pk=old.pk).update(updated_at=old_start)
+    archive_events()
+
+    url = reverse('events-list')
+    response = api_client.get(url, {'archived': 'true'})
+    assert old.id not in [e['id'] for e in response.data['results']]
+
+    api_client.force_authenticate(user=user_factory(is_superuser=True))
+    response = api_client.get(url, {'archived': 'true'})
+    assert [e['id'] for e in response.data['results']] == [old.id]
+
+    response = api_client.get(reverse('events-detail', args=[old.id]), {'archived': 'true'})
+    assert response.status_code == 200
+    assert response.data['title'] == old.title
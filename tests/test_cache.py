@@ -0,0 +1,127 @@
+# tests/test_cache.py
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from core.cache import BYPASS, HIT, MISS, STALE, build_key, get_or_compute, bump_generation
+from events.models import EventStatus
+
+@pytest.mark.django_db
+def test_event_list_cache_hit_and_invalidation(api_client, event_factory):
+    event = event_factory(title="До изменения", status=EventStatus.PUBLISHED)
+    url = reverse('events-list')
+
+    response = api_client.get(url, {'ordering': 'start_at'})
+    assert response['X-Cache'] == MISS
+
+    response = api_client.get(url, {'ordering': 'start_at'})
+    assert response['X-Cache'] == HIT
+    assert response.data['results'][0]['title'] == "До изменения"
+
+    # Сохранение события (post_save) сбрасывает поколение кэша
+    event.title = "После изменения"
+    event.save()
+
+    response = api_client.get(url, {'ordering': 'start_at'})
+    assert response['X-Cache'] == MISS
+    assert response.data['results'][0]['title'] == "После изменения"
+
+@pytest.mark.django_db
+def test_event_cache_separates_superuser_and_public(api_client, event_factory, user_factory):
+    event_factory(status=EventStatus.PUBLISHED)
+    event_factory(status=EventStatus.DRAFT)
+    url = reverse('events-list')
+
+    assert len(api_client.get(url).data['results']) == 1
+
+    api_client.force_authenticate(user=user_factory(is_superuser=True))
+    response = api_client.get(url)
+    assert response['X-Cache'] == MISS
+    assert len(response.data['results']) == 2
+
+def test_stale_copy_served_while_another_worker_recomputes():
+    """
+    Пока один воркер держит блокировку пересчёта, остальные получают прошлую копию.
+    """
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    assert get_or_compute("test", ["k"], compute, timeout=60) == ({"value": 1}, MISS)
+
+    bump_generation("test")
+    cache.add(f"{build_key('test', 'k')}:lock", 1)
+
+    assert get_or_compute("test", ["k"], compute, timeout=60) == ({"value": 1}, STALE)
+    assert len(calls) == 1
+
+@pytest.mark.django_db
+def test_event_detail_conditional_get(api_client, event_factory):
+    event = event_factory(status=EventStatus.PUBLISHED)
+    url = reverse('events-detail', args=[event.id])
+
+    response = api_client.get(url)
+    assert response.status_code == 200
+    etag = response['ETag']
+    assert response['Last-Modified']
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert not response.content
+
+    event.title = "Новое название"
+    event.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+@pytest.mark.django_db
+def test_list_conditional_get_tracks_filtered_set(api_client, event_factory, venue_factory):
+    event_factory(status=EventStatus.PUBLISHED)
+    url = reverse('events-list')
+
+    etag = api_client.get(url)['ETag']
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # Новое опубликованное событие меняет COUNT/MAX(updated_at) -> новый ETag
+    event_factory(status=EventStatus.PUBLISHED)
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    venue = venue_factory()
+    venue_url = reverse('venues-detail', args=[venue.id])
+    venue_etag = api_client.get(venue_url)['ETag']
+    assert api_client.get(venue_url, HTTP_IF_NONE_MATCH=venue_etag).status_code == 304
+
+@pytest.mark.django_db
+def test_list_cache_hit_skips_validator_aggregate(api_client, event_factory, django_assert_num_queries):
+    """Валидаторы списка хранятся вместе с ответом: попадание в кэш (200 и 304) не ходит в БД."""
+    event_factory(status=EventStatus.PUBLISHED)
+    url = reverse('events-list')
+
+    response = api_client.get(url)
+    assert response['X-Cache'] == MISS
+    etag = response['ETag']
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url)
+    assert response['X-Cache'] == HIT
+    assert response['ETag'] == etag
+
+    with django_assert_num_queries(0):
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+@pytest.mark.django_db
+def test_response_cache_bypassed_on_process_local_backend(api_client, event_factory, settings):
+    """На LocMem без явного разрешения ответы не кэшируются: сброс не дошёл бы до других воркеров."""
+    settings.RESPONSE_CACHE_ALLOW_LOCAL = False
+    event = event_factory(title="До изменения", status=EventStatus.PUBLISHED)
+    url = reverse('events-list')
+
+    assert api_client.get(url)['X-Cache'] == BYPASS
+    assert api_client.get(url)['X-Cache'] == BYPASS
+
+    event.title = "После изменения"
+    event.save()
+    assert api_client.get(url).data['results'][0]['title'] == "После изменения"
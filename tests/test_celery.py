@@ -57,28 +57,29 @@ def test_update_weather_snapshots_periodic(venue_factory, mocker):
     v1 = venue_factory(name="Park Gorky")
     v2 = venue_factory(name="VDNH")
     
-    mock_fetch = mocker.patch('weather.tasks.fetch_weather_for_venue')
+    mock_fetch = mocker.patch('weather.services.AsyncWeatherClient.current')
     
-    mock_fetch.side_effect = [
+    # Обе площадки уходят одним пачечным запросом
+    mock_fetch.side_effect = [[
         { # Для v1
             "temperature_celsius": 20.0,
             "humidity_percent": 40,
             "pressure_mmhg": 760,
             "wind_speed_ms": 2.0,
-            "wind_direction": 180
+            "wind_direction": "S"
         },
         { # Для v2
             "temperature_celsius": 22.0,
             "humidity_percent": 45,
             "pressure_mmhg": 755,
             "wind_speed_ms": 3.0,
-            "wind_direction": 200
+            "wind_direction": "SW"
         }
-    ]
+    ]]
     
     results = update_weather_snapshots()
     
-    assert mock_fetch.call_count == 2
+    assert mock_fetch.call_count == 1
     
     assert WeatherSnapshot.objects.count() == 2
     
@@ -89,4 +90,185 @@ def test_update_weather_snapshots_periodic(venue_factory, mocker):
     assert s2.temperature_celsius == 22.0
     
     assert "Updated Park Gorky" in results
-    assert "Updated VDNH" in results
\ No newline at end of file
+    assert "Updated VDNH" in results
+
+
+@pytest.mark.django_db
+def test_rollup_weather_daily(venue_factory, event_factory):
+    """Старые снимки сворачиваются в суточную сводку и удаляются; прогноз события в сводку не входит и остаётся."""
+    from weather.models import WeatherDailyAggregate
+    from weather.rollup_services import rollup_weather
+
+    venue = venue_factory()
+    old = timezone.now() - timedelta(days=30)
+    snapshots = [
+        WeatherSnapshot.objects.create(
+            venue=venue, temperature_celsius=t, humidity_percent=50,
+            pressure_mmhg=750, wind_direction="N", wind_speed_ms=2.0,
+        )
+        for t in (10.0, 20.0)
+    ]
+    WeatherSnapshot.objects.filter(pk__in=[s.pk for s in snapshots]).update(created_at=old)
+    fresh = WeatherSnapshot.objects.create(
+        venue=venue, temperature_celsius=5.0, humidity_percent=50,
+        pressure_mmhg=750, wind_direction="N", wind_speed_ms=2.0,
+    )
+    event_factory(venue=venue, weather=snapshots[1])
+
+    created, deleted = rollup_weather()
+
+    assert created == 1
+    daily = WeatherDailyAggregate.objects.get(venue=venue)
+    assert daily.samples == 1
+    assert daily.temperature_min == 10.0
+    assert daily.temperature_max == 10.0
+    assert daily.temperature_avg == 10.0
+
+    assert deleted == 1
+    assert set(WeatherSnapshot.objects.values_list("pk", flat=True)) == {snapshots[1].pk, fresh.pk}
+
+    # Повторный запуск не дублирует сводки
+    assert rollup_weather() == (0, 0)
+
+
+@pytest.mark.django_db
+def test_update_weather_snapshots_upserts_current_weather(api_client, venue_factory, user_factory, mocker):
+    """Сбор погоды обновляет CurrentWeather, эндпоинт отдаёт одну строку на площадку."""
+    from django.urls import reverse
+    from weather.models import CurrentWeather
+
+    v1 = venue_factory(name="Park Gorky")
+    v2 = venue_factory(name="VDNH")
+    weather = {
+        "humidity_percent": 40,
+        "pressure_mmhg": 760,
+        "wind_speed_ms": 2.0,
+        "wind_direction": "S",
+    }
+    mock_fetch = mocker.patch('weather.services.AsyncWeatherClient.current')
+
+    mock_fetch.side_effect = [[{"temperature_celsius": 10.0, **weather}, {"temperature_celsius": 11.0, **weather}]]
+    update_weather_snapshots()
+    mock_fetch.side_effect = [[{"temperature_celsius": 20.0, **weather}, None]]
+    update_weather_snapshots()
+
+    assert CurrentWeather.objects.count() == 2
+    assert CurrentWeather.objects.get(venue=v1).temperature_celsius == 20.0
+    assert CurrentWeather.objects.get(venue=v2).temperature_celsius == 11.0
+
+    admin = user_factory(is_superuser=True, is_staff=True)
+    api_client.force_authenticate(user=admin)
+    response = api_client.get(reverse('venues-current-weather'), {"venue": str(v1.pk)})
+    assert response.status_code == 200
+    assert [row["venue"] for row in response.data] == [v1.pk]
+    assert response.data[0]["venue_name"] == "Park Gorky"
+
+
+@pytest.mark.django_db
+def test_save_weather_snapshots_batches_requests(venue_factory, open_meteo_stub):
+    """Площадки опрашиваются параллельными пачками через stub Open-Meteo, ответы сопоставляются по порядку."""
+    from weather.services import save_weather_snapshots
+    from weather.stub_server import stub_current
+
+    venues = venue_factory.create_batch(5)
+
+    snapshots, failed, latencies = save_weather_snapshots(venues, batch_size=2, concurrency=2)
+
+    assert open_meteo_stub.requests == 3
+    assert len(latencies) == 3
+    assert open_meteo_stub.locations == 5
+    assert failed == []
+    assert WeatherSnapshot.objects.count() == 5
+    for snapshot in snapshots:
+        location = snapshot.venue.location
+        assert snapshot.temperature_celsius == stub_current(location.y, location.x)["temperature_2m"]
+
+
+def test_get_forecast_for_time(open_meteo_stub):
+    """Прогноз на час события берётся из блока hourly через общую сессию провайдера."""
+    from datetime import datetime
+    from weather.forecast_cache_services import forecast_cell
+    from weather.services import get_forecast_for_time
+    from weather.stub_server import stub_current
+
+    forecast = get_forecast_for_time(55.75, 37.62, datetime(2026, 6, 1, 18, 0))
+
+    assert open_meteo_stub.requests == 1
+    # Запрашивается центр ячейки сетки кэша
+    assert forecast["temperature_celsius"] == stub_current(*forecast_cell(55.75, 37.62))["temperature_2m"] + 1.8
+
+
+def test_forecast_cache_shares_day_series(open_meteo_stub):
+    """Другие часы того же дня и соседние точки той же ячейки берутся из кэша."""
+    from datetime import datetime
+    from weather.forecast_cache_services import forecast_cache_stats, forecast_cell
+    from weather.services import get_forecast_for_time
+
+    lat, lon = forecast_cell(55.75, 37.62)
+    get_forecast_for_time(lat, lon, datetime(2026, 6, 1, 10, 0))
+    get_forecast_for_time(lat, lon, datetime(2026, 6, 1, 18, 0))
+    get_forecast_for_time(lat + 0.01, lon - 0.01, datetime(2026, 6, 1, 12, 0))
+    assert open_meteo_stub.requests == 1
+
+    get_forecast_for_time(lat, lon, datetime(2026, 6, 2, 10, 0))
+    assert open_meteo_stub.requests == 2
+
+    stats = forecast_cache_stats()
+    assert stats["hit"] == 2
+    assert stats["miss"] == 2
+
+
+def test_weather_circuit_breaker_fails_fast(open_meteo_stub, settings):
+    """После серии ошибок провайдера запросы не уходят в сеть, пока не пройдёт пробный."""
+    import time
+    from weather.provider_services import CircuitBreaker, breaker
+    from weather.services import fetch_current_weather
+
+    settings.WEATHER_CIRCUIT_FAILURE_THRESHOLD = 2
+    settings.WEATHER_CIRCUIT_RESET_SECONDS = 0.05
+    open_meteo_stub.fail_status = 503
+
+    for _ in range(3):
+        assert fetch_current_weather([(55.75, 37.62)]) == [None]
+
+    # Два вызова по запросу и одному повтору, третий отклонён без запроса
+    assert open_meteo_stub.requests == 4
+    assert breaker.state == CircuitBreaker.OPEN
+
+    open_meteo_stub.fail_status = None
+    time.sleep(0.1)
+    assert fetch_current_weather([(55.75, 37.62)])[0] is not None
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize("prune", [True, False])
+@pytest.mark.django_db
+def test_rollup_weather_late_snapshot(venue_factory, prune):
+    """Опоздавший снимок за уже свёрнутый день дописывается в сводку и не удаляется без учёта."""
+    from weather.models import WeatherDailyAggregate
+    from weather.rollup_services import rollup_weather
+
+    venue = venue_factory()
+    old = timezone.now() - timedelta(days=30)
+
+    def add_snapshot(temperature):
+        snapshot = WeatherSnapshot.objects.create(
+            venue=venue, temperature_celsius=temperature, humidity_percent=50,
+            pressure_mmhg=750, wind_direction="N", wind_speed_ms=2.0,
+        )
+        WeatherSnapshot.objects.filter(pk=snapshot.pk).update(created_at=old)
+
+    add_snapshot(10.0)
+    assert rollup_weather(prune=prune) == (1, 1 if prune else 0)
+
+    add_snapshot(30.0)
+    assert rollup_weather(prune=prune) == (1, 1 if prune else 0)
+
+    daily = WeatherDailyAggregate.objects.get(venue=venue)
+    assert daily.samples == 2
+    assert daily.temperature_min == 10.0
+    assert daily.temperature_max == 30.0
+    assert daily.temperature_avg == 20.0
+    assert WeatherSnapshot.objects.filter(venue=venue).count() == (0 if prune else 2)
+
+    assert rollup_weather(prune=prune) == (0, 0)
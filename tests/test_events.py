@@ -150,3 +150,119 @@ def test_get_weather_action(api_client, event_factory, mocker):
     assert response.status_code == 200
     assert response.data['temperature_celsius'] == 25.0
     mock_weather.assert_called_once()
+
+@pytest.mark.django_db
+def test_fast_list_matches_event_list_serializer(api_client, event_factory):
+    """Быстрый путь списка (values + ST_X/ST_Y) отдаёт тот же JSON, что EventListSerializer."""
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from events.models import Event
+    from events.serializers import EventListSerializer
+
+    event_factory.create_batch(3, status=EventStatus.PUBLISHED)
+
+    response = api_client.get(reverse('events-list'))
+    assert response.status_code == 200
+
+    request = Request(APIRequestFactory().get('/api/events/'))
+    expected = EventListSerializer(
+        Event.objects.select_related('venue').order_by('start_at'), many=True, context={'request': request}
+    ).data
+    assert response.json()['results'] == [dict(item) for item in expected]
+
+@pytest.mark.django_db
+def test_event_list_sparse_fieldset(api_client, event_factory):
+    """?fields= сужает ответ, description_excerpt считается в БД и обрезается с многоточием."""
+    event_factory(status=EventStatus.PUBLISHED, description="x" * 500)
+
+    response = api_client.get(reverse('events-list'), {'fields': 'id,title,description_excerpt'})
+    assert response.status_code == 200
+    item = response.json()['results'][0]
+    assert set(item) == {'id', 'title', 'description_excerpt'}
+    assert item['description_excerpt'].endswith('…')
+    assert len(item['description_excerpt']) <= 161
+
+    response = api_client.get(reverse('events-list'), {'fields': 'id,unknown'})
+    assert response.status_code == 400
+
+@pytest.mark.django_db
+def test_event_detail_omit(api_client, event_factory):
+    event = event_factory(status=EventStatus.PUBLISHED)
+
+    response = api_client.get(reverse('events-detail', args=[event.id]), {'omit': 'description,venue'})
+    assert response.status_code == 200
+    assert 'description' not in response.data
+    assert 'venue' not in response.data
+    assert response.data['title'] == event.title
+
+@pytest.mark.django_db
+def test_event_batch_preserves_order_and_reports_missing(api_client, event_factory, django_assert_max_num_queries):
+    first, second = event_factory.create_batch(2, status=EventStatus.PUBLISHED)
+    draft = event_factory(status=EventStatus.DRAFT)
+    url = reverse('events-batch')
+
+    with django_assert_max_num_queries(1):
+        response = api_client.get(url, {'ids': f'{second.id},{draft.id},{first.id},999999'})
+    assert response.status_code == 200
+    assert [item['id'] for item in response.data['results']] == [second.id, first.id]
+    assert response.data['missing'] == [draft.id, 999999]
+
+    response = api_client.post(url, {'ids': [first.id, second.id]}, format='json')
+    assert response.status_code == 200
+    assert [item['id'] for item in response.data['results']] == [first.id, second.id]
+
+    response = api_client.get(url)
+    assert response.status_code == 400
+
+@pytest.mark.django_db
+def test_event_detail_include_weather_and_images(api_client, event_factory, mocker, django_assert_max_num_queries):
+    """?include=weather,images: всё для страницы мероприятия одним ответом, без вызова погодного API."""
+    from events.models import EventImage
+    from weather.models import WeatherSnapshot
+    from tests.test_images import generate_image_file
+
+    mock_weather = mocker.patch('events.views.get_forecast_for_time')
+    event = event_factory(status=EventStatus.PUBLISHED)
+    event.weather = WeatherSnapshot.objects.create(
+        venue=event.venue, temperature_celsius=20.0, humidity_percent=40,
+        pressure_mmhg=750, wind_direction="S", wind_speed_ms=3.0,
+    )
+    event.save(update_fields=['weather'])
+    # Первая картинка через сигнал станет превью — файлы должны быть настоящими
+    EventImage.objects.create(event=event, image=generate_image_file("a.jpg"))
+    EventImage.objects.create(event=event, image=generate_image_file("b.jpg"))
+
+    url = reverse('events-detail', args=[event.id])
+    with django_assert_max_num_queries(2):
+        response = api_client.get(url, {'include': 'weather,images'})
+    assert response.status_code == 200
+    assert response.data['weather']['temperature_celsius'] == 20.0
+    assert response.data['weather']['venue_name'] == event.venue.name
+    assert len(response.data['images']) == 2
+    mock_weather.assert_not_called()
+
+    response = api_client.get(url)
+    assert 'weather' not in response.data
+    assert 'images' not in response.data
+
+    response = api_client.get(url, {'include': 'comments'})
+    assert response.status_code == 400
+
+@pytest.mark.django_db
+def test_venue_double_booking_check(api_client, user_factory, venue_factory, event_factory, settings):
+    settings.EVENTS_PREVENT_VENUE_DOUBLE_BOOKING = True
+    admin = user_factory(is_superuser=True)
+    venue = venue_factory()
+    api_client.force_authenticate(user=admin)
+    existing = event_factory(
+        venue=venue, start_at="2026-05-01T18:00:00Z", end_at="2026-05-01T21:00:00Z",
+    )
+
+    url = reverse('events-list')
+    data = {"title": "Overlap", "venue": venue.id, "start_at": "2026-05-01T20:00:00Z", "end_at": "2026-05-01T22:00:00Z"}
+    response = api_client.post(url, data)
+    assert response.status_code == 400
+    assert str(existing.id) in str(response.data['start_at'])
+
+    data.update(start_at="2026-05-01T21:00:00Z")
+    assert api_client.post(url, data).status_code == 201
@@ -103,4 +103,81 @@ def test_ordering_events_all_fields(api_client, event_factory):
     res = response.data['results']
     assert res[0]['id'] == e3.id
     assert res[1]['id'] == e2.id
-    assert res[2]['id'] == e1.id
\ No newline at end of file
+    assert res[2]['id'] == e1.id
+
+
+@pytest.mark.django_db
+def test_near_filter_and_distance_ordering(api_client, event_factory, venue_factory):
+    """?near=lat,lon&radius_km= оставляет площадки в радиусе, ordering=distance — ближайшие первыми."""
+    from django.contrib.gis.geos import Point
+
+    center = (56.0106, 92.8526)
+    close = venue_factory(location=Point(92.86, 56.02, srid=4326))    # ~1.3 км
+    farther = venue_factory(location=Point(92.95, 56.05, srid=4326))  # ~7 км
+    remote = venue_factory(location=Point(37.62, 55.75, srid=4326))   # Москва
+    e_far = event_factory(venue=farther, status=EventStatus.PUBLISHED)
+    e_close = event_factory(venue=close, status=EventStatus.PUBLISHED)
+    event_factory(venue=remote, status=EventStatus.PUBLISHED)
+
+    url = reverse('events-list')
+    response = api_client.get(url, {'near': f'{center[0]},{center[1]}', 'radius_km': 20, 'ordering': 'distance'})
+    assert response.status_code == 200
+    assert [e['id'] for e in response.data['results']] == [e_close.id, e_far.id]
+
+    response = api_client.get(url, {'near': f'{center[0]},{center[1]}', 'radius_km': 3})
+    assert [e['id'] for e in response.data['results']] == [e_close.id]
+
+    response = api_client.get(url, {'near': 'abc'})
+    assert response.status_code == 400
+
+    # Без near сортировка по distance игнорируется
+    response = api_client.get(url, {'ordering': 'distance'})
+    assert response.status_code == 200
+
+@pytest.mark.django_db
+def test_calendar_buckets_respect_timezone_and_filters(api_client, event_factory):
+    """Календарь: группировка по дням в заданном часовом поясе, с фильтрами списка."""
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    utc = ZoneInfo('UTC')
+    # 20:00 UTC 1 октября — это уже 2 октября в Красноярске (UTC+7)
+    late = datetime(2026, 10, 1, 20, 0, tzinfo=utc)
+    noon = datetime(2026, 10, 2, 5, 0, tzinfo=utc)
+    other = datetime(2026, 10, 5, 5, 0, tzinfo=utc)
+    for start in (late, noon, other):
+        event_factory(start_at=start, end_at=start + timedelta(hours=1), status=EventStatus.PUBLISHED, rating=10)
+    event_factory(start_at=other, end_at=other + timedelta(hours=1), status=EventStatus.PUBLISHED, rating=1)
+
+    url = reverse('events-calendar')
+    response = api_client.get(url, {'tz': 'Asia/Krasnoyarsk', 'rating_min': 5})
+    assert response.status_code == 200
+    assert response.data['buckets'] == [
+        {'date': '2026-10-02', 'count': 2},
+        {'date': '2026-10-05', 'count': 1},
+    ]
+
+    response = api_client.get(url, {'period': 'month', 'tz': 'UTC'})
+    assert response.data['buckets'] == [{'date': '2026-10-01', 'count': 4}]
+
+    assert api_client.get(url, {'tz': 'Mars/Olympus'}).status_code == 400
+
+@pytest.mark.django_db
+def test_active_during_returns_overlapping_events(api_client, event_factory):
+    """?active_during= — мероприятия, пересекающиеся с интервалом (tstzrange &&)."""
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    day = datetime(2026, 10, 1, tzinfo=ZoneInfo('UTC'))
+    afternoon = event_factory(start_at=day.replace(hour=15), end_at=day.replace(hour=19), status=EventStatus.PUBLISHED)
+    evening = event_factory(start_at=day.replace(hour=20), end_at=day.replace(hour=23), status=EventStatus.PUBLISHED)
+    event_factory(start_at=day.replace(hour=9), end_at=day.replace(hour=12), status=EventStatus.PUBLISHED)
+    # Заканчивается ровно в 18:00 — интервал полуоткрытый, не пересекается
+    event_factory(start_at=day.replace(hour=16), end_at=day.replace(hour=18), status=EventStatus.PUBLISHED)
+
+    url = reverse('events-list')
+    response = api_client.get(url, {'active_during': '2026-10-01T18:00:00Z,2026-10-01T22:00:00Z'})
+    assert response.status_code == 200
+    assert {e['id'] for e in response.data['results']} == {afternoon.id, evening.id}
+
+    assert api_client.get(url, {'active_during': '2026-10-01T18:00:00Z'}).status_code == 400
@@ -0,0 +1,153 @@
+# tests/test_pagination.py
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+
+from events.models import EventStatus
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_all_events(api_client, event_factory):
+    """
+    Курсорная пагинация: обходим все страницы по next и обратно по previous.
+    У части событий одинаковый start_at — порядок внутри группы держит id.
+    """
+    now = timezone.now()
+    same_start = now + timedelta(days=1)
+    events = [
+        event_factory(start_at=same_start, end_at=same_start + timedelta(hours=1), status=EventStatus.PUBLISHED)
+        for _ in range(4)
+    ]
+    events += [
+        event_factory(start_at=now + timedelta(days=i + 2), end_at=now + timedelta(days=i + 2, hours=1), status=EventStatus.PUBLISHED)
+        for i in range(3)
+    ]
+    expected = [e.id for e in sorted(events, key=lambda e: (e.start_at, e.id))]
+
+    url = reverse('events-list')
+    response = api_client.get(url, {'pagination': 'cursor', 'page_size': 3})
+    assert response.status_code == 200
+    assert 'count' not in response.data
+    assert response.data['previous'] is None
+
+    seen = [r['id'] for r in response.data['results']]
+    pages = [response.data]
+    while response.data['next']:
+        response = api_client.get(response.data['next'])
+        seen += [r['id'] for r in response.data['results']]
+        pages.append(response.data)
+
+    assert seen == expected
+    assert len(pages) == 3
+
+    # Назад со второй страницы возвращает первую
+    response = api_client.get(pages[1]['previous'])
+    assert [r['id'] for r in response.data['results']] == expected[:3]
+
+@pytest.mark.django_db
+def test_cursor_pagination_respects_ordering_and_visibility(api_client, event_factory):
+    now = timezone.now()
+    published = [
+        event_factory(start_at=now + timedelta(days=i), end_at=now + timedelta(days=i, hours=1), status=EventStatus.PUBLISHED)
+        for i in range(1, 4)
+    ]
+    event_factory(status=EventStatus.DRAFT)
+
+    url = reverse('events-list')
+    response = api_client.get(url, {'pagination': 'cursor', 'ordering': '-start_at', 'page_size': 2})
+    ids = [r['id'] for r in response.data['results']]
+    response = api_client.get(response.data['next'])
+    ids += [r['id'] for r in response.data['results']]
+
+    assert ids == [e.id for e in reversed(published)]
+    assert response.data['next'] is None
+
+@pytest.mark.django_db
+def test_cursor_list_validators_skip_count(api_client, event_factory):
+    """В режиме cursor ETag считается по странице: ни COUNT(*), ни MAX() по всему списку."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    event_factory.create_batch(3, status=EventStatus.PUBLISHED)
+    url = reverse('events-list')
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url, {'pagination': 'cursor', 'page_size': 2})
+    assert response.status_code == 200
+    assert not any('COUNT(' in q['sql'].upper() or 'MAX(' in q['sql'].upper() for q in queries.captured_queries)
+
+    etag = response['ETag']
+    response = api_client.get(url, {'pagination': 'cursor', 'page_size': 2}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404(api_client):
+    response = api_client.get(reverse('events-list'), {'cursor': 'not-a-cursor'})
+    assert response.status_code == 404
+
+@pytest.mark.django_db
+def test_venue_weather_history_uses_cursor(api_client, venue_factory):
+    """История погоды по умолчанию листается курсором по created_at, без COUNT(*)."""
+    from weather.models import WeatherSnapshot
+
+    venue = venue_factory()
+    WeatherSnapshot.objects.bulk_create([
+        WeatherSnapshot(
+            venue=venue, temperature_celsius=i, humidity_percent=50,
+            pressure_mmhg=760, wind_direction="N", wind_speed_ms=1.0,
+        )
+        for i in range(15)
+    ])
+    url = reverse('venues-weather', args=[venue.id])
+
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert 'count' not in response.data
+    assert len(response.data['results']) == 10
+    first_ids = [r['id'] for r in response.data['results']]
+
+    response = api_client.get(response.data['next'])
+    assert response.data['next'] is None
+    assert len(response.data['results']) == 5
+    assert not set(first_ids) & {r['id'] for r in response.data['results']}
+
+    response = api_client.get(url, {'pagination': 'nocount'})
+    assert response.data['has_next'] is True
+
+    response = api_client.get(url, {'pagination': 'page'})
+    assert response.data['count'] == 15
+
+@pytest.mark.django_db
+def test_venue_weather_history_window(api_client, venue_factory):
+    """?since= / ?until= ограничивают окно истории."""
+    from weather.models import WeatherSnapshot
+
+    venue = venue_factory()
+    now = timezone.now()
+    for days in (1, 3, 5):
+        snapshot = WeatherSnapshot.objects.create(
+            venue=venue, temperature_celsius=days, humidity_percent=50,
+            pressure_mmhg=760, wind_direction="N", wind_speed_ms=1.0,
+        )
+        WeatherSnapshot.objects.filter(pk=snapshot.pk).update(created_at=now - timedelta(days=days))
+    url = reverse('venues-weather', args=[venue.id])
+
+    response = api_client.get(url, {
+        'since': (now - timedelta(days=4)).isoformat(),
+        'until': (now - timedelta(days=2)).isoformat(),
+    })
+    assert response.status_code == 200
+    assert [r['temperature_celsius'] for r in response.data['results']] == [3.0]
+
+    response = api_client.get(url, {'since': now.isoformat(), 'until': (now - timedelta(days=1)).isoformat()})
+    assert response.status_code == 400
+
+@pytest.mark.django_db
+def test_estimated_count_falls_back_to_exact_on_small_sets(api_client, event_factory):
+    event_factory.create_batch(3, status=EventStatus.PUBLISHED)
+
+    response = api_client.get(reverse('events-list'), {'pagination': 'estimate'})
+    assert response.status_code == 200
+    assert response.data['count'] == 3
+    assert response.data['count_is_estimate'] is False
+    assert response.data['has_next'] is False
@@ -0,0 +1,62 @@
+# tests/test_search.py
+import pytest
+from django.urls import reverse
+
+from events.models import EventStatus
+
+@pytest.mark.django_db
+def test_fulltext_search_matches_morphology(api_client, event_factory):
+    """
+    Поиск по search_vector: русская морфология (концерты -> концерт), описание и площадка.
+    """
+    concert = event_factory(title="Большой концерт", description="", status=EventStatus.PUBLISHED)
+    event_factory(title="Выставка картин", description="Графика и живопись", status=EventStatus.PUBLISHED)
+    event_factory(title="Концерт для своих", status=EventStatus.DRAFT)
+
+    url = reverse('events-list')
+
+    response = api_client.get(url, {'search': 'концерты'})
+    assert [r['id'] for r in response.data['results']] == [concert.id]
+
+    response = api_client.get(url, {'search': 'живописи'})
+    assert len(response.data['results']) == 1
+
+@pytest.mark.django_db
+def test_fulltext_search_by_venue_name_and_rank(api_client, event_factory, venue_factory):
+    venue = venue_factory(name="Филармония")
+    in_title = event_factory(title="Филармония открывает сезон", venue=venue, status=EventStatus.PUBLISHED)
+    only_venue = event_factory(title="Вечер романса", venue=venue, status=EventStatus.PUBLISHED)
+
+    url = reverse('events-list')
+    response = api_client.get(url, {'search': 'филармония'})
+    ids = [r['id'] for r in response.data['results']]
+    # Совпадение и в названии, и в площадке ранжируется выше
+    assert ids == [in_title.id, only_venue.id]
+
+    # Переименование площадки обновляет векторы её событий
+    venue.name = "Консерватория"
+    venue.save()
+    response = api_client.get(url, {'search': 'консерватория'})
+    assert len(response.data['results']) == 2
+
+@pytest.mark.django_db
+def test_suggest_returns_labels_for_visible_events(api_client, event_factory, venue_factory):
+    venue = venue_factory(name="Концертный зал Орион")
+    event_factory(title="Органный концерт", venue=venue, status=EventStatus.PUBLISHED)
+    first = event_factory(title="Концерт симфонического оркестра", venue=venue, status=EventStatus.PUBLISHED)
+    event_factory(title="Концерт черновик", status=EventStatus.DRAFT)
+
+    url = reverse('events-suggest')
+    response = api_client.get(url, {'q': 'конц'})
+
+    assert response.status_code == 200
+    labels = [item['label'] for item in response.data['events']]
+    # Совпадения с начала названия идут первыми, черновик скрыт
+    assert labels[0] == first.title
+    assert "Концерт черновик" not in labels
+    assert len(labels) == 2
+    assert response.data['venues'] == [{'id': venue.id, 'label': venue.name}]
+    assert 'max-age=' in response['Cache-Control']
+
+    response = api_client.get(url, {'q': 'ко'})
+    assert response.data == {'events': [], 'venues': []}
@@ -96,4 +96,116 @@ def test_venue_delete_forbidden_for_user(api_client, user_factory, venue_factory
     response = api_client.delete(url)
     assert response.status_code == 403
     
-    assert Venue.objects.filter(id=venue.id).exists()
\ No newline at end of file
+    assert Venue.objects.filter(id=venue.id).exists()
+
+
+@pytest.mark.django_db
+def test_venue_list_omit_location(api_client, venue_factory, django_assert_num_queries):
+    venue_factory.create_batch(2)
+
+    # Валидаторы, COUNT пагинации и страница; отложенный location не догружается построчно
+    with django_assert_num_queries(3):
+        response = api_client.get(reverse('venues-list'), {'omit': 'location'})
+    assert response.status_code == 200
+    assert all(set(item) == {'id', 'name'} for item in response.json()['results'])
+
+@pytest.mark.django_db
+def test_venue_clusters(api_client, venue_factory, event_factory):
+    """Кластеры считаются в SQL, содержат число площадок и предстоящих опубликованных событий."""
+    from datetime import timedelta
+    from django.contrib.gis.geos import Point
+    from django.utils import timezone
+    from events.models import EventStatus
+
+    first = venue_factory(location=Point(92.850, 56.010, srid=4326))
+    second = venue_factory(location=Point(92.851, 56.011, srid=4326))
+    venue_factory(location=Point(37.62, 55.75, srid=4326))
+    soon = timezone.now() + timedelta(days=3)
+    event_factory(venue=first, status=EventStatus.PUBLISHED, start_at=soon, end_at=soon + timedelta(hours=2))
+    event_factory(venue=second, status=EventStatus.PUBLISHED, start_at=soon, end_at=soon + timedelta(hours=2))
+    event_factory(venue=second, status=EventStatus.DRAFT, start_at=soon, end_at=soon + timedelta(hours=2))
+
+    url = reverse('venues-clusters')
+    response = api_client.get(url, {'bbox': '92.7,55.9,93.1,56.1', 'zoom': 10})
+    assert response.status_code == 200
+    assert response['X-Cache'] == 'MISS'
+    clusters = response.data['clusters']
+    assert len(clusters) == 1
+    assert clusters[0]['venues'] == 2
+    assert clusters[0]['upcoming_events'] == 2
+
+    # Соседний bbox внутри тех же ячеек сетки — тот же ключ кэша
+    response = api_client.get(url, {'bbox': '92.71,55.91,93.09,56.09', 'zoom': 10})
+    assert response['X-Cache'] == 'HIT'
+
+    response = api_client.get(url, {'bbox': '1,2,3', 'zoom': 10})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_venue_clusters_cells_do_not_depend_on_bbox(api_client, venue_factory):
+    """Ячейка на краю выровненного bbox не обрезается: пересекающиеся bbox дают для неё одно и то же число."""
+    import math
+    from django.contrib.gis.geos import Point
+    from venues.map_services import cluster_grid_size
+
+    zoom = 10
+    grid = cluster_grid_size(zoom)
+    col, row = math.floor(92.85 / grid), math.floor(56.01 / grid)
+    # Обе площадки в одной ячейке [col·grid, (col+1)·grid), по разные стороны от её середины
+    for offset in (0.2, 0.8):
+        venue_factory(location=Point((col + offset) * grid, (row + 0.5) * grid, srid=4326))
+
+    url = reverse('venues-clusters')
+    min_lat, max_lat = (row - 1) * grid, (row + 2) * grid
+    # Один bbox режет ячейку слева, другой — справа
+    for min_lon, max_lon in (((col + 0.5) * grid, (col + 3) * grid), ((col - 2) * grid, (col + 0.5) * grid)):
+        response = api_client.get(url, {'bbox': f'{min_lon},{min_lat},{max_lon},{max_lat}', 'zoom': zoom})
+        assert response.status_code == 200
+        assert [cluster['venues'] for cluster in response.data['clusters']] == [2]
+
+@pytest.mark.django_db
+def test_venue_tile_is_cached_and_invalidated(api_client, venue_factory):
+    """MVT-тайл собирается в PostGIS, кэшируется и сбрасывается при переносе площадки."""
+    from django.contrib.gis.geos import Point
+
+    venue = venue_factory(location=Point(92.85, 56.01, srid=4326))
+    # Тайл зума 0 покрывает весь мир
+    url = reverse('venues-tile', kwargs={'z': 0, 'x': 0, 'y': 0})
+
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/vnd.mapbox-vector-tile'
+    assert response['X-Cache'] == 'MISS'
+    assert len(response.content) > 0
+
+    assert api_client.get(url)['X-Cache'] == 'HIT'
+
+    venue.location = Point(37.62, 55.75, srid=4326)
+    venue.save()
+    assert api_client.get(url)['X-Cache'] == 'MISS'
+
+    assert api_client.get(reverse('venues-tile', kwargs={'z': 1, 'x': 5, 'y': 0})).status_code == 404
+
+
+@pytest.mark.django_db
+def test_venue_tile_includes_buffer_zone(api_client, venue_factory, settings):
+    """Площадка чуть за краем тайла (в пределах VENUES_TILE_BUFFER) попадает в тайл."""
+    import math
+    from django.contrib.gis.geos import Point
+
+    z, lat = 10, 56.01
+    x = math.floor((92.85 + 180) / 360 * 2 ** z)
+    y = math.floor((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * 2 ** z)
+    tile_width = 360 / 2 ** z
+    west_edge = x * tile_width - 180
+    # Половина буфера западнее тайла
+    venue_factory(location=Point(west_edge - tile_width * settings.VENUES_TILE_BUFFER / settings.VENUES_TILE_EXTENT / 2, lat, srid=4326))
+
+    response = api_client.get(reverse('venues-tile', kwargs={'z': z, 'x': x, 'y': y}))
+    assert response.status_code == 200
+    assert len(response.content) > 0
+
+    # Соседний тайл, в котором площадка лежит по-настоящему, её тоже содержит
+    response = api_client.get(reverse('venues-tile', kwargs={'z': z, 'x': x - 1, 'y': y}))
+    assert response.status_code == 200
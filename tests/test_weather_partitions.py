@@ -0,0 +1,97 @@
+# tests/test_weather_partitions.py
+import importlib
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from weather.models import WeatherSnapshot
+from weather.partition_services import (
+    DEFAULT_PARTITION,
+    add_months,
+    drop_expired_partitions,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    partition_name,
+)
+
+
+@pytest.fixture
+def partitioned_snapshots():
+    """
+    Тесты идут с --nomigrations, поэтому таблица снимков обычная. Применяем SQL миграции
+    weather 0005 внутри тестовой транзакции — DDL в PostgreSQL откатится вместе с ней.
+    """
+    migration = importlib.import_module("weather.migrations.0005_partition_weathersnapshot")
+    if not is_partitioned():
+        with connection.cursor() as cursor:
+            cursor.execute(migration.PARTITION_WEATHERSNAPSHOT)
+    assert is_partitioned()
+
+
+def create_snapshot(venue, created_at):
+    snapshot = WeatherSnapshot.objects.create(
+        venue=venue, temperature_celsius=10.0, humidity_percent=50,
+        pressure_mmhg=750, wind_direction="N", wind_speed_ms=2.0,
+    )
+    WeatherSnapshot.objects.filter(pk=snapshot.pk).update(created_at=created_at)
+    return snapshot
+
+
+def snapshot_partition(snapshot):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text FROM {WeatherSnapshot._meta.db_table} WHERE id = %s",
+            [snapshot.pk],
+        )
+        return cursor.fetchone()[0]
+
+
+def test_weather_partition_months():
+    """Помесячные секции: имена и переход через год."""
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+    assert partition_name(date(2026, 3, 1)) == 'weather_weathersnapshot_p202603'
+
+
+@pytest.mark.django_db
+def test_ensure_partitions_creates_months_ahead(partitioned_snapshots):
+    """Секции создаются с текущего месяца на months_ahead вперёд; существующие не пересоздаются."""
+    future = add_months(month_start(timezone.now()), 12)
+    expected = [partition_name(add_months(future, offset)) for offset in range(3)]
+
+    assert ensure_partitions(months_ahead=2, today=future) == expected
+    assert set(expected) <= {name for name, _month in list_partitions()}
+
+    # Повторный запуск ничего не создаёт
+    assert ensure_partitions(months_ahead=2, today=future) == []
+
+
+@pytest.mark.django_db
+def test_drop_expired_partitions_keeps_linked_snapshots(partitioned_snapshots, venue_factory, event_factory):
+    """Старые секции удаляются целиком; снимки, привязанные к событиям, переезжают в DEFAULT."""
+    current = month_start(timezone.now())
+    old = add_months(current, -14)
+    ensure_partitions(months_ahead=1, today=old)
+
+    venue = venue_factory()
+    old_moment = timezone.now().replace(year=old.year, month=old.month, day=15)
+    linked = create_snapshot(venue, old_moment)
+    expired = create_snapshot(venue, old_moment)
+    fresh = create_snapshot(venue, timezone.now())
+    event_factory(venue=venue, weather=linked)
+    assert snapshot_partition(linked) == partition_name(old)
+
+    dropped = drop_expired_partitions(retention_months=12, today=current)
+
+    assert dropped == [(partition_name(old), 1), (partition_name(add_months(old, 1)), 0)]
+    remaining = {name for name, _month in list_partitions()}
+    assert partition_name(old) not in remaining
+    assert partition_name(current) in remaining
+
+    assert set(WeatherSnapshot.objects.values_list("pk", flat=True)) == {linked.pk, fresh.pk}
+    assert not WeatherSnapshot.objects.filter(pk=expired.pk).exists()
+    assert snapshot_partition(linked) == DEFAULT_PARTITION
@@ -0,0 +1,186 @@
+# venues/map_services.py
+import math
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from core.cache import get_or_compute_shared, invalidate
+from events.models import Event, EventStatus
+from .models import Venue
+
+# Пространство имён кэша карты (кластеры, тайлы)
+MAP_CACHE_NAMESPACE = "map"
+
+MAX_ZOOM = 22
+
+
+def invalidate_map_cache():
+    invalidate(MAP_CACHE_NAMESPACE)
+
+
+def cluster_grid_size(zoom):
+    """
+    Шаг сетки кластеризации в градусах: тайл зума z шириной 360/2^z делится на
+    VENUES_CLUSTER_CELLS_PER_TILE ячеек по каждой оси.
+    """
+    return 360 / (2 ** zoom) / settings.VENUES_CLUSTER_CELLS_PER_TILE
+
+
+def snap_bbox(bbox, grid):
+    """
+    Расширяет bbox до границ ячеек сетки. Ячейки кластеров — [k·grid, (k+1)·grid)
+    по каждой оси (см. venue_clusters), поэтому выровненный bbox содержит крайние
+    ячейки целиком, а соседние запросы карты попадают в один ключ кэша.
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    snapped = (
+        max(math.floor(min_lon / grid) * grid, -180.0),
+        max(math.floor(min_lat / grid) * grid, -90.0),
+        min(math.ceil(max_lon / grid) * grid, 180.0),
+        min(math.ceil(max_lat / grid) * grid, 90.0),
+    )
+    # Округление убирает хвосты плавающей точки из ключа кэша
+    return tuple(round(value, 9) for value in snapped)
+
+
+def _upcoming_events_sql(area):
+    """
+    Предстоящие опубликованные мероприятия только площадок из CTE area (площадки
+    в bbox/тайле): агрегат не проходит по событиям всей таблицы на каждый промах кэша.
+    """
+    return f"""
+        SELECT e.venue_id, COUNT(*) AS total, MIN(e.start_at) AS next_start_at
+        FROM {Event._meta.db_table} e
+        JOIN {area} a ON a.id = e.venue_id
+        WHERE e.status = %s AND e.start_at >= %s
+        GROUP BY e.venue_id
+    """
+
+
+def venue_clusters(bbox, zoom):
+    """
+    Кластеры площадок в bbox (min_lon, min_lat, max_lon, max_lat) для зума zoom.
+
+    Один SQL-запрос: площадки в bbox (&& по GiST-индексу) группируются по ячейкам
+    (floor(x / grid), floor(y / grid)) — тем же границам, по которым snap_bbox
+    выравнивает bbox. Для каждой ячейки — центр масс, число площадок и число
+    предстоящих опубликованных мероприятий. venue_id заполнен, если площадка в ячейке одна.
+    """
+    grid = cluster_grid_size(zoom)
+    sql = f"""
+        WITH area AS (
+            SELECT id, location
+            FROM {Venue._meta.db_table}
+            WHERE location && ST_MakeEnvelope(%s, %s, %s, %s, 4326)
+        ),
+        upcoming AS ({_upcoming_events_sql("area")})
+        SELECT
+            ST_Y(ST_Centroid(ST_Collect(v.location))) AS latitude,
+            ST_X(ST_Centroid(ST_Collect(v.location))) AS longitude,
+            COUNT(*) AS venues,
+            COALESCE(SUM(u.total), 0) AS upcoming_events,
+            MIN(v.id) AS venue_id
+        FROM area v
+        LEFT JOIN upcoming u ON u.venue_id = v.id
+        GROUP BY floor(ST_X(v.location) / %s), floor(ST_Y(v.location) / %s)
+        ORDER BY venues DESC
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*bbox, EventStatus.PUBLISHED, timezone.now(), grid, grid])
+        rows = cursor.fetchall()
+
+    return [
+        {
+            "latitude": latitude,
+            "longitude": longitude,
+            "venues": venues,
+            "upcoming_events": int(upcoming_events),
+            "venue_id": venue_id if venues == 1 else None,
+        }
+        for latitude, longitude, venues, upcoming_events, venue_id in rows
+    ]
+
+
+def cached_venue_clusters(bbox, zoom):
+    """
+    Кластеры с кэшем по (зум, выровненный bbox). Возвращает (данные, состояние кэша).
+    """
+    grid = cluster_grid_size(zoom)
+    snapped = snap_bbox(bbox, grid)
+
+    def compute():
+        return {
+            "zoom": zoom,
+            "grid_size": grid,
+            "bbox": list(snapped),
+            "clusters": venue_clusters(snapped, zoom),
+        }
+
+    return get_or_compute_shared(
+        MAP_CACHE_NAMESPACE,
+        ["clusters", zoom, *snapped],
+        compute,
+        timeout=settings.VENUES_MAP_CACHE_SECONDS,
+    )
+
+
+def tile_is_valid(z, x, y):
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def venue_tile(z, x, y):
+    """
+    Mapbox Vector Tile (слой venues) для тайла z/x/y, собранный в PostGIS через ST_AsMVT.
+
+    Атрибуты точки: id, name, upcoming_events (предстоящие опубликованные мероприятия)
+    и next_start_at (ближайшее из них, ISO 8601). Пустой тайл — пустые байты.
+    Площадки выбираются с запасом VENUES_TILE_BUFFER: маркеры у края тайла попадают
+    в оба соседних тайла и не обрезаются.
+    """
+    extent = settings.VENUES_TILE_EXTENT
+    buffer = settings.VENUES_TILE_BUFFER
+    sql = f"""
+        WITH bounds AS (
+            SELECT
+                ST_TileEnvelope(%s, %s, %s) AS geom,
+                ST_TileEnvelope(%s, %s, %s, margin => %s) AS buffered
+        ),
+        area AS (
+            SELECT v.id, v.name, v.location
+            FROM {Venue._meta.db_table} v
+            JOIN bounds ON v.location && ST_Transform(bounds.buffered, 4326)
+        ),
+        upcoming AS ({_upcoming_events_sql("area")}),
+        features AS (
+            SELECT
+                ST_AsMVTGeom(ST_Transform(v.location, 3857), bounds.geom, %s, %s, true) AS geom,
+                v.id,
+                v.name,
+                COALESCE(u.total, 0) AS upcoming_events,
+                to_char(u.next_start_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"') AS next_start_at
+            FROM area v
+            CROSS JOIN bounds
+            LEFT JOIN upcoming u ON u.venue_id = v.id
+        )
+        SELECT ST_AsMVT(features.*, 'venues', %s, 'geom') FROM features WHERE geom IS NOT NULL
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            [z, x, y, z, x, y, buffer / extent, EventStatus.PUBLISHED, timezone.now(), extent, buffer, extent],
+        )
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] is not None else b""
+
+
+def cached_venue_tile(z, x, y):
+    """
+    Тайл с кэшем по z/x/y в пространстве имён карты. Возвращает (байты, состояние кэша).
+    """
+    return get_or_compute_shared(
+        MAP_CACHE_NAMESPACE,
+        ["tile", z, x, y],
+        lambda: venue_tile(z, x, y),
+        timeout=settings.VENUES_MAP_CACHE_SECONDS,
+    )
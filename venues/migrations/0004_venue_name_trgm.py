@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:20
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0003_alter_venue_options'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # Индекс по UPPER(name): именно так Django строит name__icontains на PostgreSQL
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS venue_name_upper_trgm ON venues_venue USING gin (UPPER(name) gin_trgm_ops);",
+            reverse_sql="DROP INDEX IF EXISTS venue_name_upper_trgm;",
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0005_venue_updated_at'),
+    ]
+
+    operations = [
+        # Индекс по выражению (location)::geography: его используют ST_DWithin и KNN <->
+        # из events/geo_services.py. Обычный GiST по geometry для метров на сфере не подходит.
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS venue_location_geog_gist ON venues_venue USING gist ((location::geography));",
+            reverse_sql="DROP INDEX IF EXISTS venue_location_geog_gist;",
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.contrib.gis.db import models
 class Venue(models.Model):
     name = models.CharField(max_length=255, unique=True)
     location = models.PointField(srid=4326)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Площадка"
@@ -1,6 +1,7 @@
 # venues/serializers.py
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
+from core.fieldsets import SparseFieldsetMixin
 from .models import Venue
 
 @extend_schema_serializer(
@@ -16,7 +17,7 @@ from .models import Venue
         )
     ]
 )
-class VenueSerializer(serializers.ModelSerializer):
+class VenueSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     location = serializers.CharField(write_only=True)
 
     class Meta:
@@ -26,7 +27,8 @@ class VenueSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         ret = super().to_representation(instance)
-        if instance.location:
+        # location может быть отложен (.only() при ?fields/?omit) — без поля в ответе его не читаем
+        if 'location' in self.fields and instance.location:
             ret['location'] = {
                 "latitude": instance.location.y,
                 "longitude": instance.location.x
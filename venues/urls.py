@@ -1,8 +1,13 @@
 # venues/urls.py
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import VenueViewSet
+from .views import VenueTileView, VenueViewSet
 
 router = DefaultRouter()
 router.register(r"", VenueViewSet, basename="venues")
 
-urlpatterns = router.urls
+urlpatterns = [
+    # До роутера: иначе "tiles" попадёт в маршрут деталей площадки
+    path("tiles/<int:z>/<int:x>/<int:y>.mvt", VenueTileView.as_view(), name="venues-tile"),
+    *router.urls,
+]
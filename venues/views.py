@@ -1,23 +1,58 @@
 # venues/views.py
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 
-from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiResponse, OpenApiExample
+from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiResponse, OpenApiExample, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
 
 from core.permissions import IsSuperUserOrPublicReadIfAllowed
+from core.conditional import conditional_response, object_validators, page_validators, queryset_validators
+from core.fieldsets import parse_fieldset
+from .map_services import MAX_ZOOM, cached_venue_clusters, cached_venue_tile, tile_is_valid
 from .models import Venue
 from .serializers import VenueSerializer
 
-from weather.serializers import WeatherSnapshotSerializer
-from weather.models import WeatherSnapshot
+from weather.serializers import (
+    CurrentWeatherSerializer,
+    WeatherDailyAggregateSerializer,
+    WeatherHistoryWindowSerializer,
+    WeatherSnapshotSerializer,
+)
+from weather.models import CurrentWeather, WeatherDailyAggregate, WeatherSnapshot
+
+WEATHER_RESOLUTIONS = ("raw", "daily")
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Какие поля вернуть, через запятую. Пример: fields=id,name",
+    ),
+    OpenApiParameter(
+        name="omit",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Какие поля исключить, через запятую. Пример: omit=location",
+    ),
+]
 
 @extend_schema_view(
     list=extend_schema(
         tags=["Площадки"],
         summary="Список площадок",
         description="Возвращает список площадок (мест проведения).",
+        parameters=FIELDSET_PARAMETERS,
         responses={
             200: OpenApiResponse(response=VenueSerializer(many=True), description="Список площадок."),
             403: OpenApiResponse(description="Только для superuser (если публичный доступ отключен)."),
@@ -27,6 +62,7 @@ from weather.models import WeatherSnapshot
         tags=["Площадки"],
         summary="Детали площадки",
         description="Возвращает одну площадку по её id.",
+        parameters=FIELDSET_PARAMETERS,
         responses={
             200: OpenApiResponse(response=VenueSerializer, description="Площадка."),
             403: OpenApiResponse(description="Только для superuser."),
@@ -109,30 +145,287 @@ class VenueViewSet(ModelViewSet):
     queryset = Venue.objects.all()
     serializer_class = VenueSerializer
     permission_classes = [IsSuperUserOrPublicReadIfAllowed]
+    # Режим пагинации по умолчанию (см. core.pagination.SelectablePagination); action может переопределить
+    default_pagination_mode = None
+
+    def get_fieldset(self):
+        """
+        Поля ответа из ?fields= / ?omit= (только list и retrieve), None — без ограничений.
+        """
+        if not hasattr(self, "_fieldset"):
+            if self.action in ("list", "retrieve"):
+                self._fieldset = parse_fieldset(self.request, VenueSerializer.Meta.fields)
+            else:
+                self._fieldset = None
+        return self._fieldset
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        fields = self.get_fieldset()
+        if fields is not None:
+            # updated_at нужен для ETag/Last-Modified
+            qs = qs.only("id", "updated_at", *fields)
+        return qs
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ("list", "retrieve"):
+            context["fields"] = self.get_fieldset()
+        return context
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last_modified = queryset_validators(request, queryset)
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: super(VenueViewSet, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = object_validators(request, instance.pk, instance.updated_at)
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: Response(self.get_serializer(instance).data),
+        )
 
     @extend_schema(
         tags=["Площадки / Погода"],
         summary="История погоды на площадке",
-        description="Возвращает список всех сохраненных снимков погоды для данной площадки.",
+        description=(
+            "Возвращает список всех сохраненных снимков погоды для данной площадки.\n\n"
+            "По умолчанию keyset-пагинация по created_at (для сводок — по day): страницы "
+            "выбираются по индексу (venue, created_at DESC), поэтому старые страницы стоят "
+            "столько же, сколько первая. ?pagination=nocount|estimate|page — прежние режимы.\n\n"
+            "?since= / ?until= ограничивают окно по времени.\n\n"
+            f"Почасовые снимки хранятся {settings.WEATHER_ROLLUP_AFTER_DAYS} дней, более старые "
+            "сворачиваются в суточные сводки — их отдаёт ?resolution=daily."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="resolution",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                enum=list(WEATHER_RESOLUTIONS),
+                description="raw (по умолчанию) — снимки; daily — суточные min/max/avg.",
+            ),
+            OpenApiParameter(
+                name="since",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Начало окна (включительно), ISO 8601.",
+            ),
+            OpenApiParameter(
+                name="until",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Конец окна (не включительно), ISO 8601.",
+            ),
+        ],
         responses={
             200: WeatherSnapshotSerializer(many=True),
+            400: OpenApiResponse(description="Неизвестное значение resolution или неверное окно since/until."),
             404: OpenApiResponse(description="Площадка не найдена"),
         }
     )
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['get'], default_pagination_mode='cursor')
     def weather(self, request, pk=None):
         """
         GET /api/venues/{id}/weather/
-        Возвращает список снимков погоды для конкретной площадки.
+        Возвращает список снимков погоды (или суточных сводок) для конкретной площадки.
         """
+        resolution = request.query_params.get('resolution', 'raw')
+        if resolution not in WEATHER_RESOLUTIONS:
+            raise ValidationError({"resolution": f"Допустимые значения: {', '.join(WEATHER_RESOLUTIONS)}"})
+
+        window = WeatherHistoryWindowSerializer(data=request.query_params)
+        window.is_valid(raise_exception=True)
+        since = window.validated_data.get('since')
+        until = window.validated_data.get('until')
+
         venue = self.get_object()
-        
-        snapshots = WeatherSnapshot.objects.filter(venue=venue).order_by('-created_at')
-        
-        page = self.paginate_queryset(snapshots)
-        if page is not None:
-            serializer = WeatherSnapshotSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = WeatherSnapshotSerializer(snapshots, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+
+        if resolution == 'daily':
+            queryset = WeatherDailyAggregate.objects.filter(venue=venue).order_by('-day')
+            if since:
+                queryset = queryset.filter(day__gte=timezone.localdate(since))
+            if until:
+                queryset = queryset.filter(day__lt=timezone.localdate(until))
+            serializer_class = WeatherDailyAggregateSerializer
+            # Сводки дописываются задачей сворачивания
+            version_field = 'updated_at'
+        else:
+            queryset = WeatherSnapshot.objects.filter(venue=venue).order_by('-created_at')
+            if since:
+                queryset = queryset.filter(created_at__gte=since)
+            if until:
+                queryset = queryset.filter(created_at__lt=until)
+            serializer_class = WeatherSnapshotSerializer
+            version_field = 'created_at'
+
+        # Сначала выбираем страницу (дёшево при keyset), затем считаем валидаторы по ней:
+        # агрегат COUNT/MAX по всей истории рос бы вместе с ней
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        etag, last_modified = page_validators(request, rows, (version_field,))
+
+        def build_response():
+            serializer = serializer_class(rows, many=True)
+            if page is not None:
+                return self.get_paginated_response(serializer.data)
+            return Response(serializer.data)
+
+        return conditional_response(request, etag, last_modified, build_response)
+
+    @extend_schema(
+        tags=["Площадки / Погода"],
+        summary="Текущая погода на площадках",
+        description=(
+            "Последний снимок погоды по каждой площадке одним запросом к таблице CurrentWeather "
+            "(обновляется при каждом сборе погоды), без обхода истории снимков.\n\n"
+            "Без параметров — все площадки; ?venue=1,2,3 — только перечисленные."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="venue",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Список id площадок через запятую.",
+            ),
+        ],
+        responses={
+            200: CurrentWeatherSerializer(many=True),
+            400: OpenApiResponse(description="Неверный список площадок."),
+        },
+    )
+    @action(detail=False, methods=['get'], url_path='current-weather', filter_backends=[], pagination_class=None)
+    def current_weather(self, request):
+        """
+        GET /api/venues/current-weather/
+        Текущая погода по всем (или выбранным) площадкам.
+        """
+        # Геометрия площадки не нужна — только имя
+        queryset = CurrentWeather.objects.select_related('venue').defer('venue__location').order_by('venue_id')
+
+        venue_param = request.query_params.get('venue', '')
+        if venue_param:
+            try:
+                venue_ids = {int(value) for value in venue_param.split(',') if value.strip()}
+            except ValueError:
+                raise ValidationError({"venue": "Ожидается список целых чисел через запятую."})
+            queryset = queryset.filter(venue_id__in=venue_ids)
+
+        etag, last_modified = queryset_validators(request, queryset, ("updated_at",))
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: Response(CurrentWeatherSerializer(queryset, many=True).data),
+        )
+
+    @extend_schema(
+        tags=["Площадки / Карта"],
+        summary="Кластеры площадок для карты",
+        description=(
+            "Площадки в bbox, сгруппированные по сетке (ST_SnapToGrid), шаг которой зависит от zoom. "
+            "Для каждого кластера — центр, число площадок и число предстоящих опубликованных мероприятий; "
+            "venue_id заполнен, если площадка в кластере одна.\n\n"
+            "bbox расширяется до границ сетки, ответы кэшируются по (zoom, bbox)."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="bbox",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description="min_lon,min_lat,max_lon,max_lat. Пример: 92.7,55.9,93.1,56.1",
+            ),
+            OpenApiParameter(
+                name="zoom",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description=f"Уровень масштаба карты, 0–{MAX_ZOOM}.",
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description='{"zoom", "grid_size", "bbox", "clusters": [{"latitude", "longitude", "venues", "upcoming_events", "venue_id"}]}'
+            ),
+            400: OpenApiResponse(description="Неверный bbox или zoom."),
+        },
+    )
+    @action(detail=False, methods=['get'], url_path='clusters', filter_backends=[], pagination_class=None)
+    def clusters(self, request):
+        bbox = self.parse_bbox(request.query_params.get("bbox", ""))
+        try:
+            zoom = int(request.query_params.get("zoom", ""))
+        except ValueError:
+            raise ValidationError({"zoom": "Ожидается целое число."})
+        if not 0 <= zoom <= MAX_ZOOM:
+            raise ValidationError({"zoom": f"Допустимы значения 0–{MAX_ZOOM}."})
+
+        data, cache_state = cached_venue_clusters(bbox, zoom)
+
+        response = Response(data)
+        response["X-Cache"] = cache_state
+        patch_cache_control(response, public=True, max_age=settings.VENUES_MAP_CACHE_SECONDS)
+        return response
+
+    @staticmethod
+    def parse_bbox(value):
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(","))
+        except ValueError:
+            raise ValidationError({"bbox": "Ожидается min_lon,min_lat,max_lon,max_lat."})
+        if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+            raise ValidationError({"bbox": "Некорректные границы bbox."})
+        return min_lon, min_lat, max_lon, max_lat
+
+
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+class VenueTileView(APIView):
+    """
+    GET /api/venues/tiles/{z}/{x}/{y}.mvt
+    Бинарный векторный тайл площадок вместо JSON-страниц VenueSerializer.
+    """
+    permission_classes = [IsSuperUserOrPublicReadIfAllowed]
+
+    @extend_schema(
+        tags=["Площадки / Карта"],
+        summary="Векторный тайл площадок (MVT)",
+        description=(
+            "Mapbox Vector Tile со слоем venues: точки площадок с атрибутами id, name, "
+            "upcoming_events (число предстоящих опубликованных мероприятий) и next_start_at. "
+            "Тайл собирается в PostGIS (ST_AsMVT) и кэшируется; кэш сбрасывается при изменении "
+            "координат площадки или публикации/снятии мероприятия. Пустой тайл — 204."
+        ),
+        responses={
+            (200, MVT_CONTENT_TYPE): OpenApiTypes.BINARY,
+            204: OpenApiResponse(description="В тайле нет площадок."),
+            404: OpenApiResponse(description="Несуществующие координаты тайла."),
+        },
+    )
+    def get(self, request, z, x, y):
+        if not tile_is_valid(z, x, y):
+            raise Http404
+
+        tile, cache_state = cached_venue_tile(z, x, y)
+
+        if tile:
+            response = HttpResponse(tile, content_type=MVT_CONTENT_TYPE)
+        else:
+            response = HttpResponse(status=status.HTTP_204_NO_CONTENT)
+        response["X-Cache"] = cache_state
+        patch_cache_control(response, public=True, max_age=settings.VENUES_MAP_CACHE_SECONDS)
+        return response
@@ -1,5 +1,6 @@
 # venues/admin.py
 from django.contrib import admin
+from core.pagination import EstimatedCountPaginator
 from weather.models import WeatherSnapshot
 
 @admin.register(WeatherSnapshot)
@@ -10,6 +11,10 @@ class WeatherSnapshotAdmin(admin.ModelAdmin):
     
     list_display_links = ('venue', 'created_at')
 
+    # Таблица снимков постоянно растёт: не считаем точный COUNT(*) на каждой странице
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
     def weather_summary(self, obj):
         return f"T: {obj.temperature_celsius}°C, H: {obj.humidity_percent}%, W: {obj.wind_speed_ms}m/s"
     weather_summary.short_description = "Сводка"
@@ -0,0 +1,58 @@
+# weather/current_services.py
+from .models import CurrentWeather, WeatherSnapshot
+
+SNAPSHOT_FIELDS = (
+    "temperature_celsius",
+    "humidity_percent",
+    "pressure_mmhg",
+    "wind_direction",
+    "wind_speed_ms",
+)
+
+
+def _current_from_snapshot(snapshot):
+    return CurrentWeather(
+        venue_id=snapshot.venue_id,
+        snapshot_id=snapshot.pk,
+        observed_at=snapshot.created_at,
+        **{name: getattr(snapshot, name) for name in SNAPSHOT_FIELDS},
+    )
+
+
+def upsert_current_weather(snapshots):
+    """
+    Записывает снимки как текущую погоду площадок одним INSERT … ON CONFLICT (venue) DO UPDATE.
+    На площадку берётся самый свежий снимок из переданных.
+    """
+    latest = {}
+    for snapshot in snapshots:
+        known = latest.get(snapshot.venue_id)
+        if known is None or snapshot.created_at > known.created_at:
+            latest[snapshot.venue_id] = snapshot
+    if not latest:
+        return 0
+
+    CurrentWeather.objects.bulk_create(
+        [_current_from_snapshot(snapshot) for snapshot in latest.values()],
+        update_conflicts=True,
+        unique_fields=["venue"],
+        update_fields=["snapshot_id", "observed_at", "updated_at", *SNAPSHOT_FIELDS],
+    )
+    return len(latest)
+
+
+def latest_snapshots():
+    """
+    Последний снимок по каждой площадке из истории (DISTINCT ON по индексу venue, -created_at).
+    Используется для первичного заполнения и пересборки CurrentWeather.
+    Прогнозы, привязанные к мероприятиям, текущей погодой не считаются.
+    """
+    return (
+        WeatherSnapshot.objects.filter(event__isnull=True, archived_event__isnull=True)
+        .order_by("venue", "-created_at")
+        .distinct("venue")
+    )
+
+
+def rebuild_current_weather():
+    return upsert_current_weather(latest_snapshots().iterator(chunk_size=1000))
@@ -0,0 +1,82 @@
+# weather/forecast_cache_services.py
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.cache import HIT, MISS, STALE, get_or_compute
+
+# Пространство имён кэша почасовых прогнозов
+FORECAST_CACHE_NAMESPACE = "forecast"
+
+STATS_STATES = (HIT, MISS, STALE)
+
+
+def forecast_cell(lat, lon):
+    """
+    Центр ячейки сетки WEATHER_FORECAST_CELL_DEGREES, в которую попадает точка.
+    Площадки одной ячейки получают один прогноз — разрешение моделей всё равно грубее.
+    """
+    size = settings.WEATHER_FORECAST_CELL_DEGREES
+    # Округление убирает хвосты плавающей точки из ключа кэша
+    return (
+        round(math.floor(lat / size) * size + size / 2, 6),
+        round(math.floor(lon / size) * size + size / 2, 6),
+    )
+
+
+def forecast_ttl(now=None):
+    """
+    Секунды до следующего выпуска прогноза: выпуски каждые
+    WEATHER_FORECAST_ISSUE_INTERVAL_HOURS часов от полуночи UTC.
+    До выпуска новых данных у провайдера нет — дольше держать ряд бессмысленно, раньше — незачем.
+    """
+    interval = settings.WEATHER_FORECAST_ISSUE_INTERVAL_HOURS * 3600
+    timestamp = (now or timezone.now()).timestamp()
+    next_issue = (timestamp // interval + 1) * interval
+    return max(int(next_issue - timestamp), settings.WEATHER_FORECAST_MIN_TTL_SECONDS)
+
+
+def _stats_key(state):
+    return f"{FORECAST_CACHE_NAMESPACE}:stats:{state.lower()}"
+
+
+def record_forecast_lookup(state):
+    key = _stats_key(state)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Ключ вытеснили между add и incr
+        cache.set(key, 1, timeout=None)
+
+
+def forecast_cache_stats():
+    """Счётчики обращений к кэшу прогнозов: hit, miss, stale и доля попаданий."""
+    stats = {state.lower(): cache.get(_stats_key(state), 0) for state in STATS_STATES}
+    total = sum(stats.values())
+    stats["hit_ratio"] = round((stats["hit"] + stats["stale"]) / total, 3) if total else None
+    return stats
+
+
+def reset_forecast_cache_stats():
+    cache.delete_many([_stats_key(state) for state in STATS_STATES])
+
+
+def cached_hourly_forecast(lat, lon, day, fetch):
+    """
+    Почасовой ряд прогноза на день day (YYYY-MM-DD) для ячейки точки (lat, lon).
+    fetch(lat, lon, day) скачивает ряд для центра ячейки и вызывается один раз
+    на (ячейка, день) до следующего выпуска прогноза; None не кэшируется.
+    Возвращает (ряд или None, состояние кэша).
+    """
+    cell_lat, cell_lon = forecast_cell(lat, lon)
+    hourly, state = get_or_compute(
+        FORECAST_CACHE_NAMESPACE,
+        ["hourly", cell_lat, cell_lon, day],
+        lambda: fetch(cell_lat, cell_lon, day),
+        forecast_ttl(),
+    )
+    record_forecast_lookup(state)
+    return hourly, state
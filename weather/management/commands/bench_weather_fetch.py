@@ -0,0 +1,87 @@
+import asyncio
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from weather.services import fetch_weather_batches, fetch_current_weather, latency_summary
+from weather.provider_services import breaker, rate_limiter
+from weather.stub_server import OpenMeteoStub
+
+
+class Command(BaseCommand):
+    help = 'Офлайн-бенчмарк обхода погоды на локальном stub Open-Meteo: последовательный цикл против asyncio-клиента'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations', type=int, default=1000, help='Сколько синтетических точек опросить')
+        parser.add_argument(
+            '--batch-sizes',
+            default='1,10,50,100,200',
+            help='Размеры пачек через запятую'
+        )
+        parser.add_argument(
+            '--concurrency',
+            default='1,10',
+            help='Уровни параллелизма asyncio-клиента через запятую'
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.05,
+            help='Задержка ответа stub-сервера на запрос, секунды (имитация сети)'
+        )
+
+    @staticmethod
+    def parse_ints(value, option):
+        try:
+            numbers = [int(v) for v in value.split(',') if v.strip()]
+        except ValueError:
+            raise CommandError(f'{option}: ожидается список целых чисел через запятую')
+        if not numbers or min(numbers) < 1:
+            raise CommandError(f'{option}: значения должны быть положительными')
+        return numbers
+
+    def report(self, label, elapsed, total, latencies, failed):
+        summary = latency_summary(latencies)
+        self.stdout.write(
+            f'{label:<28} запросов {summary["requests"]:5}: {elapsed:8.2f} с, {total / elapsed:8.0f} точек/с, '
+            f'p50 {summary.get("p50_ms", 0):7.1f} мс, p95 {summary.get("p95_ms", 0):7.1f} мс, ошибок {failed}'
+        )
+
+    def handle(self, *args, **options):
+        batch_sizes = self.parse_ints(options['batch_sizes'], '--batch-sizes')
+        concurrency_levels = self.parse_ints(options['concurrency'], '--concurrency')
+
+        rng = random.Random(42)
+        coordinates = [
+            (round(rng.uniform(-60, 70), 4), round(rng.uniform(-180, 180), 4))
+            for _ in range(options['locations'])
+        ]
+        total = len(coordinates)
+
+        # Лимит частоты замерял бы сам себя — на stub он не нужен
+        with OpenMeteoStub(latency=options['latency']) as stub, \
+                override_settings(OPEN_METEO_URL=stub.url, WEATHER_RATE_LIMIT_PER_SECOND=None):
+            breaker.reset()
+            rate_limiter.reset()
+            self.stdout.write(f'Stub: {stub.url}, {total} точек, задержка {options["latency"]} с')
+
+            # Прежний цикл: по одной площадке за запрос, последовательно
+            latencies = []
+            failed = 0
+            started = time.perf_counter()
+            for point in coordinates:
+                request_started = time.perf_counter()
+                failed += fetch_current_weather([point])[0] is None
+                latencies.append(time.perf_counter() - request_started)
+            self.report('serial, batch=1', time.perf_counter() - started, total, latencies, failed)
+
+            for batch_size in batch_sizes:
+                batches = [coordinates[start:start + batch_size] for start in range(0, total, batch_size)]
+                for concurrency in concurrency_levels:
+                    started = time.perf_counter()
+                    results, latencies = asyncio.run(fetch_weather_batches(batches, concurrency=concurrency))
+                    elapsed = time.perf_counter() - started
+                    failed = sum(1 for batch in results for data in batch if data is None)
+                    self.report(f'async, batch={batch_size}, conc={concurrency}', elapsed, total, latencies, failed)
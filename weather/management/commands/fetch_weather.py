@@ -1,19 +1,41 @@
 # weather/management/commands/fetch_weather.py
 from django.core.management.base import BaseCommand
 from venues.models import Venue
-from weather.models import WeatherSnapshot
-from weather.services import fetch_weather_for_venue
+from weather.current_services import upsert_current_weather
+from weather.services import latency_summary, save_weather_snapshots
 
 class Command(BaseCommand):
     help = "Fetch weather for all venues and create WeatherSnapshot"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Сколько площадок запрашивать одним запросом (по умолчанию WEATHER_FETCH_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Сколько запросов выполнять параллельно (по умолчанию WEATHER_FETCH_CONCURRENCY)",
+        )
+
     def handle(self, *args, **options):
-        venues = Venue.objects.all()
-        for venue in venues:
-            self.stdout.write(f"Fetching weather for {venue.name}...")
-            weather_data = fetch_weather_for_venue(venue)
-            if weather_data:
-                WeatherSnapshot.objects.create(venue=venue, **weather_data)
-                self.stdout.write(self.style.SUCCESS(f"✓ Saved weather for {venue.name}"))
-            else:
-                self.stdout.write(self.style.ERROR(f"✗ Failed for {venue.name}"))
+        venues = Venue.objects.only("id", "name", "location").order_by("id")
+        self.stdout.write(f"Fetching weather for {venues.count()} venues...")
+        snapshots, failed, latencies = save_weather_snapshots(
+            venues, batch_size=options["batch_size"], concurrency=options["concurrency"]
+        )
+        upsert_current_weather(snapshots)
+
+        for snapshot in snapshots:
+            self.stdout.write(self.style.SUCCESS(f"✓ Saved weather for {snapshot.venue.name}"))
+        for venue in failed:
+            self.stdout.write(self.style.ERROR(f"✗ Failed for {venue.name}"))
+
+        summary = latency_summary(latencies)
+        self.stdout.write(
+            f"Requests: {summary['requests']}"
+            + (f", p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, max {summary['max_ms']} ms" if latencies else "")
+        )
@@ -0,0 +1,21 @@
+# weather/management/commands/forecast_cache_stats.py
+from django.core.management.base import BaseCommand
+
+from weather.forecast_cache_services import forecast_cache_stats, reset_forecast_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Счётчики кэша почасовых прогнозов (hit/miss/stale)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Обнулить счётчики после вывода")
+
+    def handle(self, *args, **options):
+        stats = forecast_cache_stats()
+        ratio = "—" if stats["hit_ratio"] is None else f"{stats['hit_ratio']:.1%}"
+        self.stdout.write(
+            f"hit: {stats['hit']}, miss: {stats['miss']}, stale: {stats['stale']}, hit ratio: {ratio}"
+        )
+        if options["reset"]:
+            reset_forecast_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Счётчики обнулены"))
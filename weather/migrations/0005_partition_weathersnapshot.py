@@ -0,0 +1,67 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:10
+
+from django.db import migrations
+
+# Таблица снимков превращается в секционированную по created_at (помесячно).
+# Ключ секционирования обязан входить в PRIMARY KEY, поэтому PK в БД — (id, created_at);
+# для Django первичным ключом остаётся id (уникальность обеспечивает последовательность).
+# FK на снимки из events сняты заранее (events 0012, db_constraint=False).
+PARTITION_WEATHERSNAPSHOT = """
+ALTER TABLE weather_weathersnapshot RENAME TO weather_weathersnapshot_old;
+
+CREATE TABLE weather_weathersnapshot (LIKE weather_weathersnapshot_old)
+    PARTITION BY RANGE (created_at);
+
+CREATE SEQUENCE weather_weathersnapshot_part_id_seq OWNED BY weather_weathersnapshot.id;
+ALTER TABLE weather_weathersnapshot
+    ALTER COLUMN id SET DEFAULT nextval('weather_weathersnapshot_part_id_seq');
+
+ALTER TABLE weather_weathersnapshot
+    ADD CONSTRAINT weather_snapshot_part_pkey PRIMARY KEY (id, created_at);
+ALTER TABLE weather_weathersnapshot
+    ADD CONSTRAINT weather_snapshot_venue_fk FOREIGN KEY (venue_id)
+    REFERENCES venues_venue (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX weather_snapshot_venue_idx ON weather_weathersnapshot (venue_id);
+
+-- Сюда попадают строки вне помесячных секций и снимки, сохранённые политикой хранения
+CREATE TABLE weather_weathersnapshot_default PARTITION OF weather_weathersnapshot DEFAULT;
+
+DO $$
+DECLARE
+    month date := date_trunc(
+        'month', COALESCE((SELECT min(created_at) FROM weather_weathersnapshot_old), now()) AT TIME ZONE 'UTC'
+    )::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+BEGIN
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF weather_weathersnapshot FOR VALUES FROM (%L) TO (%L)',
+            'weather_weathersnapshot_p' || to_char(month, 'YYYYMM'),
+            month::timestamp AT TIME ZONE 'UTC',
+            (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+END $$;
+
+INSERT INTO weather_weathersnapshot SELECT * FROM weather_weathersnapshot_old;
+SELECT setval(
+    'weather_weathersnapshot_part_id_seq',
+    COALESCE((SELECT max(id) FROM weather_weathersnapshot), 0) + 1,
+    false
+);
+DROP TABLE weather_weathersnapshot_old;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0004_alter_weathersnapshot_wind_direction'),
+        ('events', '0012_event_weather_no_db_constraint'),
+    ]
+
+    operations = [
+        # Обратно не разворачиваем: секционированная таблица полностью совместима с моделью
+        migrations.RunSQL(PARTITION_WEATHERSNAPSHOT, reverse_sql=migrations.RunSQL.noop),
+    ]
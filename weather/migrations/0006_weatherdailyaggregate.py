@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0006_venue_location_geography_gist'),
+        ('weather', '0005_partition_weathersnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherDailyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('samples', models.PositiveIntegerField(verbose_name='Снимков за день')),
+                ('temperature_min', models.FloatField(verbose_name='Температура мин. (°C)')),
+                ('temperature_max', models.FloatField(verbose_name='Температура макс. (°C)')),
+                ('temperature_avg', models.FloatField(verbose_name='Температура средняя (°C)')),
+                ('humidity_min', models.FloatField(verbose_name='Влажность мин. (%)')),
+                ('humidity_max', models.FloatField(verbose_name='Влажность макс. (%)')),
+                ('humidity_avg', models.FloatField(verbose_name='Влажность средняя (%)')),
+                ('pressure_min', models.FloatField(verbose_name='Давление мин. (мм рт.ст.)')),
+                ('pressure_max', models.FloatField(verbose_name='Давление макс. (мм рт.ст.)')),
+                ('pressure_avg', models.FloatField(verbose_name='Давление среднее (мм рт.ст.)')),
+                ('wind_speed_min', models.FloatField(verbose_name='Ветер мин. (м/с)')),
+                ('wind_speed_max', models.FloatField(verbose_name='Ветер макс. (м/с)')),
+                ('wind_speed_avg', models.FloatField(verbose_name='Ветер средний (м/с)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weather_daily', to='venues.venue', verbose_name='Площадка')),
+            ],
+            options={
+                'verbose_name': 'Суточная сводка погоды',
+                'verbose_name_plural': 'Суточные сводки погоды',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('venue', 'day'), name='weather_daily_venue_day_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_current_weather(apps, schema_editor):
+    WeatherSnapshot = apps.get_model('weather', 'WeatherSnapshot')
+    CurrentWeather = apps.get_model('weather', 'CurrentWeather')
+
+    latest = (
+        WeatherSnapshot.objects.filter(event__isnull=True, archived_event__isnull=True)
+        .order_by('venue', '-created_at')
+        .distinct('venue')
+    )
+    CurrentWeather.objects.bulk_create(
+        [
+            CurrentWeather(
+                venue_id=snapshot.venue_id,
+                snapshot_id=snapshot.pk,
+                temperature_celsius=snapshot.temperature_celsius,
+                humidity_percent=snapshot.humidity_percent,
+                pressure_mmhg=snapshot.pressure_mmhg,
+                wind_direction=snapshot.wind_direction,
+                wind_speed_ms=snapshot.wind_speed_ms,
+                observed_at=snapshot.created_at,
+            )
+            for snapshot in latest.iterator(chunk_size=1000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_event_weather_no_db_constraint'),
+        ('venues', '0006_venue_location_geography_gist'),
+        ('weather', '0006_weatherdailyaggregate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='weathersnapshot',
+            index=models.Index(fields=['venue', '-created_at'], name='weather_snapshot_venue_recent'),
+        ),
+        migrations.CreateModel(
+            name='CurrentWeather',
+            fields=[
+                ('venue', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='current_weather', serialize=False, to='venues.venue', verbose_name='Площадка')),
+                ('snapshot_id', models.BigIntegerField(verbose_name='Снимок')),
+                ('temperature_celsius', models.FloatField(verbose_name='Температура (°C)')),
+                ('humidity_percent', models.IntegerField(verbose_name='Влажность (%)')),
+                ('pressure_mmhg', models.IntegerField(verbose_name='Давление (мм рт.ст.)')),
+                ('wind_direction', models.CharField(max_length=10, verbose_name='Направление ветра')),
+                ('wind_speed_ms', models.FloatField(verbose_name='Скорость ветра (м/с)')),
+                ('observed_at', models.DateTimeField(verbose_name='Время снимка')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Текущая погода',
+                'verbose_name_plural': 'Текущая погода',
+            },
+        ),
+        migrations.RunPython(fill_current_weather, migrations.RunPython.noop),
+    ]
@@ -15,6 +15,74 @@ class WeatherSnapshot(models.Model):
         verbose_name = "Снимок погоды"
         verbose_name_plural = "Архив погоды"
         ordering = ["-created_at"]
+        indexes = [
+            # История по площадке и fallback для текущей погоды
+            models.Index(fields=["venue", "-created_at"], name="weather_snapshot_venue_recent"),
+        ]
 
     def __str__(self):
         return f"Weather at {self.venue.name} on {self.created_at}"
+
+
+class WeatherDailyAggregate(models.Model):
+    """
+    Суточная сводка погоды по площадке: min/max/среднее по почасовым снимкам.
+    Строится задачей rollup_weather_daily (см. weather/rollup_services.py),
+    после чего исходные снимки старше WEATHER_ROLLUP_AFTER_DAYS удаляются.
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="weather_daily", verbose_name="Площадка")
+    day = models.DateField(verbose_name="День")
+    samples = models.PositiveIntegerField(verbose_name="Снимков за день")
+
+    temperature_min = models.FloatField(verbose_name="Температура мин. (°C)")
+    temperature_max = models.FloatField(verbose_name="Температура макс. (°C)")
+    temperature_avg = models.FloatField(verbose_name="Температура средняя (°C)")
+    humidity_min = models.FloatField(verbose_name="Влажность мин. (%)")
+    humidity_max = models.FloatField(verbose_name="Влажность макс. (%)")
+    humidity_avg = models.FloatField(verbose_name="Влажность средняя (%)")
+    pressure_min = models.FloatField(verbose_name="Давление мин. (мм рт.ст.)")
+    pressure_max = models.FloatField(verbose_name="Давление макс. (мм рт.ст.)")
+    pressure_avg = models.FloatField(verbose_name="Давление среднее (мм рт.ст.)")
+    wind_speed_min = models.FloatField(verbose_name="Ветер мин. (м/с)")
+    wind_speed_max = models.FloatField(verbose_name="Ветер макс. (м/с)")
+    wind_speed_avg = models.FloatField(verbose_name="Ветер средний (м/с)")
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Суточная сводка погоды"
+        verbose_name_plural = "Суточные сводки погоды"
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(fields=["venue", "day"], name="weather_daily_venue_day_uniq"),
+        ]
+
+    def __str__(self):
+        return f"Weather at {self.venue_id} on {self.day}"
+
+
+class CurrentWeather(models.Model):
+    """
+    Последний снимок погоды по каждой площадке — одна строка на площадку.
+    Обновляется upsert'ом в update_weather_snapshots (см. weather/current_services.py),
+    поэтому «погода везде сейчас» читается без обхода истории WeatherSnapshot.
+    """
+    venue = models.OneToOneField(
+        Venue, on_delete=models.CASCADE, primary_key=True, related_name="current_weather", verbose_name="Площадка"
+    )
+    # Без FK: у секционированной WeatherSnapshot нет уникального ключа только по id
+    snapshot_id = models.BigIntegerField(verbose_name="Снимок")
+    temperature_celsius = models.FloatField(verbose_name="Температура (°C)")
+    humidity_percent = models.IntegerField(verbose_name="Влажность (%)")
+    pressure_mmhg = models.IntegerField(verbose_name="Давление (мм рт.ст.)")
+    wind_direction = models.CharField(max_length=10, verbose_name="Направление ветра")
+    wind_speed_ms = models.FloatField(verbose_name="Скорость ветра (м/с)")
+    observed_at = models.DateTimeField(verbose_name="Время снимка")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Текущая погода"
+        verbose_name_plural = "Текущая погода"
+
+    def __str__(self):
+        return f"Current weather at {self.venue_id} on {self.observed_at}"
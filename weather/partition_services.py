@@ -0,0 +1,133 @@
+# weather/partition_services.py
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from events.models import ArchivedEvent, Event
+from .models import WeatherSnapshot
+
+# Помесячные секции weather_weathersnapshot (см. миграцию weather 0005)
+PARENT_TABLE = WeatherSnapshot._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_PREFIX = f"{PARENT_TABLE}_p"
+_PARTITION_RE = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(moment):
+    return date(moment.year, moment.month, 1)
+
+
+def partition_name(month):
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def _utc(month):
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def is_partitioned():
+    """True, если таблица снимков секционирована (в тестах без миграций — обычная таблица)."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [PARENT_TABLE])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def list_partitions():
+    """Помесячные секции: [(имя, первый день месяца)], по возрастанию."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [PARENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def ensure_partitions(months_ahead=None, today=None):
+    """
+    Создаёт секции с текущего месяца на months_ahead месяцев вперёд,
+    чтобы новые снимки не попадали в DEFAULT. Возвращает имена созданных секций.
+    """
+    if not is_partitioned():
+        return []
+
+    months_ahead = settings.WEATHER_PARTITIONS_AHEAD_MONTHS if months_ahead is None else months_ahead
+    current = month_start(today or timezone.now())
+    existing = {name for name, _month in list_partitions()}
+    quote = connection.ops.quote_name
+
+    created = []
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(PARENT_TABLE)} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [_utc(month), _utc(add_months(month, 1))],
+            )
+            created.append(name)
+    return created
+
+
+def linked_snapshot_ids_sql():
+    """id снимков, на которые ссылаются мероприятия (живые и архивные) — их удалять нельзя."""
+    return " UNION ".join(
+        f"SELECT weather_id FROM {model._meta.db_table} WHERE weather_id IS NOT NULL"
+        for model in (Event, ArchivedEvent)
+    )
+
+
+def drop_expired_partitions(retention_months=None, today=None):
+    """
+    Политика хранения: удаляет целиком секции, закончившиеся раньше чем retention_months
+    месяцев назад. Снимки, привязанные к Event.weather, перед удалением переносятся
+    в DEFAULT-секцию (id не меняется). retention_months=None — хранить всё.
+    Возвращает [(имя секции, сколько снимков сохранено)].
+    """
+    retention_months = settings.WEATHER_RETENTION_MONTHS if retention_months is None else retention_months
+    if not retention_months or not is_partitioned():
+        return []
+
+    cutoff = add_months(month_start(today or timezone.now()), -retention_months)
+    quote = connection.ops.quote_name
+
+    dropped = []
+    for name, month in list_partitions():
+        if add_months(month, 1) > cutoff:
+            break
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {quote(PARENT_TABLE)} DETACH PARTITION {quote(name)}")
+                # Диапазон секции больше ни за кем не закреплён — DEFAULT примет эти строки
+                cursor.execute(
+                    f"INSERT INTO {quote(DEFAULT_PARTITION)} "
+                    f"SELECT * FROM {quote(name)} WHERE id IN ({linked_snapshot_ids_sql()})"
+                )
+                kept = cursor.rowcount
+                cursor.execute(f"DROP TABLE {quote(name)}")
+        dropped.append((name, kept))
+    return dropped
@@ -0,0 +1,212 @@
+# weather/provider_services.py
+"""
+Общий для процесса доступ к Open-Meteo: пул keep-alive соединений,
+circuit breaker и token bucket.
+
+Пока провайдер отвечает ошибками, breaker размыкается, и запросы сразу падают
+с WeatherProviderUnavailable — задачи и request-потоки не висят по 20 с на каждом
+повторе. Через WEATHER_CIRCUIT_RESET_SECONDS пропускается один пробный запрос.
+"""
+import asyncio
+import os
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class WeatherProviderUnavailable(Exception):
+    """Провайдер погоды недоступен: breaker разомкнут или исчерпан лимит запросов."""
+
+
+class CircuitBreaker:
+    """
+    closed -> (failure_threshold ошибок подряд) -> open -> (reset_timeout) -> half-open.
+    В half-open пропускается один пробный запрос: успех замыкает цепь, ошибка снова размыкает.
+    Параметры None берутся из настроек при каждом вызове.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=None, reset_timeout=None):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def failure_threshold(self):
+        return self._failure_threshold or settings.WEATHER_CIRCUIT_FAILURE_THRESHOLD
+
+    @property
+    def reset_timeout(self):
+        return self._reset_timeout or settings.WEATHER_CIRCUIT_RESET_SECONDS
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def before_request(self):
+        """Разрешает запрос или сразу бросает WeatherProviderUnavailable."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise WeatherProviderUnavailable("Open-Meteo circuit is open")
+
+    def cancel(self):
+        """Разрешённый запрос так и не был отправлен — освобождает место пробного запроса."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class TokenBucket:
+    """
+    Ограничение частоты запросов: rate токенов в секунду, не больше capacity про запас.
+    Если токена не дождаться за max_wait секунд — WeatherProviderUnavailable.
+    rate=None в настройках отключает ограничение.
+    """
+    def __init__(self, rate=None, capacity=None, max_wait=None):
+        self._rate = rate
+        self._capacity = capacity
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def rate(self):
+        return self._rate or settings.WEATHER_RATE_LIMIT_PER_SECOND
+
+    @property
+    def capacity(self):
+        return self._capacity or settings.WEATHER_RATE_LIMIT_BURST
+
+    @property
+    def max_wait(self):
+        return self._max_wait if self._max_wait is not None else settings.WEATHER_RATE_LIMIT_MAX_WAIT
+
+    def reset(self):
+        with self._lock:
+            self.tokens = None
+            self.updated_at = time.monotonic()
+
+    def reserve(self):
+        """Забирает токен (возможно, в долг) и возвращает, сколько секунд подождать до запроса."""
+        rate = self.rate
+        if not rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            capacity = self.capacity
+            tokens = capacity if self.tokens is None else self.tokens
+            tokens = min(capacity, tokens + (now - self.updated_at) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            if wait > self.max_wait:
+                raise WeatherProviderUnavailable("Open-Meteo rate limit exceeded")
+            self.tokens = tokens - 1
+            self.updated_at = now
+            return wait
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+breaker = CircuitBreaker()
+rate_limiter = TokenBucket()
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def build_session():
+    """Сессия с пулом keep-alive соединений и одним быстрым повтором на 5xx."""
+    session = requests.Session()
+    retry = Retry(total=1, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=4,
+        pool_maxsize=settings.WEATHER_FETCH_CONCURRENCY,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Одна сессия на процесс. После fork (воркеры Celery/gunicorn) создаётся заново:
+    сокеты родителя дочернему процессу не годятся.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = build_session()
+                _session_pid = pid
+    return _session
+
+
+def is_provider_failure(status_code):
+    return status_code == 429 or status_code >= 500
+
+
+def provider_get(params):
+    """
+    GET к OPEN_METEO_URL через общую сессию, breaker и rate limiter.
+    Возвращает разобранный JSON; ошибки пробрасываются (в т.ч. WeatherProviderUnavailable).
+    """
+    breaker.before_request()
+    try:
+        rate_limiter.acquire()
+    except WeatherProviderUnavailable:
+        breaker.cancel()
+        raise
+    try:
+        response = get_session().get(
+            settings.OPEN_METEO_URL,
+            params=params,
+            timeout=(settings.WEATHER_CONNECT_TIMEOUT, settings.WEATHER_FETCH_TIMEOUT),
+        )
+    except requests.RequestException:
+        breaker.record_failure()
+        raise
+    if is_provider_failure(response.status_code):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,151 @@
+# weather/rollup_services.py
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import WeatherDailyAggregate, WeatherSnapshot
+from .partition_services import linked_snapshot_ids_sql
+
+# Поле сводки -> поле снимка
+AGGREGATED_FIELDS = {
+    "temperature": "temperature_celsius",
+    "humidity": "humidity_percent",
+    "pressure": "pressure_mmhg",
+    "wind_speed": "wind_speed_ms",
+}
+
+
+def rollup_cutoff(now=None):
+    """
+    Граница сворачивания: начало дня WEATHER_ROLLUP_AFTER_DAYS дней назад в TIME_ZONE.
+    Сворачиваются только полностью прошедшие дни.
+    """
+    tz = ZoneInfo(settings.TIME_ZONE)
+    today = timezone.localtime(now or timezone.now(), tz).date()
+    return datetime.combine(today - timedelta(days=settings.WEATHER_ROLLUP_AFTER_DAYS), time.min, tzinfo=tz)
+
+
+def _daily_select(source):
+    """
+    SELECT суточных агрегатов (venue_id, day, samples, <поле>_min/_max/_avg…) по строкам
+    source. День считается в TIME_ZONE — первый параметр запроса.
+    """
+    columns = ",\n".join(
+        f"MIN({field}) AS {name}_min, MAX({field}) AS {name}_max, AVG({field}) AS {name}_avg"
+        for name, field in AGGREGATED_FIELDS.items()
+    )
+    return f"""
+        SELECT venue_id, (created_at AT TIME ZONE %s)::date AS day, COUNT(*) AS samples,
+            {columns}
+        FROM {source}
+        GROUP BY 1, 2
+    """
+
+
+def _aggregate_columns():
+    return [f"{name}_{kind}" for name in AGGREGATED_FIELDS for kind in ("min", "max", "avg")]
+
+
+def _upsert_sql(daily, merge):
+    """
+    INSERT сводок из CTE daily с ON CONFLICT (venue_id, day). merge=True — объединяет
+    со старой сводкой (samples складываются, среднее взвешивается), иначе перезаписывает.
+    """
+    table = connection.ops.quote_name(WeatherDailyAggregate._meta.db_table)
+    columns = ["venue_id", "day", "samples", *_aggregate_columns()]
+    if merge:
+        total = f"({table}.samples + EXCLUDED.samples)"
+        updates = [f"samples = {total}"]
+        for name in AGGREGATED_FIELDS:
+            updates += [
+                f"{name}_min = LEAST({table}.{name}_min, EXCLUDED.{name}_min)",
+                f"{name}_max = GREATEST({table}.{name}_max, EXCLUDED.{name}_max)",
+                f"{name}_avg = ({table}.{name}_avg * {table}.samples"
+                f" + EXCLUDED.{name}_avg * EXCLUDED.samples) / {total}",
+            ]
+    else:
+        updates = [f"{column} = EXCLUDED.{column}" for column in columns[2:]]
+    updates.append("updated_at = EXCLUDED.updated_at")
+    return f"""
+        INSERT INTO {table} ({", ".join(columns)}, updated_at)
+        SELECT {", ".join(columns)}, now() FROM {daily}
+        ON CONFLICT (venue_id, day) DO UPDATE SET {", ".join(updates)}
+        RETURNING 1
+    """
+
+
+def build_daily_aggregates(cutoff):
+    """
+    Сводки по снимкам до cutoff, когда почасовые снимки хранятся (без prune).
+    Пересчитываются дни без сводки и дни, где снимков стало больше, чем в сводке, —
+    так опоздавшие снимки за уже свёрнутый день тоже попадают в неё. Если снимков
+    меньше (секции удалены политикой хранения), сводка остаётся прежней.
+    Снимки, привязанные к мероприятиям, — прогнозы на час события с created_at момента
+    запроса, а не наблюдения за этот день, поэтому в сводки не входят.
+    Возвращает количество созданных или обновлённых сводок.
+    """
+    snapshots = connection.ops.quote_name(WeatherSnapshot._meta.db_table)
+    aggregates = connection.ops.quote_name(WeatherDailyAggregate._meta.db_table)
+    source = f"(SELECT * FROM {snapshots} WHERE created_at < %s AND id NOT IN ({linked_snapshot_ids_sql()})) raw"
+    sql = f"""
+        WITH daily AS ({_daily_select(source)}),
+        changed AS (
+            SELECT daily.* FROM daily
+            LEFT JOIN {aggregates} a ON a.venue_id = daily.venue_id AND a.day = daily.day
+            WHERE a.id IS NULL OR daily.samples > a.samples
+        ),
+        upserted AS ({_upsert_sql("changed", merge=False)})
+        SELECT COUNT(*) FROM upserted
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [settings.TIME_ZONE, cutoff])
+        return cursor.fetchone()[0]
+
+
+def rollup_and_prune_snapshots(cutoff, batch_size=None):
+    """
+    Сворачивает и удаляет почасовые снимки до cutoff пачками, в обход ORM-каскада.
+    Каждая пачка — один запрос: DELETE … RETURNING, агрегат удалённых строк и
+    upsert со слиянием в существующие сводки. Удаляется ровно то, что попало в сводку,
+    поэтому опоздавшие снимки за уже свёрнутый день дописываются в неё, а не теряются.
+    Привязанные к мероприятиям снимки остаются и в сводки не входят (см. build_daily_aggregates).
+    Возвращает (сколько сводок создано или обновлено, сколько снимков удалено).
+    """
+    batch_size = batch_size or settings.WEATHER_PRUNE_BATCH_SIZE
+    table = connection.ops.quote_name(WeatherSnapshot._meta.db_table)
+    returning = ", ".join(["venue_id", "created_at", *AGGREGATED_FIELDS.values()])
+    sql = f"""
+        WITH moved AS (
+            DELETE FROM {table}
+            WHERE created_at < %s AND id IN (
+                SELECT id FROM {table}
+                WHERE created_at < %s AND id NOT IN ({linked_snapshot_ids_sql()})
+                LIMIT %s
+            )
+            RETURNING {returning}
+        ),
+        daily AS ({_daily_select("moved")}),
+        upserted AS ({_upsert_sql("daily", merge=True)})
+        SELECT (SELECT COUNT(*) FROM moved), (SELECT COUNT(*) FROM upserted)
+    """
+    upserted = deleted = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [cutoff, cutoff, batch_size, settings.TIME_ZONE])
+            moved, days = cursor.fetchone()
+        if not moved:
+            return upserted, deleted
+        deleted += moved
+        upserted += days
+
+
+def rollup_weather(now=None, prune=None):
+    """Сворачивает снимки старше WEATHER_ROLLUP_AFTER_DAYS в сводки и (по настройке) удаляет исходники."""
+    cutoff = rollup_cutoff(now)
+    prune = settings.WEATHER_PRUNE_RAW_AFTER_ROLLUP if prune is None else prune
+    if prune:
+        return rollup_and_prune_snapshots(cutoff)
+    return build_daily_aggregates(cutoff), 0
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import WeatherSnapshot
+from .models import CurrentWeather, WeatherDailyAggregate, WeatherSnapshot
 
 class WeatherSnapshotSerializer(serializers.ModelSerializer):
     venue_name = serializers.CharField(source="venue.name", read_only=True)
@@ -18,3 +18,51 @@ class WeatherSnapshotSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = ["created_at"]
+
+class WeatherHistoryWindowSerializer(serializers.Serializer):
+    """Окно истории погоды: ?since= (включительно) и ?until= (не включительно)."""
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        since, until = attrs.get("since"), attrs.get("until")
+        if since and until and since >= until:
+            raise serializers.ValidationError({"until": "until должен быть позже since."})
+        return attrs
+
+class WeatherDailyAggregateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WeatherDailyAggregate
+        fields = [
+            "day",
+            "samples",
+            "temperature_min",
+            "temperature_max",
+            "temperature_avg",
+            "humidity_min",
+            "humidity_max",
+            "humidity_avg",
+            "pressure_min",
+            "pressure_max",
+            "pressure_avg",
+            "wind_speed_min",
+            "wind_speed_max",
+            "wind_speed_avg",
+        ]
+
+class CurrentWeatherSerializer(serializers.ModelSerializer):
+    venue_name = serializers.CharField(source="venue.name", read_only=True)
+
+    class Meta:
+        model = CurrentWeather
+        fields = [
+            "venue",
+            "venue_name",
+            "snapshot_id",
+            "temperature_celsius",
+            "humidity_percent",
+            "pressure_mmhg",
+            "wind_direction",
+            "wind_speed_ms",
+            "observed_at",
+        ]
@@ -1,10 +1,22 @@
 # weather/services.py
-import requests
+import asyncio
+import statistics
+import time
 
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import httpx
+
+from django.conf import settings
 
 from venues.services import get_venue_coordinates
+from .forecast_cache_services import cached_hourly_forecast
+from .models import WeatherSnapshot
+from .provider_services import (
+    WeatherProviderUnavailable,
+    breaker,
+    is_provider_failure,
+    provider_get,
+    rate_limiter,
+)
 
 def degrees_to_direction(degrees):
     """Преобразует градусы направления ветра в текстовые обозначения."""
@@ -16,90 +28,233 @@ def hpa_to_mmhg(hpa):
     """Преобразует давление из гПа (гектопаскалей) в мм рт.ст."""
     return hpa * 0.75006
 
-def fetch_weather_for_venue(venue):
-    """
-    Получает текущую погоду для venue через Open-Meteo API.
-    Возвращает словарь с данными погоды или None при ошибке.
-    """
-    lat, lon = get_venue_coordinates(venue)
+CURRENT_VARIABLES = "temperature_2m,relative_humidity_2m,surface_pressure,wind_speed_10m,wind_direction_10m"
+HOURLY_VARIABLES = "temperature_2m,relative_humidity_2m,pressure_msl,wind_speed_10m,wind_direction_10m"
 
-    url = (
-        f"https://api.open-meteo.com/v1/forecast"
-        f"?latitude={lat}&longitude={lon}"
-        f"&current=temperature_2m,relative_humidity_2m,surface_pressure,wind_speed_10m,wind_direction_10m"
-        f"&timezone=auto"
-    )
 
-    session = requests.Session()
-    retry = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
+def parse_current(current):
+    """Блок current ответа Open-Meteo -> поля WeatherSnapshot."""
+    return {
+        "temperature_celsius": current.get("temperature_2m", 0.0),
+        "humidity_percent": current.get("relative_humidity_2m", 0.0),
+        "pressure_mmhg": hpa_to_mmhg(current.get("surface_pressure", 1013.0)),
+        "wind_speed_ms": current.get("wind_speed_10m", 0.0),
+        "wind_direction": degrees_to_direction(current.get("wind_direction_10m", 0.0)),
+    }
+
+def current_params(coordinates):
+    return {
+        "latitude": ",".join(str(lat) for lat, _ in coordinates),
+        "longitude": ",".join(str(lon) for _, lon in coordinates),
+        "current": CURRENT_VARIABLES,
+        "timezone": "auto",
+    }
+
+def forecast_params(lat, lon, date_str):
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "hourly": HOURLY_VARIABLES,
+        "start_date": date_str,
+        "end_date": date_str,
+        "timezone": "auto",
+    }
+
+def split_locations(data, count):
+    """Для одной точки API отвечает объектом, для нескольких — списком в порядке запроса."""
+    locations = data if isinstance(data, list) else [data]
+    if len(locations) != count:
+        raise ValueError(f"expected {count} locations, got {len(locations)}")
+    return locations
 
+def parse_hourly_at(hourly_data, target_datetime):
+    """Значения блока hourly на час target_datetime или None, если такого часа нет."""
+    hour_str = target_datetime.strftime('%Y-%m-%dT%H:00')
+    times = hourly_data.get("time", [])
     try:
-        response = session.get(url, timeout=20)
-        response.raise_for_status()
-        data = response.json()
-        current = data.get("current", {})
+        index = -1
+        for i, t in enumerate(times):
+            if t.startswith(hour_str):
+                index = i
+                break
+
+        if index == -1:
+            return None
 
         return {
-            "temperature_celsius": current.get("temperature_2m", 0.0),
-            "humidity_percent": current.get("relative_humidity_2m", 0.0),
-            "pressure_mmhg": hpa_to_mmhg(current.get("surface_pressure", 1013.0)),
-            "wind_speed_ms": current.get("wind_speed_10m", 0.0),
-            "wind_direction": degrees_to_direction(current.get("wind_direction_10m", 0.0)),
+            "temperature_celsius": hourly_data["temperature_2m"][index],
+            "humidity_percent": hourly_data["relative_humidity_2m"][index],
+            "pressure_mmhg": int(hourly_data["pressure_msl"][index] * 0.75006),
+            "wind_speed_ms": hourly_data["wind_speed_10m"][index],
+            "wind_direction": hourly_data["wind_direction_10m"][index],
         }
-    except Exception as e:
-        print(f"Error fetching weather for {venue.name}: {e}")
+
+    except (KeyError, ValueError, IndexError):
         return None
 
-def get_forecast_for_time(lat, lon, target_datetime):
+def fetch_current_weather(coordinates):
     """
-    Получает прогноз погоды на конкретный час.
-    target_datetime: datetime объект (start_at события)
+    Текущая погода сразу для нескольких точек одним запросом к Open-Meteo:
+    latitude и longitude передаются списками через запятую.
+    coordinates — список (lat, lon). Возвращает список словарей в том же порядке;
+    при ошибке запроса (или разомкнутом breaker) — список из None.
     """
+    if not coordinates:
+        return []
+    try:
+        locations = split_locations(provider_get(current_params(coordinates)), len(coordinates))
+        return [parse_current(location.get("current", {})) for location in locations]
+    except Exception as e:
+        print(f"Error fetching weather for {len(coordinates)} locations: {e}")
+        return [None] * len(coordinates)
 
-    date_str = target_datetime.strftime('%Y-%m-%d')
-    hour_str = target_datetime.strftime('%Y-%m-%dT%H:00')
+class AsyncWeatherClient:
+    """
+    Асинхронный клиент Open-Meteo на httpx: не больше concurrency запросов одновременно,
+    соединения к хосту переиспользуются из общего пула (keep-alive).
+    Breaker и rate limiter общие с синхронным provider_get.
+    Длительность каждого запроса копится в latencies (секунды).
 
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": "temperature_2m,relative_humidity_2m,pressure_msl,wind_speed_10m,wind_direction_10m",
-        "start_date": date_str,
-        "end_date": date_str,
-        "timezone": "auto"
-    }
+        async with AsyncWeatherClient(concurrency=10) as client:
+            weather = await client.current([(55.75, 37.61), (56.01, 92.85)])
+    """
+    def __init__(self, concurrency=None, timeout=None):
+        self.concurrency = concurrency or settings.WEATHER_FETCH_CONCURRENCY
+        self.timeout = timeout or httpx.Timeout(settings.WEATHER_FETCH_TIMEOUT, connect=settings.WEATHER_CONNECT_TIMEOUT)
+        self.latencies = []
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client = None
 
-    try:
-        response = requests.get(url, params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json()
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            transport=httpx.AsyncHTTPTransport(
+                retries=1,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    async def get_json(self, params):
+        async with self._semaphore:
+            breaker.before_request()
+            try:
+                await rate_limiter.acquire_async()
+            except WeatherProviderUnavailable:
+                breaker.cancel()
+                raise
+            started = time.perf_counter()
+            try:
+                response = await self._client.get(settings.OPEN_METEO_URL, params=params)
+            except httpx.HTTPError:
+                breaker.record_failure()
+                raise
+            finally:
+                self.latencies.append(time.perf_counter() - started)
+            if is_provider_failure(response.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            response.raise_for_status()
+            return response.json()
 
-        hourly_data = data.get("hourly", {})
-        times = hourly_data.get("time", [])
-        
+    async def current(self, coordinates):
+        """Как fetch_current_weather, но без блокировки: одна пачка точек — один запрос."""
+        if not coordinates:
+            return []
         try:
-            index = -1
-            for i, t in enumerate(times):
-                if t.startswith(hour_str):
-                    index = i
-                    break
-            
-            if index == -1:
-                return None
-
-            return {
-                "temperature_celsius": hourly_data["temperature_2m"][index],
-                "humidity_percent": hourly_data["relative_humidity_2m"][index],
-                "pressure_mmhg": int(hourly_data["pressure_msl"][index] * 0.75006),
-                "wind_speed_ms": hourly_data["wind_speed_10m"][index],
-                "wind_direction": hourly_data["wind_direction_10m"][index],
-            }
-
-        except (ValueError, IndexError):
-            return None
+            data = await self.get_json(current_params(coordinates))
+            return [parse_current(location.get("current", {})) for location in split_locations(data, len(coordinates))]
+        except Exception as e:
+            print(f"Error fetching weather for {len(coordinates)} locations: {e}")
+            return [None] * len(coordinates)
+
+def latency_summary(latencies):
+    """Сводка по длительностям запросов: количество, медиана, p95 и максимум в мс."""
+    if not latencies:
+        return {"requests": 0}
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+async def fetch_weather_batches(batches, concurrency=None):
+    """Пачки точек -> (погода по пачкам в том же порядке, длительности запросов)."""
+    async with AsyncWeatherClient(concurrency=concurrency) as client:
+        results = await asyncio.gather(*(client.current(batch) for batch in batches))
+    return results, client.latencies
+
+def fetch_weather_for_venues(venues, batch_size=None, concurrency=None):
+    """
+    Погода для площадок пачками по batch_size (WEATHER_FETCH_BATCH_SIZE),
+    до concurrency (WEATHER_FETCH_CONCURRENCY) пачек параллельно.
+    Возвращает (список (venue, данные или None), длительности запросов);
+    площадки без координат получают None.
+    """
+    batch_size = batch_size or settings.WEATHER_FETCH_BATCH_SIZE
+    results = []
+    located = []
+    for venue in venues:
+        lat, lon = get_venue_coordinates(venue)
+        if lat is None or lon is None:
+            results.append((venue, None))
+        else:
+            located.append((venue, (lat, lon)))
+
+    chunks = [located[start:start + batch_size] for start in range(0, len(located), batch_size)]
+    if not chunks:
+        return results, []
+    weather, latencies = asyncio.run(
+        fetch_weather_batches([[coords for _, coords in chunk] for chunk in chunks], concurrency=concurrency)
+    )
+    for chunk, chunk_weather in zip(chunks, weather):
+        results.extend((venue, data) for (venue, _), data in zip(chunk, chunk_weather))
+    return results, latencies
+
+def save_weather_snapshots(venues, batch_size=None, concurrency=None):
+    """
+    Один обход: параллельный пачечный запрос погоды и запись снимков одним bulk_create.
+    Возвращает (созданные снимки, площадки без данных, длительности запросов).
+    """
+    fetched, latencies = fetch_weather_for_venues(venues, batch_size=batch_size, concurrency=concurrency)
+    snapshots = [WeatherSnapshot(venue=venue, **data) for venue, data in fetched if data]
+    failed = [venue for venue, data in fetched if not data]
+    return WeatherSnapshot.objects.bulk_create(snapshots, batch_size=1000), failed, latencies
 
+def fetch_weather_for_venue(venue):
+    """
+    Получает текущую погоду для venue через Open-Meteo API.
+    Возвращает словарь с данными погоды или None при ошибке.
+    """
+    lat, lon = get_venue_coordinates(venue)
+    if lat is None or lon is None:
+        return None
+    return fetch_current_weather([(lat, lon)])[0]
+
+def fetch_hourly_forecast(lat, lon, date_str):
+    """Почасовой ряд прогноза на день date_str или None при ошибке (в т.ч. разомкнутом breaker)."""
+    try:
+        return provider_get(forecast_params(lat, lon, date_str)).get("hourly") or None
     except Exception as e:
         print(f"Weather API Error: {e}")
         return None
+
+def get_forecast_for_time(lat, lon, target_datetime):
+    """
+    Получает прогноз погоды на конкретный час.
+    target_datetime: datetime объект (start_at события)
+    Ряд на весь день кэшируется по (ячейка сетки, дата) до следующего выпуска прогноза,
+    поэтому остальные часы того же дня и соседние площадки обходятся без запроса.
+    Запрос идёт через общую keep-alive сессию процесса (provider_get); пока breaker
+    разомкнут, сразу возвращает None.
+    """
+    hourly, _ = cached_hourly_forecast(lat, lon, target_datetime.strftime('%Y-%m-%d'), fetch_hourly_forecast)
+    if not hourly:
+        return None
+    return parse_hourly_at(hourly, target_datetime)
@@ -0,0 +1,153 @@
+# weather/stub_server.py
+"""
+Локальный stub Open-Meteo для тестов и офлайн-бенчмарков.
+
+Понимает latitude/longitude списками через запятую (как настоящий API) и блоки
+current и hourly. Значения детерминированы и зависят только от координат,
+задержка ответа задаётся latency (секунды на запрос), отказ провайдера — fail_status.
+
+    python -m weather.stub_server --port 8089 --latency 0.2
+    OPEN_METEO_URL=http://127.0.0.1:8089/v1/forecast python manage.py fetch_weather
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FORECAST_PATH = "/v1/forecast"
+
+
+def stub_current(lat, lon):
+    return {
+        "time": "2026-01-01T12:00",
+        "temperature_2m": round((lat + lon) % 40 - 10, 1),
+        "relative_humidity_2m": int(abs(lat * 7) % 100),
+        "surface_pressure": 1000.0 + abs(lon) % 30,
+        "wind_speed_10m": round(abs(lat - lon) % 15, 1),
+        "wind_direction_10m": abs(lat * lon) % 360,
+    }
+
+
+def stub_hourly(lat, lon, start_date, end_date):
+    current = stub_current(lat, lon)
+    times = []
+    day = start_date
+    while day <= end_date:
+        times += [f"{day.isoformat()}T{hour:02d}:00" for hour in range(24)]
+        day += timedelta(days=1)
+    return {
+        "time": times,
+        "temperature_2m": [current["temperature_2m"] + (i % 24) / 10 for i in range(len(times))],
+        "relative_humidity_2m": [current["relative_humidity_2m"]] * len(times),
+        "pressure_msl": [current["surface_pressure"] + 10] * len(times),
+        "wind_speed_10m": [current["wind_speed_10m"]] * len(times),
+        "wind_direction_10m": [current["wind_direction_10m"]] * len(times),
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != FORECAST_PATH:
+            self._send(404, {"error": True, "reason": "Not found"})
+            return
+
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        try:
+            lats = [float(v) for v in params["latitude"].split(",")]
+            lons = [float(v) for v in params["longitude"].split(",")]
+            if len(lats) != len(lons):
+                raise ValueError("latitude and longitude must have the same length")
+        except (KeyError, ValueError) as e:
+            self._send(400, {"error": True, "reason": str(e)})
+            return
+
+        self.server.stub.requests += 1
+        if self.server.stub.latency:
+            time.sleep(self.server.stub.latency)
+        if self.server.stub.fail_status:
+            self._send(self.server.stub.fail_status, {"error": True, "reason": "Stub failure"})
+            return
+        self.server.stub.locations += len(lats)
+
+        today = date.today()
+        start_date = date.fromisoformat(params.get("start_date", today.isoformat()))
+        end_date = date.fromisoformat(params.get("end_date", start_date.isoformat()))
+
+        locations = []
+        for lat, lon in zip(lats, lons):
+            location = {"latitude": lat, "longitude": lon, "timezone": "GMT"}
+            if "current" in params:
+                location["current"] = stub_current(lat, lon)
+            if "hourly" in params:
+                location["hourly"] = stub_hourly(lat, lon, start_date, end_date)
+            locations.append(location)
+
+        self._send(200, locations if len(locations) > 1 else locations[0])
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OpenMeteoStub:
+    """
+    Stub-сервер в фоновом потоке. Использование:
+
+        with OpenMeteoStub(latency=0.05) as stub:
+            settings.OPEN_METEO_URL = stub.url
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, fail_status=None):
+        self.latency = latency
+        # Код ошибки, которым отвечать на все запросы (имитация деградации провайдера)
+        self.fail_status = fail_status
+        self.requests = 0
+        self.locations = 0
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{FORECAST_PATH}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальный stub Open-Meteo")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа, секунды")
+    args = parser.parse_args()
+
+    stub = OpenMeteoStub(args.host, args.port, args.latency)
+    print(f"Open-Meteo stub: {stub.url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
@@ -2,24 +2,28 @@ from celery import shared_task
 from events.models import Event
 from venues.models import Venue
 from weather.models import WeatherSnapshot
-from weather.services import fetch_weather_for_venue, get_forecast_for_time
+from weather.services import get_forecast_for_time, latency_summary, save_weather_snapshots
+from weather.current_services import upsert_current_weather
+from weather.partition_services import drop_expired_partitions, ensure_partitions
+from weather.rollup_services import rollup_weather
 
 from venues.services import get_venue_coordinates
 
 @shared_task
 def update_weather_snapshots():
     """
-    Периодическая задача: пробегается по всем Venues и сохраняет погоду.
+    Периодическая задача: запрашивает погоду для всех Venues пачками
+    (WEATHER_FETCH_BATCH_SIZE площадок на запрос, до WEATHER_FETCH_CONCURRENCY запросов
+    параллельно) и сохраняет снимки одним bulk_create.
+    Свежие снимки сразу записываются в CurrentWeather.
     """
-    venues = Venue.objects.all()
-    results = []
-    for venue in venues:
-        weather_data = fetch_weather_for_venue(venue)
-        if weather_data:
-            WeatherSnapshot.objects.create(venue=venue, **weather_data)
-            results.append(f"Updated {venue.name}")
-        else:
-            results.append(f"Failed {venue.name}")
+    venues = Venue.objects.only("id", "name", "location").order_by("id")
+    snapshots, failed, latencies = save_weather_snapshots(venues)
+    upsert_current_weather(snapshots)
+
+    results = [f"Updated {snapshot.venue.name}" for snapshot in snapshots]
+    results += [f"Failed {venue.name}" for venue in failed]
+    results.append(f"Latency: {latency_summary(latencies)}")
     return results
 
 @shared_task
@@ -52,4 +56,26 @@ def set_event_weather_forecast_task(event_id):
         return f"Weather saved for event {event.title}"
 
     except Event.DoesNotExist:
-        return "Event not found"
\ No newline at end of file
+        return "Event not found"
+
+@shared_task
+def maintain_weather_partitions():
+    """
+    Периодическая задача: заранее создаёт помесячные секции снимков погоды
+    и удаляет целиком секции старше WEATHER_RETENTION_MONTHS.
+    """
+    created = ensure_partitions()
+    dropped = drop_expired_partitions()
+    return {
+        "created": created,
+        "dropped": [{"partition": name, "kept_linked": kept} for name, kept in dropped],
+    }
+
+@shared_task
+def rollup_weather_daily():
+    """
+    Периодическая задача: сворачивает почасовые снимки старше недели
+    в суточные сводки WeatherDailyAggregate и удаляет исходные строки.
+    """
+    created, deleted = rollup_weather()
+    return f"Created or updated {created} daily aggregates, pruned {deleted} snapshots."